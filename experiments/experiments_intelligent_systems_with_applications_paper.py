@@ -7,14 +7,14 @@ if __name__ == "__main__":
     DO_RECOMPUTE = False
 
     # Runtime of STABILITY-NAIVE and FOUR-BOOL-LABEL on the toy example on fraud.
-    for file_name in path_to_resources_folder().iterdir():
+    for file_name in path_to_resources_folder().glob('*.xlsx'):
         file_name = file_name.parts[-1]
         if str(file_name).startswith('02'):
             experiment = TimingAndAccuracyExperiment(file_name[:-5], do_recompute=DO_RECOMPUTE)
             experiment.run_all_experiments()
 
     # Accuracy of toy example on fraud and artificial example
-    for file_name in path_to_resources_folder().iterdir():
+    for file_name in path_to_resources_folder().glob('*.xlsx'):
         file_name = file_name.parts[-1]
         if str(file_name).startswith('02') or str(file_name).startswith('04'):
             experiment = TimingAndAccuracyExperiment(file_name[:-5], do_recompute=DO_RECOMPUTE)
@@ -108,7 +108,7 @@ class FourBoolTimingExperiment:
 
 
 if __name__ == "__main__":
-    for file_name in path_to_resources_folder().iterdir():
+    for file_name in path_to_resources_folder().glob('*.xlsx'):
         file_name = file_name.parts[-1]
         if str(file_name).startswith('0'):
                 # str(file_name).startswith('counter') or \
@@ -184,7 +184,7 @@ class TimingAndAccuracyExperiment:
 
 
 if __name__ == "__main__":
-    for file_name in path_to_resources_folder().iterdir():
+    for file_name in path_to_resources_folder().glob('*.xlsx'):
         file_name = file_name.parts[-1]
         if str(file_name).startswith('counter') or str(file_name).startswith('02') or str(file_name).startswith('03') \
                 or str(file_name).startswith('04'):
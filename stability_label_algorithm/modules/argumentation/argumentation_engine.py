@@ -1,33 +1,59 @@
+from typing import List, Optional
+
 from .argumentation_engine_output import ArgumentationEngineOutput
+from .argumentation_session import ArgumentationSession
 from .argumentation_theory.argumentation_system import ArgumentationSystem
+from .argumentation_theory.argumentation_system_slicer import slice_for_topics
 from .argumentation_theory.argumentation_theory import ArgumentationTheory
+from .argumentation_theory.literal import Literal
 from .labelers.labeler_interface import LabelerInterface
 
 
 class ArgumentationEngine:
-    def __init__(self, argumentation_system: ArgumentationSystem, labeler: LabelerInterface):
+    def __init__(self, argumentation_system: ArgumentationSystem, labeler: LabelerInterface,
+                 topics: Optional[List[Literal]] = None):
+        """
+        :param argumentation_system: ArgumentationSystem that is labelled on each update.
+        :param labeler: Labeler that is used.
+        :param topics: If given, only the slice of the ArgumentationSystem that is relevant for these topics (see
+            slice_for_topics) is labelled, so the labels only contain the Literals and Rules in the slice.
+        """
         self.argumentation_system = argumentation_system
         self.labeler = labeler
+        if topics is None:
+            self.labeled_argumentation_system = argumentation_system
+        else:
+            self.labeled_argumentation_system = slice_for_topics(argumentation_system, topics)
 
     def _get_consistent_observations(self, input_observations_str: [str]):
-        output_observations = []
-
         input_observations = self.argumentation_system.get_queryables(input_observations_str)
 
-        for observation in input_observations:
-            if all([not observation.is_contrary_of(other_observation) for other_observation in input_observations]):
-                output_observations.append(observation)
-            else:
-                pass
+        # An observation is consistent if none of its contraries is observed
+        input_observation_set = set(input_observations)
+        return [observation for observation in input_observations
+                if not any([contrary in input_observation_set for contrary in observation.contraries])]
 
-        return output_observations
+    def open_session(self, observations: List[str] = ()) -> ArgumentationSession:
+        """
+        Open a session in which observations can be added and retracted one by one, relabelling incrementally. Any
+        number of sessions can be open at the same time, also in different threads.
+
+        :param observations: Names of the initial observations.
+        :return: The new ArgumentationSession.
+        """
+        return ArgumentationSession(self, observations)
 
     def update(self, observations):
         # Consistency check
         consistent_observations = self._get_consistent_observations(observations)
 
+        # Observations outside the labelled (sliced) argumentation system cannot influence its labels
+        labeled_language = self.labeled_argumentation_system.language
+        consistent_observations = [observation for observation in consistent_observations
+                                   if str(observation) in labeled_language]
+
         # Argumentation system and consistent observations form an argumentation theory
-        argumentation_theory = ArgumentationTheory(self.argumentation_system, consistent_observations)
+        argumentation_theory = ArgumentationTheory(self.labeled_argumentation_system, consistent_observations)
         labels = self.labeler.label(argumentation_theory)
 
         return ArgumentationEngineOutput(labels)
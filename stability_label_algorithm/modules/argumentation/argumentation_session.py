@@ -0,0 +1,160 @@
+import copy
+import threading
+from typing import List, Optional
+
+from .argumentation_engine_output import ArgumentationEngineOutput
+from .argumentation_theory.argumentation_theory import ArgumentationTheory
+from .argumentation_theory.queryable import Queryable
+from .labelers.four_bool_labeler import FourBoolLabeler
+from .labelers.incremental_four_bool_labeler import IncrementalFourBoolLabeler
+from .labelers.labels import Labels
+
+
+class ArgumentationSession:
+    """
+    An ArgumentationSession is one inquiry on the ArgumentationSystem of an ArgumentationEngine (see
+    ArgumentationEngine.open_session): observations are added and retracted one by one, and the session keeps the
+    knowledge base and its labels in between, so each change only costs work proportional to what it affects.
+
+    As in ArgumentationEngine.update, an observation is only in the knowledge base if it is not a contrary of another
+    observation. For each Literal, the session counts how many of its contraries are observed, so adding or retracting
+    an observation only visits the Literals that it is a contrary of. If the labeler of the engine is a
+    FourBoolLabeler, the knowledge base changes are relabelled incrementally by an IncrementalFourBoolLabeler, and its
+    Labels are only copied when labels are requested after a change; otherwise, the session relabels with (its own copy
+    of) the labeler of the engine when labels are requested after a change.
+
+    Sessions only read the (compiled) ArgumentationSystem that they share, so many sessions can be used concurrently.
+    A single session can also be used by multiple threads, as its operations are atomic.
+    """
+    def __init__(self, engine: 'ArgumentationEngine', observations: List[str] = ()):
+        """
+        :param engine: ArgumentationEngine of which the ArgumentationSystem and labeler are used.
+        :param observations: Names of the initial observations.
+        """
+        self.argumentation_system = engine.argumentation_system
+        self.labeled_argumentation_system = engine.labeled_argumentation_system
+        self.compiled = self.argumentation_system.compiled
+        self._lock = threading.Lock()
+
+        # For each Literal id (of the full ArgumentationSystem): is it observed, and how many of its contraries are
+        # observed? An observation is in the knowledge base if none of its contraries is observed.
+        self._observed = [False] * self.compiled.nr_of_literals
+        self._nr_of_conflicts = [0] * self.compiled.nr_of_literals
+
+        if isinstance(engine.labeler, FourBoolLabeler):
+            self._incremental_labeler: Optional[IncrementalFourBoolLabeler] = IncrementalFourBoolLabeler()
+            self._incremental_labeler.start(self.labeled_argumentation_system)
+            self._labeler = None
+        else:
+            self._incremental_labeler = None
+            # Labelers may keep state while labelling, so the session does not share the labeler of the engine.
+            self._labeler = copy.copy(engine.labeler)
+        self._labels: Optional[Labels] = None
+
+        for observation in observations:
+            self.add_observation(observation)
+
+    @property
+    def observations(self) -> List[Queryable]:
+        """
+        All observations, including those that are not in the knowledge base because they are inconsistent.
+        """
+        with self._lock:
+            return [self.compiled.literals[literal_id]
+                    for literal_id, is_observed in enumerate(self._observed) if is_observed]
+
+    @property
+    def knowledge_base(self) -> List[Queryable]:
+        """
+        The consistent observations that are in the labelled (possibly sliced) ArgumentationSystem.
+        """
+        with self._lock:
+            return self._get_knowledge_base()
+
+    def add_observation(self, observation: str) -> None:
+        """
+        Add an observation. If it is a contrary of an observation in the knowledge base (or the other way around), the
+        knowledge base no longer contains that observation (or does not contain the new one).
+
+        :param observation: Name of the Queryable that is observed.
+        """
+        queryable_id = self.compiled.literal_ids[self.argumentation_system.get_queryable(observation)]
+        with self._lock:
+            if self._observed[queryable_id]:
+                return
+            self._observed[queryable_id] = True
+            removed_ids = []
+            for literal_id in self.compiled.literal_contrary_of[queryable_id]:
+                self._nr_of_conflicts[literal_id] += 1
+                if self._observed[literal_id] and self._nr_of_conflicts[literal_id] == 1:
+                    removed_ids.append(literal_id)
+            added_ids = [queryable_id] if self._nr_of_conflicts[queryable_id] == 0 else []
+            self._update_knowledge_base(removed_ids, added_ids)
+
+    def retract_observation(self, observation: str) -> None:
+        """
+        Retract an observation. Observations that were inconsistent only because of this one return to the knowledge
+        base.
+
+        :param observation: Name of the Queryable that is no longer observed.
+        """
+        queryable_id = self.compiled.literal_ids[self.argumentation_system.get_queryable(observation)]
+        with self._lock:
+            if not self._observed[queryable_id]:
+                return
+            self._observed[queryable_id] = False
+            removed_ids = [queryable_id] if self._nr_of_conflicts[queryable_id] == 0 else []
+            added_ids = []
+            for literal_id in self.compiled.literal_contrary_of[queryable_id]:
+                self._nr_of_conflicts[literal_id] -= 1
+                if self._observed[literal_id] and self._nr_of_conflicts[literal_id] == 0:
+                    added_ids.append(literal_id)
+            self._update_knowledge_base(removed_ids, added_ids)
+
+    @property
+    def labels(self) -> Labels:
+        """
+        The Labels of the labelled ArgumentationSystem for the current knowledge base. They do not change when the
+        session is updated later.
+        """
+        with self._lock:
+            if self._labels is None:
+                if self._incremental_labeler is not None:
+                    self._labels = self._incremental_labeler.labels
+                else:
+                    self._labels = self._labeler.label(ArgumentationTheory(self.labeled_argumentation_system,
+                                                                           self._get_knowledge_base()))
+            return self._labels
+
+    def get_output(self) -> ArgumentationEngineOutput:
+        """
+        The current Labels as the output of ArgumentationEngine.update would give them.
+        """
+        return ArgumentationEngineOutput(self.labels)
+
+    def _get_knowledge_base(self) -> List[Queryable]:
+        labeled_language = self.labeled_argumentation_system.language
+        return [labeled_language[str(literal)] for literal, is_observed, nr_of_conflicts
+                in zip(self.compiled.literals, self._observed, self._nr_of_conflicts)
+                if is_observed and nr_of_conflicts == 0 and str(literal) in labeled_language]
+
+    def _update_knowledge_base(self, removed_ids: List[int], added_ids: List[int]) -> None:
+        """
+        Pass the changes of the knowledge base on to the labeler. Removals go first, so the knowledge base of the
+        IncrementalFourBoolLabeler never contains contraries.
+        """
+        if not removed_ids and not added_ids:
+            return
+        self._labels = None
+        if self._incremental_labeler is None:
+            return
+        # Observations outside the labelled (sliced) ArgumentationSystem cannot influence its labels.
+        labeled_language = self.labeled_argumentation_system.language
+        for literal_id in removed_ids:
+            literal_str = str(self.compiled.literals[literal_id])
+            if literal_str in labeled_language:
+                self._incremental_labeler.remove_queryable(labeled_language[literal_str])
+        for literal_id in added_ids:
+            literal_str = str(self.compiled.literals[literal_id])
+            if literal_str in labeled_language:
+                self._incremental_labeler.add_queryable(labeled_language[literal_str])
@@ -20,9 +20,24 @@ class ArgumentationSystem:
         else:
             self.topic_literals = topic_literals
 
+        self._compiled_argumentation_system = None
+
     def __eq__(self, other):
         return self.language == other.language and self.rules == other.rules
 
+    @property
+    def compiled(self) -> 'CompiledArgumentationSystem':
+        """
+        The CompiledArgumentationSystem (integer-indexed version) of this ArgumentationSystem. It is computed once, on
+        first use, and shared by all labelers afterwards.
+
+        :return: The CompiledArgumentationSystem.
+        """
+        if self._compiled_argumentation_system is None:
+            from .compiled_argumentation_system import CompiledArgumentationSystem
+            self._compiled_argumentation_system = CompiledArgumentationSystem(self)
+        return self._compiled_argumentation_system
+
     def update_literal_name(self, old_literal_name: str, new_literal_name: str) -> None:
         """
         Change the name of a Literal in this ArgumentationSystem. Make sure that all connections are still correct.
@@ -48,6 +63,7 @@ class ArgumentationSystem:
         del self.language[old_literal_negation_name]
         self.language[str(old_literal)] = old_literal
         self.language[str(old_literal.negation)] = old_literal.negation
+        self._compiled_argumentation_system = None
 
     def update_literal_information(self, literal_name: str, new_literal_nl_true_value: str,
                                    new_literal_nl_unknown_value: str, new_literal_nl_false_value: str) -> None:
@@ -0,0 +1,75 @@
+import copy
+from typing import Dict, List
+
+from .argumentation_system import ArgumentationSystem
+from .literal import Literal
+from .rule import Rule
+
+
+def slice_for_topics(argumentation_system: ArgumentationSystem, topics: List[Literal]) -> ArgumentationSystem:
+    """
+    Reduce the ArgumentationSystem to the part that is relevant for the labels of the topics: the smallest set of
+    Literals that contains the topics and, for each of its Literals, the contraries and the antecedents of its Rules,
+    together with the Rules for those Literals. The label of a Literal only depends on its Rules, the Rules for its
+    contraries and observations of (contraries of) the Literal, so all Literals in the slice get the same labels as in
+    the full ArgumentationSystem, as long as only observations of Queryables in the slice are given.
+
+    The slice has its own copies of the Literals and Rules, which are only connected to other Literals and Rules in the
+    slice. They are equal to (and have the same hash as) the originals, so Labels of the slice can be looked up with the
+    Literals and Rules of the full ArgumentationSystem. Slices are remembered in the slice_cache of the compiled
+    ArgumentationSystem.
+
+    :param argumentation_system: ArgumentationSystem that should be reduced.
+    :param topics: Literals of interest.
+    :return: ArgumentationSystem with only the Literals and Rules that are relevant for the topics.
+    """
+    compiled = argumentation_system.compiled
+    topic_ids = compiled.get_literal_ids(topics)
+    cache_key = tuple(topic_ids)
+    sliced_argumentation_system = compiled.slice_cache.get(cache_key)
+    if sliced_argumentation_system is not None:
+        return sliced_argumentation_system
+
+    literal_ids = set(topic_ids)
+    to_visit = list(literal_ids)
+    while to_visit:
+        literal_id = to_visit.pop()
+        related_ids = compiled.literal_contraries[literal_id] + compiled.literal_contrary_of[literal_id] + \
+            tuple(antecedent_id for rule_id in compiled.literal_children[literal_id]
+                  for antecedent_id in compiled.rule_antecedents[rule_id])
+        for related_id in related_ids:
+            if related_id not in literal_ids:
+                literal_ids.add(related_id)
+                to_visit.append(related_id)
+
+    # Copy the Literals (in the original order). Their contraries are in the slice, their negation might not be.
+    literal_copies: Dict[str, Literal] = {}
+    for literal_id, literal in enumerate(compiled.literals):
+        if literal_id in literal_ids:
+            literal_copy = copy.copy(literal)
+            literal_copy.contraries = []
+            literal_copy.parents = []
+            literal_copy.children = []
+            literal_copies[str(literal)] = literal_copy
+    for literal_copy in literal_copies.values():
+        literal = compiled.language[str(literal_copy)]
+        literal_copy.contraries = [literal_copies[str(contrary)] for contrary in literal.contraries]
+        if literal.negation is not None:
+            literal_copy.negation = literal_copies.get(str(literal.negation))
+
+    # Copy the Rules (in the original order) and connect them to the Literal copies, as in the importers.
+    rules = []
+    for rule in compiled.rules:
+        if str(rule.consequent) in literal_copies:
+            # A list keeps the order of the antecedents, so the copy is equal to (and has the same hash as) the Rule.
+            antecedents = [literal_copies[str(antecedent)] for antecedent in rule.antecedents]
+            rule_copy = Rule(rule.id, antecedents, literal_copies[str(rule.consequent)], rule.rule_description)
+            rule_copy.consequent.children.append(rule_copy)
+            for antecedent in rule_copy.antecedents:
+                antecedent.parents.append(rule_copy)
+            rules.append(rule_copy)
+
+    sliced_argumentation_system = ArgumentationSystem(literal_copies, rules,
+                                                      [literal_copies[str(topic)] for topic in topics])
+    compiled.slice_cache[cache_key] = sliced_argumentation_system
+    return sliced_argumentation_system
@@ -1,4 +1,4 @@
-from typing import List
+from typing import FrozenSet, List, Optional
 
 from .argumentation_system import ArgumentationSystem
 from .queryable import Queryable
@@ -8,11 +8,54 @@ class ArgumentationTheory:
     """
     An ArgumentationTheory consists of an ArgumentationSystem and a knowledge base (which is a list of Queryables).
     Arguments can be inferred on the basis of an ArgumentationTheory.
+    Besides the list, the knowledge base is kept as a frozenset and, indexed on the Literal ids of the compiled
+    ArgumentationSystem, as boolean masks and a bitmask, so that membership checks take constant time. The knowledge
+    base should therefore not be changed after construction.
     """
 
     def __init__(self, argumentation_system: ArgumentationSystem, observations: List[Queryable]):
         self.argumentation_system = argumentation_system
         self.knowledge_base = observations
+        self.knowledge_base_set: FrozenSet[Queryable] = frozenset(observations)
+
+        self._observed: Optional[List[bool]] = None
+        self._contrary_observed: Optional[List[bool]] = None
+        self._knowledge_base_bitmask: Optional[int] = None
+
+    @property
+    def observed(self) -> List[bool]:
+        """
+        For each Literal id of the compiled ArgumentationSystem: is the Literal in the knowledge base?
+        """
+        if self._observed is None:
+            self._observed = self.argumentation_system.compiled.literal_mask(self.knowledge_base)
+        return self._observed
+
+    @property
+    def contrary_observed(self) -> List[bool]:
+        """
+        For each Literal id of the compiled ArgumentationSystem: is some contrary of the Literal in the knowledge base?
+        """
+        if self._contrary_observed is None:
+            compiled = self.argumentation_system.compiled
+            contrary_observed = [False] * compiled.nr_of_literals
+            for observed_id in compiled.get_literal_ids(self.knowledge_base):
+                for literal_id in compiled.literal_contrary_of[observed_id]:
+                    contrary_observed[literal_id] = True
+            self._contrary_observed = contrary_observed
+        return self._contrary_observed
+
+    @property
+    def knowledge_base_bitmask(self) -> int:
+        """
+        The knowledge base as an integer in which bit i is set if the Literal with id i is in the knowledge base.
+        """
+        if self._knowledge_base_bitmask is None:
+            bitmask = 0
+            for literal_id in self.argumentation_system.compiled.get_literal_ids(self.knowledge_base_set):
+                bitmask |= 1 << literal_id
+            self._knowledge_base_bitmask = bitmask
+        return self._knowledge_base_bitmask
 
     @property
     def future_knowledge_base_candidates(self) -> List[Queryable]:
@@ -21,9 +64,11 @@ class ArgumentationTheory:
 
         :return: List of queryables that could be in the knowledge base of some future ArgumentationTheory.
         """
+        compiled = self.argumentation_system.compiled
+        observed, contrary_observed = self.observed, self.contrary_observed
         return [queryable for queryable in self.argumentation_system.queryables
-                if queryable not in self.knowledge_base and
-                all([contrary not in self.knowledge_base for contrary in queryable.contraries])]
+                if not observed[compiled.literal_ids[queryable]] and
+                not contrary_observed[compiled.literal_ids[queryable]]]
 
 
 if __name__ == "__main__":
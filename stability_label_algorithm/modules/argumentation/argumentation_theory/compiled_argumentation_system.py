@@ -0,0 +1,187 @@
+from typing import Dict, Iterable, List, Sequence, Set, Tuple
+
+import numpy as np
+
+from ...lru_cache import LRUCache
+from .argumentation_system import ArgumentationSystem
+from .literal import Literal
+from .queryable import Queryable
+from .rule import Rule
+
+
+def _to_csr(adjacency: Sequence[Sequence[int]]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Convert an adjacency list into a CSR-style (indptr, indices) pair of integer arrays. The neighbours of item i are
+    indices[indptr[i]:indptr[i + 1]].
+
+    >>> indptr, indices = _to_csr([(1, 2), (), (0,)])
+    >>> indptr.tolist(), indices.tolist()
+    ([0, 2, 2, 3], [1, 2, 0])
+    """
+    indptr = np.zeros(len(adjacency) + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum([len(neighbours) for neighbours in adjacency])
+    indices = np.fromiter((neighbour for neighbours in adjacency for neighbour in neighbours),
+                          dtype=np.int64, count=int(indptr[-1]))
+    return indptr, indices
+
+
+class CompiledArgumentationSystem(ArgumentationSystem):
+    """
+    A CompiledArgumentationSystem is an ArgumentationSystem in which each Literal and each Rule has a dense integer id.
+    Antecedents, consequents, parents, children and contraries are stored as integer arrays (CSR-style for the
+    one-to-many relations), so that labelers can work on ids instead of hashing Literals and Rules on every step.
+    The Literals and Rules themselves are shared with the original ArgumentationSystem.
+    """
+    # Maximum number of satisfiability results (one for each set of excluded Queryables) that is remembered.
+    SATISFIABILITY_CACHE_SIZE = 256
+    # Maximum number of topic labelings (one for each labeler, set of topics and observation set) that is remembered by
+    # the smallest stable set search.
+    TOPIC_CODES_CACHE_SIZE = 65536
+    # Maximum number of slices (one for each set of topics, see slice_for_topics) that is remembered.
+    SLICE_CACHE_SIZE = 64
+
+    def __init__(self, argumentation_system: ArgumentationSystem):
+        super().__init__(argumentation_system.language, argumentation_system.rules,
+                         argumentation_system.topic_literals)
+
+        self.literals: List[Literal] = list(self.language.values())
+        self.literal_ids: Dict[Literal, int] = {literal: literal_id for literal_id, literal in enumerate(self.literals)}
+        self.rule_ids: Dict[Rule, int] = {rule: rule_id for rule_id, rule in enumerate(self.rules)}
+
+        # Python-level adjacency (tuples of ids), used by the worklist-based labelers.
+        self.rule_antecedents: Tuple[Tuple[int, ...], ...] = \
+            tuple(tuple(self.literal_ids[antecedent] for antecedent in rule.antecedents) for rule in self.rules)
+        self.rule_consequents: Tuple[int, ...] = tuple(self.literal_ids[rule.consequent] for rule in self.rules)
+        self.literal_parents: Tuple[Tuple[int, ...], ...] = \
+            tuple(tuple(self.rule_ids[rule] for rule in literal.parents) for literal in self.literals)
+        self.literal_children: Tuple[Tuple[int, ...], ...] = \
+            tuple(tuple(self.rule_ids[rule] for rule in literal.children) for literal in self.literals)
+        self.literal_contraries: Tuple[Tuple[int, ...], ...] = \
+            tuple(tuple(self.literal_ids[contrary] for contrary in literal.contraries) for literal in self.literals)
+        literal_contrary_of = [[] for _ in self.literals]
+        for literal_id, contraries in enumerate(self.literal_contraries):
+            for contrary_id in contraries:
+                literal_contrary_of[contrary_id].append(literal_id)
+        # The Literals of which a Literal is a contrary (the inverse of literal_contraries).
+        self.literal_contrary_of: Tuple[Tuple[int, ...], ...] = tuple(tuple(ids) for ids in literal_contrary_of)
+        self.literal_contrary_children: Tuple[Tuple[int, ...], ...] = \
+            tuple(tuple(rule_id for contrary_id in contraries for rule_id in self.literal_children[contrary_id])
+                  for contraries in self.literal_contraries)
+        self.literal_is_observable: Tuple[bool, ...] = tuple(literal.is_observable for literal in self.literals)
+
+        # Array-level adjacency (CSR), used by the vectorised labelers.
+        self.antecedents_indptr, self.antecedents_indices = _to_csr(self.rule_antecedents)
+        self.consequents = np.array(self.rule_consequents, dtype=np.int64)
+        self.parents_indptr, self.parents_indices = _to_csr(self.literal_parents)
+        self.children_indptr, self.children_indices = _to_csr(self.literal_children)
+        self.contraries_indptr, self.contraries_indices = _to_csr(self.literal_contraries)
+        self.contrary_children_indptr, self.contrary_children_indices = _to_csr(self.literal_contrary_children)
+        self.is_observable = np.array(self.literal_is_observable, dtype=bool)
+
+        self.satisfiability_cache = LRUCache(self.SATISFIABILITY_CACHE_SIZE)
+        self.topic_codes_cache = LRUCache(self.TOPIC_CODES_CACHE_SIZE)
+        self.slice_cache = LRUCache(self.SLICE_CACHE_SIZE)
+
+        self._queryables: List[Queryable] = [literal for literal in self.literals if isinstance(literal, Queryable)]
+        self.queryable_ids = np.array([self.literal_ids[queryable] for queryable in self._queryables], dtype=np.int64)
+
+    @property
+    def compiled(self) -> 'CompiledArgumentationSystem':
+        return self
+
+    @property
+    def nr_of_literals(self) -> int:
+        return len(self.literals)
+
+    @property
+    def nr_of_rules(self) -> int:
+        return len(self.rules)
+
+    @property
+    def queryables(self) -> List[Queryable]:
+        return list(self._queryables)
+
+    def get_literal_ids(self, literals: Iterable[Literal]) -> List[int]:
+        """
+        Obtain the ids of a number of Literals in this CompiledArgumentationSystem.
+
+        :param literals: The Literals.
+        :return: Their ids, in the same order.
+        """
+        return [self.literal_ids[literal] for literal in literals]
+
+    def literal_mask(self, literals: Iterable[Literal]) -> List[bool]:
+        """
+        Obtain a list of booleans, indexed on Literal id, that is True exactly for the given Literals.
+
+        :param literals: Literals that should be marked, for example a knowledge base.
+        :return: Boolean mask over all Literals.
+        """
+        mask = [False] * len(self.literals)
+        for literal in literals:
+            mask[self.literal_ids[literal]] = True
+        return mask
+
+    def dependency_cone(self, literal_ids: Iterable[int]) -> Set[int]:
+        """
+        Find the ids of all Literals that can influence the labels of the given Literals when they are observed. The
+        label of a Literal only depends on the Rules for it and for its contraries, and on observations of the Literal
+        and of (Literals that are) contraries of it. So the cone consists of all Literals from which the given Literals
+        can be reached by following Literal.parents (also via contraries), together with their contraries and the
+        contraries of those.
+
+        :param literal_ids: Ids of the Literals of interest, for example the topics.
+        :return: Ids of the Literals in the dependency cone.
+        """
+        reached = set(literal_ids)
+        to_visit = list(reached)
+        while to_visit:
+            literal_id = to_visit.pop()
+            related_ids = (literal_id,) + self.literal_contraries[literal_id] + self.literal_contrary_of[literal_id]
+            for related_id in related_ids:
+                for rule_id in self.literal_children[related_id]:
+                    for antecedent_id in self.rule_antecedents[rule_id]:
+                        if antecedent_id not in reached:
+                            reached.add(antecedent_id)
+                            to_visit.append(antecedent_id)
+
+        cone = set(reached)
+        for literal_id in reached:
+            for related_id in self.literal_contraries[literal_id] + self.literal_contrary_of[literal_id]:
+                cone.add(related_id)
+                cone.update(self.literal_contraries[related_id])
+                cone.update(self.literal_contrary_of[related_id])
+        return cone
+
+    def forward_chain(self, literal_is_given: Sequence[bool]) -> Tuple[List[bool], List[bool]]:
+        """
+        Find all Literals and Rules that can be derived from the given Literals (Horn-style forward chaining). Each
+        Rule keeps a counter of its antecedents that are not derived yet; a Rule fires when its counter reaches zero.
+        This takes time linear in the size of the CompiledArgumentationSystem.
+
+        :param literal_is_given: For each Literal id, a boolean indicating if the Literal is given.
+        :return: For each Literal id and for each Rule id, a boolean indicating if it can be derived.
+        """
+        literal_derived = list(literal_is_given)
+        rule_derived = [False] * len(self.rules)
+        missing = [len(set(antecedents)) for antecedents in self.rule_antecedents]
+        for literal_id, is_given in enumerate(literal_derived):
+            if is_given:
+                # A Rule can occur more than once among the parents (duplicate Rules share an id), count it once.
+                for rule_id in set(self.literal_parents[literal_id]):
+                    missing[rule_id] -= 1
+        to_fire = [rule_id for rule_id, nr_missing in enumerate(missing) if nr_missing == 0]
+
+        while to_fire:
+            rule_id = to_fire.pop()
+            if rule_derived[rule_id]:
+                continue
+            rule_derived[rule_id] = True
+            consequent_id = self.rule_consequents[rule_id]
+            if not literal_derived[consequent_id]:
+                literal_derived[consequent_id] = True
+                for parent_id in set(self.literal_parents[consequent_id]):
+                    missing[parent_id] -= 1
+                    if missing[parent_id] == 0:
+                        to_fire.append(parent_id)
+        return literal_derived, rule_derived
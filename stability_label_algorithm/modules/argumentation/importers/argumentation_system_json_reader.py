@@ -1,4 +1,4 @@
-import pandas
+import json
 
 from ..argumentation_theory.argumentation_system import ArgumentationSystem
 from ..argumentation_theory.literal import Literal
@@ -46,13 +46,7 @@ class ArgumentationSystemJsonReader:
         for literal_str, literal_dict in json_object['literals'].items():
             language[literal_str].contraries = [language[contrary_str]
                                                 for contrary_str in literal_dict['contraries_str']]
-            language[literal_str].negation = language[literal_dict['negation_str']]
-
-        # Add rule preferences
-        if 'rule_preferences' in json_object and json_object['rule_preferences']:
-            rule_preferences = pandas.read_json(json_object['rule_preferences'])
-        else:
-            rule_preferences = None
+            language[literal_str].negation = language.get(literal_dict['negation_str'])
 
         # Add topic literals
         if 'topic_literals' in json_object and json_object['topic_literals']:
@@ -60,11 +54,9 @@ class ArgumentationSystemJsonReader:
         else:
             topic_literals = None
 
-        return ArgumentationSystem(language, list(rules.values()),
-                                   rule_preferences=rule_preferences,
-                                   topic_literals=topic_literals)
+        return ArgumentationSystem(language, list(rules.values()), topic_literals=topic_literals)
 
     def read_from_json(self, file_path: str) -> ArgumentationSystem:
         with open(file_path, 'r') as reader:
             argumentation_system_json = reader.read()
-        return self.from_json(argumentation_system_json)
+        return self.from_json(json.loads(argumentation_system_json))
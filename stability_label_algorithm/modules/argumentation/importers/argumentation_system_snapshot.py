@@ -0,0 +1,85 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Optional, Union
+
+# Snapshots with another version are ignored, so this should be increased if the snapshot state changes.
+SNAPSHOT_VERSION = 2
+SNAPSHOT_SUFFIX = '.snapshot'
+
+
+def get_snapshot_path(source_path: Union[Path, str]) -> Path:
+    """
+    The snapshot of a source file is stored next to it, e.g. rule_set.xlsx.snapshot for rule_set.xlsx.
+    """
+    source_path = Path(source_path)
+    return source_path.with_name(source_path.name + SNAPSHOT_SUFFIX)
+
+
+def _content_hash(source_path: Union[Path, str]) -> str:
+    with open(source_path, 'rb') as reader:
+        return hashlib.sha256(reader.read()).hexdigest()
+
+
+def read_snapshot(source_path: Union[Path, str]) -> Optional[dict]:
+    """
+    Read the snapshot of a source file, if it is still valid. A snapshot consists of two lines of JSON: a small header
+    (first, so it can be checked without reading the rest) and the state. Snapshots are plain data rather than pickles,
+    so reading one can never execute code, whoever wrote it. A snapshot is valid if the size of the source file is
+    unchanged and either its modification time or its content hash is unchanged; if only the modification time
+    changed, the header is updated so that the next check is fast again.
+
+    :param source_path: Path to the source file.
+    :return: The state stored in the snapshot, or None if there is no valid snapshot.
+    """
+    snapshot_path = get_snapshot_path(source_path)
+    try:
+        source_stat = os.stat(source_path)
+        with open(snapshot_path, 'r', encoding='utf-8') as reader:
+            header = json.loads(reader.readline())
+            if not isinstance(header, dict) or header.get('version') != SNAPSHOT_VERSION or \
+                    header.get('size') != source_stat.st_size:
+                return None
+            if header.get('mtime_ns') != source_stat.st_mtime_ns:
+                if header.get('sha256') != _content_hash(source_path):
+                    return None
+                header['mtime_ns'] = source_stat.st_mtime_ns
+                state = json.loads(reader.readline())
+                _write(snapshot_path, header, state)
+                return state
+            return json.loads(reader.readline())
+    except (OSError, ValueError):
+        # ValueError includes invalid JSON and invalid UTF-8, for example in snapshots of an older version.
+        return None
+
+
+def write_snapshot(source_path: Union[Path, str], state: dict) -> None:
+    """
+    Write a snapshot of a source file with the given state. Failing to write the snapshot (for example in a read-only
+    folder) is not an error: the source file will simply be read again next time.
+
+    :param source_path: Path to the source file.
+    :param state: State that was read from the source file, consisting of dicts, lists, strings, numbers and None, so
+        that it can be stored as JSON.
+    """
+    try:
+        source_stat = os.stat(source_path)
+        header = {'version': SNAPSHOT_VERSION, 'mtime_ns': source_stat.st_mtime_ns, 'size': source_stat.st_size,
+                  'sha256': _content_hash(source_path)}
+        _write(get_snapshot_path(source_path), header, state)
+    except OSError:
+        pass
+
+
+def _write(snapshot_path: Path, header: dict, state: dict) -> None:
+    # Write to a temporary file first, so that concurrent readers never see a partially written snapshot.
+    temporary_path = snapshot_path.with_name(f'{snapshot_path.name}.{os.getpid()}.tmp')
+    try:
+        with open(temporary_path, 'w', encoding='utf-8') as writer:
+            writer.write(json.dumps(header) + '\n')
+            writer.write(json.dumps(state) + '\n')
+        os.replace(temporary_path, snapshot_path)
+    finally:
+        if temporary_path.exists():
+            temporary_path.unlink()
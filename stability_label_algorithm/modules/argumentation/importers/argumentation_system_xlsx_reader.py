@@ -8,6 +8,12 @@ from openpyxl import load_workbook
 from ..argumentation_theory.literal import Literal
 from ..argumentation_theory.queryable import Queryable
 from ..argumentation_theory.rule import Rule
+from .argumentation_system_snapshot import read_snapshot, write_snapshot
+
+
+def _to_json_number(value):
+    # Values read by pandas may be NumPy scalars, which cannot be stored as JSON (see _to_snapshot_state).
+    return value.item() if isinstance(value, np.generic) else value
 
 
 class ArgumentationSystemXLSXReader:
@@ -46,6 +52,99 @@ class ArgumentationSystemXLSXReader:
 
         self.source_path = path_to_xls
 
+    @classmethod
+    def from_snapshot_or_xlsx(cls, path_to_xls: Union[Path, str]) -> 'ArgumentationSystemXLSXReader':
+        """
+        Read the argumentation system from the snapshot next to the XLSX file (see argumentation_system_snapshot) if it
+        is still valid, which skips pandas and openpyxl entirely. Otherwise, the XLSX file is read and a new snapshot
+        is written.
+
+        :param path_to_xls: Path to the XLSX file.
+        :return: Reader with the same language, rules, topic_literals, about_text and rule_preference_matrix as
+            ArgumentationSystemXLSXReader(path_to_xls).
+        """
+        state = read_snapshot(path_to_xls)
+        if state is not None:
+            return cls._from_snapshot_state(state, path_to_xls)
+        reader = cls(path_to_xls)
+        write_snapshot(path_to_xls, reader._to_snapshot_state())
+        return reader
+
+    @staticmethod
+    def read_about_text(path_to_xls: Union[Path, str]) -> str:
+        """
+        Read only the About text of the argumentation system (as in about_text), without parsing and linking the rest:
+        from the snapshot if it is still valid, otherwise from the first cell of the About sheet.
+
+        :param path_to_xls: Path to the XLSX file.
+        :return: The About text, or an empty string if there is none.
+        """
+        state = read_snapshot(path_to_xls)
+        if state is not None:
+            return state['about_text']
+        try:
+            workbook = load_workbook(path_to_xls, read_only=True)
+        except Exception as exception:
+            raise ImportError('Could not load Argumentation System.' + str(type(exception)))
+        try:
+            if 'About' not in workbook.sheetnames:
+                return ''
+            for row in workbook['About'].iter_rows(min_row=1, max_row=1, max_col=1, values_only=True):
+                return '' if row[0] is None else row[0]
+            return ''
+        finally:
+            workbook.close()
+
+    def _to_snapshot_state(self) -> dict:
+        # Literals and Rules refer to each other by name, so the state is flat and the links are restored on reading.
+        # It only consists of lists, strings, numbers and None, so that it can be stored as JSON.
+        literals = []
+        for literal in self.language.values():
+            if isinstance(literal, Queryable):
+                query_fields = [literal.natural_language_query, literal.long_natural_language_query,
+                                _to_json_number(literal.priority)]
+            else:
+                query_fields = None
+            position = None if literal.position is None else [_to_json_number(x) for x in literal.position]
+            literals.append([literal.s1, literal.description_if_present, literal.description_if_not_present,
+                             query_fields, [str(contrary) for contrary in literal.contraries],
+                             None if literal.negation is None else str(literal.negation), position])
+        rules = [[_to_json_number(rule.id), [str(antecedent) for antecedent in rule.antecedents], str(rule.consequent),
+                  rule.rule_description] for rule in self.rules]
+        return {'literals': literals, 'rules': rules,
+                'topic_literals': [str(topic_literal) for topic_literal in self.topic_literals],
+                'about_text': self.about_text,
+                'rule_preferences': [self.rule_preference_matrix.values.tolist(),
+                                     [_to_json_number(rule_id) for rule_id in self.rule_preference_matrix.index]]}
+
+    @classmethod
+    def _from_snapshot_state(cls, state: dict, path_to_xls: Union[Path, str]) -> 'ArgumentationSystemXLSXReader':
+        reader = cls.__new__(cls)
+        reader.language = dict()
+        for literal_str, description_if_present, description_if_not_present, query_fields, _, _, position in \
+                state['literals']:
+            if query_fields is not None:
+                literal = Queryable(literal_str, description_if_present, description_if_not_present, *query_fields)
+            else:
+                literal = Literal(literal_str, description_if_present, description_if_not_present, False)
+            literal.position = None if position is None else tuple(position)
+            reader.language[literal_str] = literal
+        for literal_str, _, _, _, contraries_str, negation_str, _ in state['literals']:
+            literal = reader.language[literal_str]
+            literal.contraries = [reader.language[contrary_str] for contrary_str in contraries_str]
+            literal.negation = None if negation_str is None else reader.language[negation_str]
+
+        reader.rules = [Rule(rule_id, {reader.language[literal_str] for literal_str in ants_str},
+                             reader.language[cons_str], exp)
+                        for rule_id, ants_str, cons_str, exp in state['rules']]
+        reader._connect_parents_and_children()
+        reader.topic_literals = [reader.language[literal_str] for literal_str in state['topic_literals']]
+        reader.about_text = state['about_text']
+        rule_preference_values, rule_ids = state['rule_preferences']
+        reader.rule_preference_matrix = pd.DataFrame(rule_preference_values, index=rule_ids, columns=rule_ids)
+        reader.source_path = path_to_xls
+        return reader
+
     def _get_language(self):
         """
         Get the logical language from the argumentation system. A literal l is in the
@@ -0,0 +1,92 @@
+from collections.abc import Mapping
+from typing import Dict, Hashable, Iterator
+
+import numpy as np
+
+from ..argumentation_theory.compiled_argumentation_system import CompiledArgumentationSystem
+from .labels import Labels
+from .stability_label import StabilityLabel, UNSATISFIABLE_BIT, DEFENDED_BIT, OUT_BIT, BLOCKED_BIT, ALL_BITS
+
+
+def _code_bit_property(bit: int) -> property:
+    def getter(self) -> bool:
+        return bool(self.codes[self.index] & bit)
+
+    def setter(self, value: bool) -> None:
+        if value:
+            self.codes[self.index] = self.codes[self.index] | bit
+        else:
+            self.codes[self.index] = self.codes[self.index] & (ALL_BITS ^ bit)
+
+    return property(getter, setter)
+
+
+class StabilityLabelView(StabilityLabel):
+    """
+    A StabilityLabelView is a StabilityLabel whose four booleans are read from (and written to) a 4-bit code in an
+    array of codes. Changing a boolean of the view changes the underlying array.
+    """
+    # noinspection PyMissingConstructor
+    def __init__(self, codes, index: int):
+        self.codes = codes
+        self.index = index
+
+    unsatisfiable = _code_bit_property(UNSATISFIABLE_BIT)
+    defended = _code_bit_property(DEFENDED_BIT)
+    out = _code_bit_property(OUT_BIT)
+    blocked = _code_bit_property(BLOCKED_BIT)
+
+    @property
+    def code(self) -> int:
+        return int(self.codes[self.index])
+
+
+class LabelingView(Mapping):
+    """
+    A LabelingView gives dict-like access (indexed on Literal or Rule) to StabilityLabels that are stored as 4-bit codes
+    in an array indexed on compiled id.
+    """
+    def __init__(self, ids: Dict[Hashable, int], codes: np.ndarray):
+        self.ids = ids
+        self.codes = codes
+
+    def __getitem__(self, key) -> StabilityLabelView:
+        return StabilityLabelView(self.codes, self.ids[key])
+
+    def __setitem__(self, key, label: StabilityLabel) -> None:
+        self.codes[self.ids[key]] = label.code
+
+    def __iter__(self) -> Iterator:
+        return iter(self.ids)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+class ArrayLabels(Labels):
+    """
+    ArrayLabels are Labels that store the StabilityLabel of each Literal and Rule as a 4-bit code in a NumPy uint8 array
+    indexed on the ids of a CompiledArgumentationSystem. The literal_labeling and rule_labeling can be used just like
+    the dicts of regular Labels.
+    """
+    def __init__(self, compiled_argumentation_system: CompiledArgumentationSystem,
+                 literal_codes: np.ndarray, rule_codes: np.ndarray):
+        self.compiled_argumentation_system = compiled_argumentation_system
+        self.literal_codes = literal_codes
+        self.rule_codes = rule_codes
+        super().__init__(LabelingView(compiled_argumentation_system.literal_ids, literal_codes),
+                         LabelingView(compiled_argumentation_system.rule_ids, rule_codes))
+
+    @classmethod
+    def from_bytearrays(cls, compiled_argumentation_system: CompiledArgumentationSystem,
+                        literal_codes: bytearray, rule_codes: bytearray) -> 'ArrayLabels':
+        """
+        Create ArrayLabels from codes in bytearrays (as used by the labelers), without copying them.
+
+        :param compiled_argumentation_system: The CompiledArgumentationSystem that assigned the ids.
+        :param literal_codes: Code for each Literal id.
+        :param rule_codes: Code for each Rule id.
+        :return: The corresponding ArrayLabels.
+        """
+        return cls(compiled_argumentation_system,
+                   np.frombuffer(literal_codes, dtype=np.uint8), np.frombuffer(rule_codes, dtype=np.uint8))
@@ -1,6 +1,9 @@
+from .array_labels import ArrayLabels
 from .labels import Labels
 from .labeler_interface import LabelerInterface
 from .satisfiability_labeler import SatisfiabilityLabeler
+from .stability_label import UNSATISFIABLE_BIT as U, DEFENDED_BIT as D, OUT_BIT as O, BLOCKED_BIT as B, ALL_BITS
+from .worklist import propagate
 from ..argumentation_theory.argumentation_theory import ArgumentationTheory
 
 
@@ -9,147 +12,126 @@ class FourBoolLabeler(LabelerInterface):
     The FourBoolLabeler is the labeler presented at COMMA 2020 (version with classical negation) and submitted to ESwA.
     This Labeler uses the SatisfiabilityLabeler as preprocessing step and subsequently iteratively checks which of the
     four booleans in the StabilityLabels can be turned from True to False.
+    Labels are handled as 4-bit codes (see StabilityLabel.code), so U, D, O and B below are the bits of the four
+    booleans.
     """
 
     def __init__(self):
         super().__init__()
 
     def label(self, argumentation_theory: ArgumentationTheory) -> Labels:
+        compiled = argumentation_theory.argumentation_system.compiled
+        observed, contrary_observed = argumentation_theory.observed, argumentation_theory.contrary_observed
+
         # Preprocessing: take the initial labeling from the SatisfiabilityLabeler
-        labels = SatisfiabilityLabeler().label(argumentation_theory)
-        rules_visited = {rule: False for rule in argumentation_theory.argumentation_system.rules}
-
-        # Start by coloring leaves (literals for which there is no rule) and observables
-        leaves_and_observables = [literal for literal in argumentation_theory.argumentation_system.language.values()
-                                  if not literal.children or literal.is_observable]
-        rules_to_reconsider = set()
-        for literal in leaves_and_observables:
-            self.color_literal(argumentation_theory, literal, labels)
-            rules_to_reconsider = rules_to_reconsider | set(literal.parents)
-
-        # Color rules and (contraries of) their conclusions
-        while rules_to_reconsider:
-            rule = rules_to_reconsider.pop()
-
-            # Store old label so we can check if the label changed.
-            old_rule_label = labels.rule_labeling[rule].__copy__()
-
-            self.color_rule(rule, labels)
-
-            # If this was the first time the rule was considered or if its label changed, it may influence others.
-            if not rules_visited[rule] or labels.rule_labeling[rule] != old_rule_label:
-                old_literal_label = labels.literal_labeling[rule.consequent].__copy__()
-                self.color_literal(argumentation_theory, rule.consequent, labels)
-                if labels.literal_labeling[rule.consequent] != old_literal_label:
-                    rules_to_reconsider = rules_to_reconsider | set(rule.consequent.parents)
-                for contrary_literal in rule.consequent.contraries:
-                    old_contrary_literal_label = labels.literal_labeling[contrary_literal].__copy__()
-                    self.color_literal(argumentation_theory, contrary_literal, labels)
-                    if labels.literal_labeling[contrary_literal] != old_contrary_literal_label:
-                        rules_to_reconsider = rules_to_reconsider | set(contrary_literal.parents)
-                rules_visited[rule] = True
-
-        return labels
+        literal_codes, rule_codes = SatisfiabilityLabeler().label_codes(compiled, observed)
+
+        propagate(compiled,
+                  lambda literal_id: self.color_literal(compiled, observed, contrary_observed, literal_id,
+                                                        literal_codes, rule_codes),
+                  lambda rule_id: self.color_rule(compiled, rule_id, literal_codes, rule_codes),
+                  literal_codes, rule_codes)
+
+        return ArrayLabels.from_bytearrays(compiled, literal_codes, rule_codes)
 
     @staticmethod
-    def color_literal(argumentation_theory, literal, labels):
+    def color_literal(compiled, observed, contrary_observed, literal_id, literal_codes, rule_codes):
         """
         Color the Literal, that is: check, based on observations/rules for this literal/rules for its contraries, if
         this Literal can still become unsatisfiable/defended/out/blocked.
         """
-        if literal.is_observable and literal in argumentation_theory.knowledge_base:
+        code = literal_codes[literal_id]
+        children = [rule_codes[rule_id] for rule_id in compiled.literal_children[literal_id]]
+        contraries = compiled.literal_contraries[literal_id]
+        contrary_children = [rule_codes[contrary_rule_id]
+                             for contrary_id in contraries
+                             for contrary_rule_id in compiled.literal_children[contrary_id]]
+        is_observable = compiled.literal_is_observable[literal_id]
+
+        if is_observable and observed[literal_id]:
             # L-U-a: The literal is observed, so it cannot be unsatisfiable.
-            labels.literal_labeling[literal].unsatisfiable = False
-        elif any([not labels.rule_labeling[rule].unsatisfiable for rule in literal.children]):
+            code &= ALL_BITS ^ U
+        elif any([not rule_code & U for rule_code in children]):
             # L-U-b: There is a rule-based argument for the literal, so it cannot be unsatisfiable.
-            labels.literal_labeling[literal].unsatisfiable = False
+            code &= ALL_BITS ^ U
 
-        if literal.is_observable:
-            if any([contrary_literal in argumentation_theory.knowledge_base
-                    for contrary_literal in literal.contraries]):
+        if is_observable:
+            if contrary_observed[literal_id]:
                 # L-D-a: A contrary of the literal is observed, so the literal cannot be in the grounded extension.
-                labels.literal_labeling[literal].defended = False
+                code &= ALL_BITS ^ D
         else:
-            if all([not labels.rule_labeling[rule].defended for rule in literal.children]):
+            if all([not rule_code & D for rule_code in children]):
                 # L-D-b: The literal is not observable and there is no defended rule, so the literal cannot be defended.
-                labels.literal_labeling[literal].defended = False
-            elif any([not labels.rule_labeling[contrary_rule].unsatisfiable and
-                      not labels.rule_labeling[contrary_rule].out
-                      for contrary_literal in literal.contraries
-                      for contrary_rule in contrary_literal.children]):
+                code &= ALL_BITS ^ D
+            elif any([not rule_code & (U | O) for rule_code in contrary_children]):
                 # L-D-c: The literal is not observable and there is a defended or blocked rule for a contrary, so the
                 # literal cannot be defended.
-                labels.literal_labeling[literal].defended = False
+                code &= ALL_BITS ^ D
 
-        if literal.is_observable:
-            if literal in argumentation_theory.knowledge_base:
+        if is_observable:
+            if observed[literal_id]:
                 # L-O-a: Observed literals cannot be out.
-                labels.literal_labeling[literal].out = False
-            elif all([any([contrary_contrary_literal in argumentation_theory.knowledge_base
-                           for contrary_contrary_literal in contrary_literal.contraries])
-                      for contrary_literal in literal.contraries]):
-                if all([not labels.rule_labeling[rule].out for rule in literal.children]):
+                code &= ALL_BITS ^ O
+            elif all([contrary_observed[contrary_id] for contrary_id in contraries]):
+                if all([not rule_code & O for rule_code in children]):
                     # L-O-b
-                    labels.literal_labeling[literal].out = False
-                elif any([not labels.rule_labeling[rule].unsatisfiable and not labels.rule_labeling[rule].out
-                          for rule in literal.children]):
+                    code &= ALL_BITS ^ O
+                elif any([not rule_code & (U | O) for rule_code in children]):
                     # L-O-c
-                    labels.literal_labeling[literal].out = False
+                    code &= ALL_BITS ^ O
         else:
-            if all([not labels.rule_labeling[rule].out for rule in literal.children]):
+            if all([not rule_code & O for rule_code in children]):
                 # L-O-d
-                labels.literal_labeling[literal].out = False
-            elif any([not labels.rule_labeling[rule].unsatisfiable and not labels.rule_labeling[rule].out
-                      for rule in literal.children]):
+                code &= ALL_BITS ^ O
+            elif any([not rule_code & (U | O) for rule_code in children]):
                 # L-O-e
-                labels.literal_labeling[literal].out = False
-        if all([not labels.rule_labeling[rule].defended and not labels.rule_labeling[rule].out and
-                not labels.rule_labeling[rule].blocked for rule in literal.children]):
+                code &= ALL_BITS ^ O
+        if all([not rule_code & (D | O | B) for rule_code in children]):
             # L-O-f: There is no rule-based argument for the literal, so the literal cannot be out.
-            labels.literal_labeling[literal].out = False
+            code &= ALL_BITS ^ O
 
-        if literal.is_observable:
+        if is_observable:
             # L-B-a: Observable literals cannot be blocked (only defended or unsatisfiable).
-            labels.literal_labeling[literal].blocked = False
-        elif all([not labels.rule_labeling[rule].defended and
-                  not labels.rule_labeling[rule].blocked for rule in literal.children]):
+            code &= ALL_BITS ^ B
+        elif all([not rule_code & (D | B) for rule_code in children]):
             # L-B-b: There is no defended or blocked rule-based argument for the literal, so it cannot be blocked.
-            labels.literal_labeling[literal].blocked = False
-        elif all([not labels.rule_labeling[contrary_rule].blocked and
-                  not labels.rule_labeling[contrary_rule].defended
-                  for contrary_literal in literal.contraries
-                  for contrary_rule in contrary_literal.children]):
-            if all([not labels.rule_labeling[rule].blocked for rule in literal.children]):
+            code &= ALL_BITS ^ B
+        elif all([not rule_code & (B | D) for rule_code in contrary_children]):
+            if all([not rule_code & B for rule_code in children]):
                 # L-B-c: There is no rule-based counterargument that is strong enough.
-                labels.literal_labeling[literal].blocked = False
-            elif any([not labels.rule_labeling[rule].unsatisfiable and not labels.rule_labeling[rule].out and
-                      not labels.rule_labeling[rule].blocked
-                      for rule in literal.children]):
+                code &= ALL_BITS ^ B
+            elif any([not rule_code & (U | O | B) for rule_code in children]):
                 # L-B-d: There is a rule-based argument in the grounded extension.
-                labels.literal_labeling[literal].blocked = False
-            
+                code &= ALL_BITS ^ B
+
+        literal_codes[literal_id] = code
+
     @staticmethod
-    def color_rule(rule, labels):
+    def color_rule(compiled, rule_id, literal_codes, rule_codes):
         """
         Color the Rule, that is: check, based on is children, if this Rule can still become
         unsatisfiable/defended/out/blocked.
         """
-        if all([not labels.literal_labeling[literal].unsatisfiable for literal in rule.antecedents]):
+        code = rule_codes[rule_id]
+        antecedents = [literal_codes[literal_id] for literal_id in compiled.rule_antecedents[rule_id]]
+
+        if all([not literal_code & U for literal_code in antecedents]):
             # R-U-a: None of the antecedents can become unsatisfiable, so the rule cannot be unsatisfiable.
-            labels.rule_labeling[rule].unsatisfiable = False
+            code &= ALL_BITS ^ U
 
-        if any([not labels.literal_labeling[literal].defended for literal in rule.antecedents]):
+        if any([not literal_code & D for literal_code in antecedents]):
             # R-D-a: At least one of the antecedents cannot become defended, so the rule cannot be defended.
-            labels.rule_labeling[rule].defended = False
+            code &= ALL_BITS ^ D
 
-        if all([not labels.literal_labeling[literal].out for literal in rule.antecedents]):
+        if all([not literal_code & O for literal_code in antecedents]):
             # R-O-a: None of the antecedents can become out, so the rule cannot be out.
-            labels.rule_labeling[rule].out = False
+            code &= ALL_BITS ^ O
 
-        if all([not labels.literal_labeling[literal].blocked for literal in rule.antecedents]):
+        if all([not literal_code & B for literal_code in antecedents]):
             # R-B-a: None of the antecedents can become blocked, so the rule cannot be blocked.
-            labels.rule_labeling[rule].blocked = False
-        if any([not labels.literal_labeling[literal].blocked and
-                not labels.literal_labeling[literal].defended for literal in rule.antecedents]):
+            code &= ALL_BITS ^ B
+        if any([not literal_code & (B | D) for literal_code in antecedents]):
             # R-B-b: At least one of the antecedents cannot become defended or blocked, so the rule cannot be blocked.
-            labels.rule_labeling[rule].blocked = False
+            code &= ALL_BITS ^ B
+
+        rule_codes[rule_id] = code
@@ -1,6 +1,8 @@
+from .array_labels import ArrayLabels
 from .labels import Labels
-from .stability_label import StabilityLabel
+from .stability_label import UNSATISFIABLE_BIT as U, DEFENDED_BIT as D, OUT_BIT as O, BLOCKED_BIT as B, ALL_BITS
 from .labeler_interface import LabelerInterface
+from .worklist import propagate
 from ..argumentation_theory.argumentation_theory import ArgumentationTheory
 
 
@@ -10,142 +12,109 @@ class FQASLabeler(LabelerInterface):
     (here modelled as the "stable" StabilityLabels) corresponding to stable justification statuses or some unknown
     label (here modelled as StableLabel(True, True, True, True)) for Literals and Rules that are not recognised as
     being stable. Note that this algorithm recognises less stable situations than the FourBoolLabeler.
+    Labels are handled as 4-bit codes (see StabilityLabel.code): a stable label is one of the single bits U, D, O, B
+    and the unknown label is ALL_BITS.
     """
 
     def __init__(self):
         super().__init__()
-        self.literal_labeling = {}
-        self.rule_labeling = {}
-        self.rules_visited = dict()
+        self.literal_labeling = []
+        self.rule_labeling = []
 
     def label(self, argumentation_theory: ArgumentationTheory) -> Labels:
-        self.literal_labeling = {literal: StabilityLabel(True, True, True, True)
-                                 for literal in argumentation_theory.argumentation_system.language.values()}
-        self.rule_labeling = {rule: StabilityLabel(True, True, True, True)
-                              for rule in argumentation_theory.argumentation_system.rules}
-        self.rules_visited = {rule: False for rule in argumentation_theory.argumentation_system.rules}
+        compiled = argumentation_theory.argumentation_system.compiled
+        observed, contrary_observed = argumentation_theory.observed, argumentation_theory.contrary_observed
 
-        # Start by coloring leaves (literals for which there is no rule) and observables (O(|L|))
-        leaves_and_observables = [literal for literal in argumentation_theory.argumentation_system.language.values()
-                                  if not literal.children or literal.is_observable]
-        rules_to_reconsider = set()
-        for literal in leaves_and_observables:  # Max |L| iterations
-            self.color_literal(argumentation_theory, literal)  # Max |L||R_l/-l| executions in total = c*|R|
-            rules_to_reconsider = rules_to_reconsider | set(literal.parents)
+        self.literal_labeling = bytearray([ALL_BITS]) * compiled.nr_of_literals
+        self.rule_labeling = bytearray([ALL_BITS]) * compiled.nr_of_rules
 
-        # Color rules and (contraries of) their conclusions
-        while rules_to_reconsider:
-            # Each rule r is considered (i.e. added to rules_to_reconsider) at most 4*|ants(r)| times.
-            rule = rules_to_reconsider.pop()
+        propagate(compiled,
+                  lambda literal_id: self.color_literal(compiled, observed, contrary_observed, literal_id),
+                  lambda rule_id: self.color_rule(compiled, rule_id),
+                  self.literal_labeling, self.rule_labeling)
 
-            # Store old label so we can check if the label changed.
-            old_rule_label = self.rule_labeling[rule].__copy__()
+        return ArrayLabels.from_bytearrays(compiled, self.literal_labeling, self.rule_labeling)
 
-            # This takes c*|ants(r)| steps for each consideration of r. So in total O(|R|^2|L|) steps.
-            self.color_rule(rule)
-
-            # If this was the first time the rule was considered or if its label changed, it may influence others.
-            if not self.rules_visited[rule] or self.rule_labeling[rule] != old_rule_label:
-                # Considering a literal l takes c*|R| steps. It only happens after initially considering or changing the
-                # label of a rule for l/-l, so at most 4*|R_l/-l| times. So in total considering all literals all times
-                # takes O(|R|^2) steps.
-                old_literal_label = self.literal_labeling[rule.consequent].__copy__()
-                self.color_literal(argumentation_theory, rule.consequent)
-                if self.literal_labeling[rule.consequent] != old_literal_label:
-                    rules_to_reconsider = rules_to_reconsider | set(rule.consequent.parents)
-                for contrary_literal in rule.consequent.contraries:
-                    old_contrary_literal_label = self.literal_labeling[contrary_literal].__copy__()
-                    self.color_literal(argumentation_theory, contrary_literal)
-                    if self.literal_labeling[contrary_literal] != old_contrary_literal_label:
-                        rules_to_reconsider = rules_to_reconsider | set(contrary_literal.parents)
-                self.rules_visited[rule] = True
-
-        return Labels(self.literal_labeling, self.rule_labeling)
-
-    def color_literal(self, argumentation_theory, literal):
+    def color_literal(self, compiled, observed, contrary_observed, literal_id):
         """
         Color the Literal, that is: check, based on observations/rules for this literal/rules for its contraries, if
         this Literal can still become unsatisfiable/defended/out/blocked.
         """
-        if literal.is_observable:
-            if literal in argumentation_theory.knowledge_base:
+        children = [self.rule_labeling[rule_id] for rule_id in compiled.literal_children[literal_id]]
+        contraries = compiled.literal_contraries[literal_id]
+        contrary_children = [self.rule_labeling[contrary_rule_id]
+                             for contrary_id in contraries
+                             for contrary_rule_id in compiled.literal_children[contrary_id]]
+
+        if compiled.literal_is_observable[literal_id]:
+            if observed[literal_id]:
                 # D literal A
-                self.literal_labeling[literal] = StabilityLabel(False, True, False, False)
-            elif any([contrary_literal in argumentation_theory.knowledge_base
-                      for contrary_literal in literal.contraries]):
-                if all([self.rule_labeling[rule] == StabilityLabel(True, False, False, False)
-                        for rule in literal.children]):
+                self.literal_labeling[literal_id] = D
+            elif contrary_observed[literal_id]:
+                if all([rule_code == U for rule_code in children]):
                     # U literal A/B
-                    self.literal_labeling[literal] = StabilityLabel(True, False, False, False)
-                elif any([self.rule_labeling[rule] == StabilityLabel(False, True, False, False) or
-                          self.rule_labeling[rule] == StabilityLabel(False, False, True, False) or
-                          self.rule_labeling[rule] == StabilityLabel(False, False, False, True)
-                          for rule in literal.children]):
+                    self.literal_labeling[literal_id] = U
+                elif any([rule_code == D or
+                          rule_code == O or
+                          rule_code == B
+                          for rule_code in children]):
                     # O literal A
-                    self.literal_labeling[literal] = StabilityLabel(False, False, True, False)
+                    self.literal_labeling[literal_id] = O
         else:
-            if all([self.rule_labeling[rule] == StabilityLabel(True, False, False, False)
-                    for rule in literal.children]):
+            if all([rule_code == U for rule_code in children]):
                 # U literal A/B
-                self.literal_labeling[literal] = StabilityLabel(True, False, False, False)
-            elif any([self.rule_labeling[rule] == StabilityLabel(False, True, False, False)
-                      for rule in literal.children]) and \
-                    all([self.rule_labeling[contrary_rule] == StabilityLabel(True, False, False, False) or
-                         self.rule_labeling[contrary_rule] == StabilityLabel(False, False, True, False)
-                         for contrary_literal in literal.contraries
-                         for contrary_rule in contrary_literal.children]):
+                self.literal_labeling[literal_id] = U
+            elif any([rule_code == D for rule_code in children]) and \
+                    all([rule_code == U or
+                         rule_code == O
+                         for rule_code in contrary_children]):
                 # D literal B/C
-                self.literal_labeling[literal] = StabilityLabel(False, True, False, False)
-            elif any([self.rule_labeling[rule] == StabilityLabel(False, False, True, False)
-                      for rule in literal.children]) and \
-                    all([self.rule_labeling[rule] == StabilityLabel(True, False, False, False) or
-                         self.rule_labeling[rule] == StabilityLabel(False, False, True, False)
-                         for rule in literal.children]):
+                self.literal_labeling[literal_id] = D
+            elif any([rule_code == O for rule_code in children]) and \
+                    all([rule_code == U or
+                         rule_code == O
+                         for rule_code in children]):
                 # O literal B
-                self.literal_labeling[literal] = StabilityLabel(False, False, True, False)
-            elif any([self.rule_labeling[rule] == StabilityLabel(False, True, False, False) or
-                      self.rule_labeling[rule] == StabilityLabel(False, False, False, True)
-                      for rule in literal.children]) and \
-                    any([self.rule_labeling[contrary_rule] == StabilityLabel(False, True, False, False) or
-                         self.rule_labeling[contrary_rule] == StabilityLabel(False, False, False, True)
-                         for contrary_literal in literal.contraries
-                         for contrary_rule in contrary_literal.children]):
+                self.literal_labeling[literal_id] = O
+            elif any([rule_code == D or
+                      rule_code == B
+                      for rule_code in children]) and \
+                    any([rule_code == D or
+                         rule_code == B
+                         for rule_code in contrary_children]):
                 # B literal A
-                self.literal_labeling[literal] = StabilityLabel(False, False, False, True)
-            elif any([self.rule_labeling[rule] == StabilityLabel(False, False, False, True)
-                      for rule in literal.children]) and \
-                    all([self.rule_labeling[rule] == StabilityLabel(True, False, False, False) or
-                         self.rule_labeling[rule] == StabilityLabel(False, False, True, False) or
-                         self.rule_labeling[rule] == StabilityLabel(False, False, False, True)
-                         for rule in literal.children]):
+                self.literal_labeling[literal_id] = B
+            elif any([rule_code == B for rule_code in children]) and \
+                    all([rule_code == U or
+                         rule_code == O or
+                         rule_code == B
+                         for rule_code in children]):
                 # B literal B
-                self.literal_labeling[literal] = StabilityLabel(False, False, False, True)
+                self.literal_labeling[literal_id] = B
 
-    def color_rule(self, rule):
+    def color_rule(self, compiled, rule_id):
         """
         Color the Rule, that is: check, based on is antecedents, if this Rule can still become
         unsatisfiable/defended/out/blocked.
         """
-        if any([self.literal_labeling[literal] == StabilityLabel(True, False, False, False)
-                for literal in rule.antecedents]):
+        antecedents = [self.literal_labeling[literal_id] for literal_id in compiled.rule_antecedents[rule_id]]
+
+        if any([literal_code == U for literal_code in antecedents]):
             # U rule
-            self.rule_labeling[rule] = StabilityLabel(True, False, False, False)
-        elif all([self.literal_labeling[literal] == StabilityLabel(False, True, False, False)
-                  for literal in rule.antecedents]):
+            self.rule_labeling[rule_id] = U
+        elif all([literal_code == D for literal_code in antecedents]):
             # D rule
-            self.rule_labeling[rule] = StabilityLabel(False, True, False, False)
-        elif any([self.literal_labeling[literal] == StabilityLabel(False, False, True, False)
-                  for literal in rule.antecedents]) and \
-                all([self.literal_labeling[literal] == StabilityLabel(False, True, False, False) or
-                     self.literal_labeling[literal] == StabilityLabel(False, False, True, False) or
-                     self.literal_labeling[literal] == StabilityLabel(False, False, False, True)
-                     for literal in rule.antecedents]):
+            self.rule_labeling[rule_id] = D
+        elif any([literal_code == O for literal_code in antecedents]) and \
+                all([literal_code == D or
+                     literal_code == O or
+                     literal_code == B
+                     for literal_code in antecedents]):
             # O rule
-            self.rule_labeling[rule] = StabilityLabel(False, False, True, False)
-        elif any([self.literal_labeling[literal] == StabilityLabel(False, False, False, True)
-                  for literal in rule.antecedents]) and \
-                all([self.literal_labeling[literal] == StabilityLabel(False, True, False, False) or
-                     self.literal_labeling[literal] == StabilityLabel(False, False, False, True)
-                     for literal in rule.antecedents]):
+            self.rule_labeling[rule_id] = O
+        elif any([literal_code == B for literal_code in antecedents]) and \
+                all([literal_code == D or
+                     literal_code == B
+                     for literal_code in antecedents]):
             # B rule
-            self.rule_labeling[rule] = StabilityLabel(False, False, False, True)
+            self.rule_labeling[rule_id] = B
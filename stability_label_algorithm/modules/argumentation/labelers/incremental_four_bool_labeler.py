@@ -0,0 +1,276 @@
+from typing import Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from .array_labels import ArrayLabels
+from .four_bool_labeler import FourBoolLabeler
+from .satisfiability_labeler import SatisfiabilityLabeler
+from .stability_label import UNSATISFIABLE_BIT, ALL_BITS
+from .worklist import Worklist, propagate
+from ..argumentation_theory.argumentation_system import ArgumentationSystem
+from ..argumentation_theory.argumentation_theory import ArgumentationTheory
+from ..argumentation_theory.literal import Literal
+from ..argumentation_theory.queryable import Queryable
+
+
+class IncrementalFourBoolLabeler(FourBoolLabeler):
+    """
+    The IncrementalFourBoolLabeler assigns the same Labels as the FourBoolLabeler, but keeps the labeling of the
+    previous knowledge base. When a Queryable is added to or removed from the knowledge base, only the cone of
+    Literals and Rules that (transitively) depend on it is relabelled: the Queryable, its contraries, their parents,
+    the conclusions of those parents, the contraries of these conclusions, and so on.
+
+    A labeler object is a session on one ArgumentationSystem: call start, then add_queryable / remove_queryable, and
+    read labels whenever the Labels of the current knowledge base are needed (this copies all label codes).
+    It can also be used as a regular labeler (e.g. in the ArgumentationEngine): label moves the session to the knowledge
+    base of the given ArgumentationTheory by adding and removing the Queryables that differ.
+    If a cone covers most of the ArgumentationSystem, the session relabels from scratch, as the FourBoolLabeler does.
+    """
+
+    # If the cone of a change contains more than this fraction of all Literals, the session relabels from scratch
+    # instead, since the FourBoolLabeler is then faster than relabelling the cone.
+    FULL_RELABEL_FRACTION = 0.5
+
+    def __init__(self):
+        super().__init__()
+        self.compiled = None
+        self.observed: List[bool] = []
+        self.contrary_observed: List[bool] = []
+        self.literal_satisfiable: List[bool] = []
+        self.rule_satisfiable: List[bool] = []
+        self.literal_codes = bytearray()
+        self.rule_codes = bytearray()
+
+    @property
+    def knowledge_base(self) -> List[Queryable]:
+        return [self.compiled.literals[literal_id] for literal_id, is_observed in enumerate(self.observed)
+                if is_observed]
+
+    @property
+    def labels(self) -> ArrayLabels:
+        """
+        The Labels for the current knowledge base. These are a copy, so they do not change in later updates.
+        """
+        return ArrayLabels.from_bytearrays(self.compiled, bytearray(self.literal_codes), bytearray(self.rule_codes))
+
+    def start(self, argumentation_system: ArgumentationSystem,
+              knowledge_base: Iterable[Queryable] = ()) -> ArrayLabels:
+        """
+        Start a new session: label the ArgumentationTheory with this knowledge base from scratch.
+
+        :param argumentation_system: ArgumentationSystem that the session works on.
+        :param knowledge_base: Initial knowledge base.
+        :return: Labels for the initial ArgumentationTheory.
+        """
+        self.compiled = argumentation_system.compiled
+        self.observed = self.compiled.literal_mask(knowledge_base)
+        self.contrary_observed = [False] * self.compiled.nr_of_literals
+        for literal_id, is_observed in enumerate(self.observed):
+            if is_observed:
+                self._update_contrary_observed(literal_id)
+        self._label_from_scratch()
+        return self.labels
+
+    def add_queryable(self, queryable: Queryable) -> None:
+        """
+        Add a Queryable to the knowledge base and relabel the affected cone.
+
+        :param queryable: Queryable to add. It must be consistent with the current knowledge base.
+        """
+        queryable_id = self.compiled.literal_ids[queryable]
+        if not self.observed[queryable_id]:
+            if any([self.observed[contrary_id] for contrary_id in self._symmetric_contraries(queryable_id)]):
+                raise ValueError(f'Cannot add {str(queryable)}: a contrary is already in the knowledge base.')
+            self.observed[queryable_id] = True
+            self._update([queryable_id])
+
+    def remove_queryable(self, queryable: Queryable) -> None:
+        """
+        Remove a Queryable from the knowledge base and relabel the affected cone.
+
+        :param queryable: Queryable to remove.
+        """
+        queryable_id = self.compiled.literal_ids[queryable]
+        if self.observed[queryable_id]:
+            self.observed[queryable_id] = False
+            self._update([queryable_id])
+
+    def label(self, argumentation_theory: ArgumentationTheory) -> ArrayLabels:
+        try:
+            self._move_to(argumentation_theory)
+        except ValueError:
+            # A contrary of an added Queryable is in the knowledge base (which the session does not allow), so label
+            # this knowledge base from scratch instead.
+            self.start(argumentation_theory.argumentation_system, argumentation_theory.knowledge_base)
+        return self.labels
+
+    def label_batch(self, argumentation_system: ArgumentationSystem,
+                    knowledge_bases: Iterable[Iterable[Literal]]) -> np.ndarray:
+        """
+        Label the knowledge bases one after the other in the same session, so that each one is labelled by relabelling
+        the difference with the previous one. This works best if consecutive knowledge bases are similar, for example
+        when they are sorted.
+        """
+        compiled = argumentation_system.compiled
+        rows = []
+        for knowledge_base in knowledge_bases:
+            argumentation_theory = ArgumentationTheory(argumentation_system, list(knowledge_base))
+            try:
+                self._move_to(argumentation_theory)
+            except ValueError:
+                # A contrary of an added Queryable is in the knowledge base (which the session does not allow), so
+                # label this knowledge base from scratch instead.
+                self.start(argumentation_system, argumentation_theory.knowledge_base)
+            rows.append(np.frombuffer(bytes(self.literal_codes), dtype=np.uint8))
+        if not rows:
+            return np.zeros((0, compiled.nr_of_literals), dtype=np.uint8)
+        return np.stack(rows)
+
+    def _move_to(self, argumentation_theory: ArgumentationTheory) -> None:
+        """
+        Move the session to the knowledge base of the ArgumentationTheory, relabelling the cone of all Queryables that
+        are added or removed at once.
+        """
+        compiled = argumentation_theory.argumentation_system.compiled
+        if compiled is not self.compiled:
+            self.start(argumentation_theory.argumentation_system, argumentation_theory.knowledge_base)
+            return
+
+        new_observed = argumentation_theory.observed
+        changed_ids = [literal_id for literal_id, (is_observed, will_be_observed)
+                       in enumerate(zip(self.observed, new_observed)) if is_observed != will_be_observed]
+        for literal_id in changed_ids:
+            if new_observed[literal_id] and \
+                    any([new_observed[contrary_id] for contrary_id in self._symmetric_contraries(literal_id)]):
+                raise ValueError(f'Cannot add {str(compiled.literals[literal_id])}: '
+                                 f'a contrary is in the knowledge base.')
+        for literal_id in changed_ids:
+            self.observed[literal_id] = new_observed[literal_id]
+        if changed_ids:
+            self._update(changed_ids)
+
+    def _update(self, changed_ids: List[int]) -> None:
+        """
+        Relabel after the observation of the Queryables with these ids changed: the union of their cones, or everything
+        if that is a large part of the ArgumentationSystem.
+        """
+        for queryable_id in changed_ids:
+            self._update_contrary_observed(queryable_id)
+        cone = self._cone(changed_ids, int(self.FULL_RELABEL_FRACTION * self.compiled.nr_of_literals))
+        if cone is None:
+            self._label_from_scratch()
+        else:
+            self._relabel(*cone)
+
+    def _label_from_scratch(self) -> None:
+        """
+        Label the current knowledge base as the FourBoolLabeler does.
+        """
+        compiled, observed, contrary_observed = self.compiled, self.observed, self.contrary_observed
+        literal_codes, rule_codes = SatisfiabilityLabeler().label_codes(compiled, observed)
+        self.literal_satisfiable = [code != UNSATISFIABLE_BIT for code in literal_codes]
+        self.rule_satisfiable = [code != UNSATISFIABLE_BIT for code in rule_codes]
+        propagate(compiled,
+                  lambda literal_id: self.color_literal(compiled, observed, contrary_observed, literal_id,
+                                                        literal_codes, rule_codes),
+                  lambda rule_id: self.color_rule(compiled, rule_id, literal_codes, rule_codes),
+                  literal_codes, rule_codes)
+        self.literal_codes, self.rule_codes = literal_codes, rule_codes
+
+    def _update_contrary_observed(self, queryable_id: int) -> None:
+        """
+        Update contrary_observed for the Literals that have this Queryable as a contrary.
+        """
+        for literal_id in self.compiled.literal_contrary_of[queryable_id]:
+            self.contrary_observed[literal_id] = any([self.observed[contrary_id]
+                                                      for contrary_id in self.compiled.literal_contraries[literal_id]])
+
+    def _symmetric_contraries(self, literal_id: int) -> Tuple[int, ...]:
+        return self.compiled.literal_contraries[literal_id] + self.compiled.literal_contrary_of[literal_id]
+
+    def _cone(self, queryable_ids: List[int], max_literals: Optional[int] = None) -> \
+            Optional[Tuple[Set[int], Set[int]]]:
+        """
+        Find all Literals and Rules whose label may depend on whether the Queryables are observed. These are the
+        Queryables, their contraries and their contraries (whose labeling rules check the observation) and everything
+        above them: the parents of a Literal, the conclusion of a Rule and the contraries of that conclusion.
+        If the cone has more than max_literals Literals, the search stops and None is returned.
+        """
+        literal_cone = set(queryable_ids)
+        for queryable_id in queryable_ids:
+            for contrary_id in self._symmetric_contraries(queryable_id):
+                literal_cone.add(contrary_id)
+                literal_cone.update(self._symmetric_contraries(contrary_id))
+        rule_cone = set()
+
+        to_visit = list(literal_cone)
+        while to_visit:
+            literal_id = to_visit.pop()
+            for rule_id in self.compiled.literal_parents[literal_id]:
+                if rule_id in rule_cone:
+                    continue
+                rule_cone.add(rule_id)
+                consequent_id = self.compiled.rule_consequents[rule_id]
+                for affected_id in (consequent_id,) + self._symmetric_contraries(consequent_id):
+                    if affected_id not in literal_cone:
+                        literal_cone.add(affected_id)
+                        to_visit.append(affected_id)
+            if max_literals is not None and len(literal_cone) > max_literals:
+                return None
+        return literal_cone, rule_cone
+
+    def _relabel(self, literal_cone: Set[int], rule_cone: Set[int]) -> None:
+        """
+        Relabel the Literals and Rules in the cone, given that the labels outside the cone do not change.
+        """
+        compiled, observed, contrary_observed = self.compiled, self.observed, self.contrary_observed
+        literal_codes, rule_codes = self.literal_codes, self.rule_codes
+
+        # Satisfiability, restarted from scratch within the cone: forward chaining with, for each Rule, the number of
+        # antecedents that are not (yet) satisfiable. Rules outside the cone keep their satisfiability.
+        for rule_id in rule_cone:
+            self.rule_satisfiable[rule_id] = False
+        for literal_id in literal_cone:
+            self.literal_satisfiable[literal_id] = \
+                (compiled.literal_is_observable[literal_id] and not contrary_observed[literal_id]) or \
+                any([self.rule_satisfiable[rule_id] for rule_id in compiled.literal_children[literal_id]])
+        missing = {}
+        for rule_id in rule_cone:
+            missing[rule_id] = len({literal_id for literal_id in compiled.rule_antecedents[rule_id]
+                                    if not self.literal_satisfiable[literal_id]})
+        to_visit = [rule_id for rule_id, nr_missing in missing.items() if nr_missing == 0]
+        while to_visit:
+            rule_id = to_visit.pop()
+            self.rule_satisfiable[rule_id] = True
+            consequent_id = compiled.rule_consequents[rule_id]
+            if not self.literal_satisfiable[consequent_id]:
+                self.literal_satisfiable[consequent_id] = True
+                # A Rule can occur more than once among the parents (duplicate Rules share an id), count it once.
+                for parent_id in set(compiled.literal_parents[consequent_id]):
+                    if parent_id in missing:
+                        missing[parent_id] -= 1
+                        if missing[parent_id] == 0:
+                            to_visit.append(parent_id)
+
+        for literal_id in literal_cone:
+            literal_codes[literal_id] = ALL_BITS if self.literal_satisfiable[literal_id] else UNSATISFIABLE_BIT
+        for rule_id in rule_cone:
+            rule_codes[rule_id] = ALL_BITS if self.rule_satisfiable[rule_id] else UNSATISFIABLE_BIT
+
+        # Four-bool labeling within the cone: color every Literal and Rule of the cone at least once, and recolor
+        # whatever depends on a changed label, until nothing changes.
+        for literal_id in literal_cone:
+            self.color_literal(compiled, observed, contrary_observed, literal_id, literal_codes, rule_codes)
+        rules_to_reconsider = Worklist(compiled.nr_of_rules)
+        rules_to_reconsider.extend(rule_cone)
+        while rules_to_reconsider:
+            rule_id = rules_to_reconsider.pop()
+            old_rule_code = rule_codes[rule_id]
+            self.color_rule(compiled, rule_id, literal_codes, rule_codes)
+            if rule_codes[rule_id] != old_rule_code:
+                consequent_id = compiled.rule_consequents[rule_id]
+                for affected_id in (consequent_id,) + compiled.literal_contrary_of[consequent_id]:
+                    old_literal_code = literal_codes[affected_id]
+                    self.color_literal(compiled, observed, contrary_observed, affected_id, literal_codes, rule_codes)
+                    if literal_codes[affected_id] != old_literal_code:
+                        rules_to_reconsider.extend(compiled.literal_parents[affected_id])
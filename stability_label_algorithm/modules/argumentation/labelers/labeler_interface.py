@@ -1,4 +1,11 @@
+from typing import Iterable
+
+import numpy as np
+
+from ..argumentation_theory.argumentation_system import ArgumentationSystem
 from ..argumentation_theory.argumentation_theory import ArgumentationTheory
+from ..argumentation_theory.literal import Literal
+from .array_labels import ArrayLabels
 from .labels import Labels
 
 
@@ -15,3 +22,28 @@ class LabelerInterface:
         :return: Labels for the ArgumentationTheory.
         """
         pass
+
+    def label_batch(self, argumentation_system: ArgumentationSystem,
+                    knowledge_bases: Iterable[Iterable[Literal]]) -> np.ndarray:
+        """
+        Assign a StabilityLabel to each Literal for many knowledge bases on the same ArgumentationSystem at once.
+        By default, this labels each ArgumentationTheory separately; labelers that can share work over the knowledge
+        bases override this method.
+
+        :param argumentation_system: ArgumentationSystem that all knowledge bases belong to.
+        :param knowledge_bases: Knowledge bases, each one an iterable of Queryables.
+        :return: Array of shape (number of knowledge bases, number of Literals) with the StabilityLabel code (see
+            StabilityLabel.code) of each Literal, indexed on the Literal ids of argumentation_system.compiled.
+        """
+        compiled = argumentation_system.compiled
+        rows = []
+        for knowledge_base in knowledge_bases:
+            labels = self.label(ArgumentationTheory(argumentation_system, list(knowledge_base)))
+            if isinstance(labels, ArrayLabels):
+                rows.append(labels.literal_codes)
+            else:
+                rows.append(np.array([labels.literal_labeling[literal].code for literal in compiled.literals],
+                                     dtype=np.uint8))
+        if not rows:
+            return np.zeros((0, compiled.nr_of_literals), dtype=np.uint8)
+        return np.stack(rows)
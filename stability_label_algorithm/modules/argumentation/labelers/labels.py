@@ -1,4 +1,6 @@
-from typing import Dict
+from typing import Dict, Sequence
+
+from ..argumentation_theory.compiled_argumentation_system import CompiledArgumentationSystem
 from ..argumentation_theory.literal import Literal
 from ..argumentation_theory.rule import Rule
 from .stability_label import StabilityLabel
@@ -12,3 +14,17 @@ class Labels:
     def __init__(self, literal_labeling: Dict[Literal, StabilityLabel], rule_labeling: Dict[Rule, StabilityLabel]):
         self.literal_labeling = literal_labeling
         self.rule_labeling = rule_labeling
+
+    @classmethod
+    def from_ids(cls, compiled_argumentation_system: CompiledArgumentationSystem,
+                 literal_labels: Sequence[StabilityLabel], rule_labels: Sequence[StabilityLabel]) -> 'Labels':
+        """
+        Create Labels from StabilityLabels that are indexed on Literal and Rule id.
+
+        :param compiled_argumentation_system: The CompiledArgumentationSystem that assigned the ids.
+        :param literal_labels: StabilityLabel for each Literal id.
+        :param rule_labels: StabilityLabel for each Rule id.
+        :return: The corresponding Labels.
+        """
+        return cls(dict(zip(compiled_argumentation_system.literals, literal_labels)),
+                   dict(zip(compiled_argumentation_system.rules, rule_labels)))
@@ -1,14 +1,21 @@
-from typing import List, Union
+import json
+from multiprocessing.pool import Pool
+from typing import List, Tuple, Union
+
+import numpy as np
 
 from ..argumentation_theory.argumentation_theory import ArgumentationTheory
 from ..argumentation_theory.literal import Literal
 from ..argumentation_theory.queryable import Queryable
+from ..exporters.argumentation_system_json_writer import ArgumentationSystemJsonWriter
+from ..importers.argumentation_system_json_reader import ArgumentationSystemJsonReader
 from .acceptability_labeler import JustificationLabeler
+from .array_labels import ArrayLabels
 from .labeler_interface import LabelerInterface
 from .labels import Labels
-from .stability_label import StabilityLabel
+from .stability_label import ALL_BITS
 from ...dataset_generator.argumentation_theory_property_computer.argumentation_theory_property_computer import \
-    enumerate_future_argumentation_theories
+    iter_future_knowledge_bases
 
 
 class NaiveStabilityLabeler(LabelerInterface):
@@ -17,28 +24,33 @@ class NaiveStabilityLabeler(LabelerInterface):
     generates all future ArgumentationTheories and runs the JustificationLabeler's label algorithm on each of them.
     Only if the label is the same for all future ArgumentationTheories, the corresponding Literal or Rule is labelled
     stable. This algorithm is exponential.
+    The future knowledge bases are generated one by one (see iter_future_knowledge_bases), so memory use is linear. The
+    codes of the labels are combined with a bitwise or; a Literal or Rule is not tracked anymore once all four booleans
+    of its label are True, and the labeler stops as soon as this holds for all of them.
+    If workers > 1, the future knowledge bases are split into disjoint parts that are labelled by a pool of worker
+    processes, and the codes of the parts are combined afterwards.
     """
-    def __init__(self):
+    def __init__(self, workers: int = 1):
         super().__init__()
+        self.workers = workers
 
     def label(self, argumentation_theory: ArgumentationTheory) -> Labels:
-        labels = Labels(dict(), dict())
-        for literal in argumentation_theory.argumentation_system.language.values():
-            labels.literal_labeling[literal] = StabilityLabel(False, False, False, False)
-        for rule in argumentation_theory.argumentation_system.rules:
-            labels.rule_labeling[rule] = StabilityLabel(False, False, False, False)
-
-        all_possible_future_argumentation_theories = \
-            enumerate_future_argumentation_theories(argumentation_theory)
-        for possible_future_argumentation_theory in all_possible_future_argumentation_theories:
-            acc_labels = JustificationLabeler().label(possible_future_argumentation_theory)
+        argumentation_system = argumentation_theory.argumentation_system
+        compiled = argumentation_system.compiled
 
-            for literal in argumentation_theory.argumentation_system.language.values():
-                labels.literal_labeling[literal] += acc_labels.literal_labeling[literal]
-            for rule in argumentation_theory.argumentation_system.rules:
-                labels.rule_labeling[rule] += acc_labels.rule_labeling[rule]
+        if self.workers <= 1:
+            literal_codes, rule_codes = _label_future_part(argumentation_theory, 0, 1)
+        else:
+            nr_of_parts = 4 * self.workers
+            knowledge_base_ids = tuple(compiled.get_literal_ids(argumentation_theory.knowledge_base))
+            with Pool(self.workers, initializer=_init_worker,
+                      initargs=(ArgumentationSystemJsonWriter.to_json(argumentation_system),)) as pool:
+                parts = pool.map(_label_future_part_in_worker,
+                                 [(knowledge_base_ids, part, nr_of_parts) for part in range(nr_of_parts)])
+            literal_codes = np.bitwise_or.reduce([literal_codes for literal_codes, _ in parts])
+            rule_codes = np.bitwise_or.reduce([rule_codes for _, rule_codes in parts])
 
-        return labels
+        return ArrayLabels(compiled, literal_codes, rule_codes)
 
     @staticmethod
     def _is_consistent(queryable_list: List[Union[Literal, Queryable]]):
@@ -47,3 +59,55 @@ class NaiveStabilityLabeler(LabelerInterface):
                 if queryable_list[i1].is_contrary_of(queryable_list[i2]):
                     return False
         return True
+
+
+def _label_future_part(argumentation_theory: ArgumentationTheory, part: int, nr_of_parts: int) -> \
+        Tuple[np.ndarray, np.ndarray]:
+    """
+    Combine the JustificationLabeler codes of the future ArgumentationTheories in one part (see
+    iter_future_knowledge_bases) with a bitwise or.
+    """
+    argumentation_system = argumentation_theory.argumentation_system
+    compiled = argumentation_system.compiled
+    literal_codes = np.zeros(compiled.nr_of_literals, dtype=np.uint8)
+    rule_codes = np.zeros(compiled.nr_of_rules, dtype=np.uint8)
+
+    # Ids that are not saturated yet (duplicate Rules share the id in rule_ids, so the others are not tracked).
+    literal_ids = np.arange(compiled.nr_of_literals)
+    rule_ids = np.array(sorted(set(compiled.rule_ids.values())), dtype=np.int64)
+
+    for knowledge_base in iter_future_knowledge_bases(argumentation_theory, part, nr_of_parts):
+        acc_labels = JustificationLabeler().label(ArgumentationTheory(argumentation_system, knowledge_base))
+
+        literal_codes[literal_ids] |= acc_labels.literal_codes[literal_ids]
+        rule_codes[rule_ids] |= acc_labels.rule_codes[rule_ids]
+        literal_ids = literal_ids[literal_codes[literal_ids] != ALL_BITS]
+        rule_ids = rule_ids[rule_codes[rule_ids] != ALL_BITS]
+        if not len(literal_ids) and not len(rule_ids):
+            break
+
+    return literal_codes, rule_codes
+
+
+# State of a worker process of the NaiveStabilityLabeler, set once by _init_worker when the process pool starts.
+_worker_state = {}
+
+
+def _init_worker(argumentation_system_json: str) -> None:
+    """
+    Rebuild the ArgumentationSystem in a worker process from its JSON form (see ArgumentationSystemJsonWriter), which
+    can be pickled for spawned workers, unlike the linked Literals and Rules themselves.
+    """
+    argumentation_system = ArgumentationSystemJsonReader.from_json(json.loads(argumentation_system_json))
+    _worker_state['argumentation_system'] = argumentation_system
+
+
+def _label_future_part_in_worker(task: Tuple[Tuple[int, ...], int, int]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Label one part in a worker process. The knowledge base is passed as Literal ids, so that only integers (and no
+    Literal objects) are sent to the worker.
+    """
+    knowledge_base_ids, part, nr_of_parts = task
+    argumentation_system = _worker_state['argumentation_system']
+    knowledge_base = [argumentation_system.compiled.literals[literal_id] for literal_id in knowledge_base_ids]
+    return _label_future_part(ArgumentationTheory(argumentation_system, knowledge_base), part, nr_of_parts)
@@ -1,7 +1,11 @@
+from typing import Sequence, Tuple
+
+from .array_labels import ArrayLabels
 from .labels import Labels
 from .labeler_interface import LabelerInterface
-from .stability_label import StabilityLabel
+from .stability_label import UNSATISFIABLE_BIT, ALL_BITS
 from ..argumentation_theory.argumentation_theory import ArgumentationTheory
+from ..argumentation_theory.compiled_argumentation_system import CompiledArgumentationSystem
 
 
 class SatisfiabilityLabeler(LabelerInterface):
@@ -12,33 +16,36 @@ class SatisfiabilityLabeler(LabelerInterface):
     def __init__(self):
         super().__init__()
 
-    @staticmethod
-    def _preprocess_visit(rule, labels):
-        if labels.rule_labeling[rule].defended:
-            return False
-        if all([labels.literal_labeling[literal].defended for literal in rule.antecedents]):
-            labels.rule_labeling[rule] = StabilityLabel(True, True, True, True)
-            labels.literal_labeling[rule.consequent] = StabilityLabel(True, True, True, True)
-            return True
-        return False
+    def label_codes(self, compiled: CompiledArgumentationSystem, observed: Sequence[bool]) -> \
+            Tuple[bytearray, bytearray]:
+        """
+        Assign a StabilityLabel code to each Literal and Rule id of the CompiledArgumentationSystem.
+
+        The result only depends on which Queryables are excluded (i.e. have an observed contrary), so it is remembered
+        in the satisfiability_cache of the CompiledArgumentationSystem, keyed on the set of excluded Queryables.
+
+        :param compiled: CompiledArgumentationSystem that should be labelled.
+        :param observed: For each Literal id, a boolean indicating if the Literal is in the knowledge base.
+        :return: StabilityLabel codes for each Literal id and for each Rule id.
+        """
+        excluded = frozenset(contrary_of_id
+                             for literal_id, is_observed in enumerate(observed) if is_observed
+                             for contrary_of_id in compiled.literal_contrary_of[literal_id]
+                             if compiled.literal_is_observable[contrary_of_id])
+
+        codes = compiled.satisfiability_cache.get(excluded)
+        if codes is None:
+            literal_satisfiable, rule_satisfiable = compiled.forward_chain(
+                [is_observable and literal_id not in excluded
+                 for literal_id, is_observable in enumerate(compiled.literal_is_observable)])
+            codes = (bytes(ALL_BITS if satisfiable else UNSATISFIABLE_BIT for satisfiable in literal_satisfiable),
+                     bytes(ALL_BITS if satisfiable else UNSATISFIABLE_BIT for satisfiable in rule_satisfiable))
+            compiled.satisfiability_cache[excluded] = codes
+
+        # The labelers change the codes in place, so they get their own copy.
+        return bytearray(codes[0]), bytearray(codes[1])
 
     def label(self, argumentation_theory: ArgumentationTheory) -> Labels:
-        labels = Labels(dict(), dict())
-
-        for literal in argumentation_theory.argumentation_system.language.values():
-            if literal.is_observable and all([contrary not in argumentation_theory.knowledge_base
-                                              for contrary in literal.contraries]):
-                labels.literal_labeling[literal] = StabilityLabel(True, True, True, True)
-            else:
-                labels.literal_labeling[literal] = StabilityLabel(True, False, False, False)
-
-        for rule in argumentation_theory.argumentation_system.rules:
-            labels.rule_labeling[rule] = StabilityLabel(True, False, False, False)
-
-        label_added = True
-        while label_added:
-            label_added = False
-            for rule in argumentation_theory.argumentation_system.rules:
-                label_added = self._preprocess_visit(rule, labels) or label_added
-
-        return labels
+        compiled = argumentation_theory.argumentation_system.compiled
+        observed = argumentation_theory.observed
+        return ArrayLabels.from_bytearrays(compiled, *self.label_codes(compiled, observed))
@@ -1,7 +1,13 @@
+from typing import Sequence, Tuple
+
+from .array_labels import ArrayLabels
 from .labels import Labels
 from .labeler_interface import LabelerInterface
-from .stability_label import StabilityLabel
+from .stability_label import UNSATISFIABLE_BIT, DEFENDED_BIT, OUT_BIT, BLOCKED_BIT
 from ..argumentation_theory.argumentation_theory import ArgumentationTheory
+from ..argumentation_theory.compiled_argumentation_system import CompiledArgumentationSystem
+
+SATISFIABLE_CODE = DEFENDED_BIT | OUT_BIT | BLOCKED_BIT
 
 
 class SatisfiableLabeler(LabelerInterface):
@@ -13,25 +19,23 @@ class SatisfiableLabeler(LabelerInterface):
     def __init__(self):
         super().__init__()
 
-    def label(self, argumentation_theory: ArgumentationTheory) -> Labels:
-        labels = Labels(dict(), dict())
+    def label_codes(self, compiled: CompiledArgumentationSystem, observed: Sequence[bool]) -> \
+            Tuple[bytearray, bytearray]:
+        """
+        Assign a StabilityLabel code to each Literal and Rule id of the CompiledArgumentationSystem.
 
-        for literal in argumentation_theory.argumentation_system.language.values():
-            if literal in argumentation_theory.knowledge_base:
-                labels.literal_labeling[literal] = StabilityLabel(False, True, True, True)
-            else:
-                labels.literal_labeling[literal] = StabilityLabel(True, False, False, False)
-        for rule in argumentation_theory.argumentation_system.rules:
-            labels.rule_labeling[rule] = StabilityLabel(True, False, False, False)
+        :param compiled: CompiledArgumentationSystem that should be labelled.
+        :param observed: For each Literal id, a boolean indicating if the Literal is in the knowledge base.
+        :return: StabilityLabel codes for each Literal id and for each Rule id.
+        """
+        literal_satisfiable, rule_satisfiable = compiled.forward_chain(observed)
+        literal_codes = bytearray(SATISFIABLE_CODE if satisfiable else UNSATISFIABLE_BIT
+                                  for satisfiable in literal_satisfiable)
+        rule_codes = bytearray(SATISFIABLE_CODE if satisfiable else UNSATISFIABLE_BIT
+                               for satisfiable in rule_satisfiable)
+        return literal_codes, rule_codes
 
-        label_changed = True
-
-        while label_changed:
-            label_changed = False
-            for rule in argumentation_theory.argumentation_system.rules:
-                if labels.rule_labeling[rule].unsatisfiable:
-                    if all([not labels.literal_labeling[child].unsatisfiable for child in rule.antecedents]):
-                        labels.rule_labeling[rule] = StabilityLabel(False, True, True, True)
-                        labels.literal_labeling[rule.consequent] = StabilityLabel(False, True, True, True)
-                        label_changed = True
-        return labels
+    def label(self, argumentation_theory: ArgumentationTheory) -> Labels:
+        compiled = argumentation_theory.argumentation_system.compiled
+        observed = argumentation_theory.observed
+        return ArrayLabels.from_bytearrays(compiled, *self.label_codes(compiled, observed))
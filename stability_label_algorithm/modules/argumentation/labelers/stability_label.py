@@ -2,6 +2,13 @@ from distutils.util import strtobool
 
 from parse import parse
 
+# Bit of each of the four booleans in the 4-bit code of a StabilityLabel.
+UNSATISFIABLE_BIT = 1
+DEFENDED_BIT = 2
+OUT_BIT = 4
+BLOCKED_BIT = 8
+ALL_BITS = UNSATISFIABLE_BIT | DEFENDED_BIT | OUT_BIT | BLOCKED_BIT
+
 
 class StabilityLabel:
     """
@@ -68,6 +75,33 @@ class StabilityLabel:
             return False
         return True
 
+    @property
+    def code(self) -> int:
+        """
+        The StabilityLabel as a 4-bit code, with one bit for each of the four booleans.
+
+        :return: Integer code between 0 and 15.
+
+        >>> StabilityLabel(True, False, True, False).code
+        5
+        """
+        return (UNSATISFIABLE_BIT if self.unsatisfiable else 0) | (DEFENDED_BIT if self.defended else 0) | \
+            (OUT_BIT if self.out else 0) | (BLOCKED_BIT if self.blocked else 0)
+
+    @classmethod
+    def from_code(cls, code: int):
+        """
+        Read the label from its 4-bit code.
+
+        :param code: Integer code between 0 and 15, as obtained by StabilityLabel.code.
+        :return: StabilityLabel corresponding to the code.
+
+        >>> StabilityLabel.from_code(10)
+        (U:False, D:True, O:False, B:True)
+        """
+        return StabilityLabel(bool(code & UNSATISFIABLE_BIT), bool(code & DEFENDED_BIT), bool(code & OUT_BIT),
+                              bool(code & BLOCKED_BIT))
+
     @classmethod
     def from_str(cls, label_str: str):
         """
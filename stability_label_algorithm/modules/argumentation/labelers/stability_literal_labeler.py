@@ -9,23 +9,25 @@ class StabilityLiteralLabeler(LabelerInterface):
         super().__init__()
 
     def label(self, argumentation_theory: ArgumentationTheory) -> Labels:
-        labels = Labels(dict(), dict())
+        compiled = argumentation_theory.argumentation_system.compiled
+        contrary_observed = argumentation_theory.contrary_observed
 
-        for literal in argumentation_theory.argumentation_system.language.values():
-            if literal.is_observable and all([contrary not in argumentation_theory.knowledge_base
-                                              for contrary in literal.contraries]):
-                labels.literal_labeling[literal] = StabilityLabel(True, True, True, True)
+        literal_labels = []
+        for literal_id, is_observable in enumerate(compiled.literal_is_observable):
+            if is_observable and not contrary_observed[literal_id]:
+                literal_labels.append(StabilityLabel(True, True, True, True))
             else:
-                labels.literal_labeling[literal] = StabilityLabel(True, False, False, False)
+                literal_labels.append(StabilityLabel(True, False, False, False))
 
         label_changed = True
 
         while label_changed:
             label_changed = False
-            for rule in argumentation_theory.argumentation_system.rules:
-                if labels.literal_labeling[rule.consequent] != StabilityLabel(True, True, True, True):
-                    if all([labels.literal_labeling[child] == StabilityLabel(True, True, True, True)
-                            for child in rule.antecedents]):
-                        labels.literal_labeling[rule.consequent] = StabilityLabel(True, True, True, True)
+            for rule_id, antecedent_ids in enumerate(compiled.rule_antecedents):
+                consequent_id = compiled.rule_consequents[rule_id]
+                if literal_labels[consequent_id] != StabilityLabel(True, True, True, True):
+                    if all([literal_labels[antecedent_id] == StabilityLabel(True, True, True, True)
+                            for antecedent_id in antecedent_ids]):
+                        literal_labels[consequent_id] = StabilityLabel(True, True, True, True)
                         label_changed = True
-        return labels
+        return Labels.from_ids(compiled, literal_labels, [])
@@ -0,0 +1,182 @@
+from typing import Iterable, Tuple
+
+import numpy as np
+
+from .array_labels import ArrayLabels
+from .labels import Labels
+from .labeler_interface import LabelerInterface
+from .stability_label import UNSATISFIABLE_BIT as U, DEFENDED_BIT as D, OUT_BIT as O, BLOCKED_BIT as B, ALL_BITS
+from ..argumentation_theory.argumentation_system import ArgumentationSystem
+from ..argumentation_theory.argumentation_theory import ArgumentationTheory
+from ..argumentation_theory.compiled_argumentation_system import CompiledArgumentationSystem
+from ..argumentation_theory.literal import Literal
+
+
+class _Segments:
+    """
+    A one-to-many relation of a CompiledArgumentationSystem (e.g. the children of each Literal) in CSR-style, with
+    vectorised any/all reductions over the related items of each segment. The reductions work on a batch: values has
+    shape (batch, n_items) and the result has shape (batch, n_segments).
+
+    >>> segments = _Segments(np.array([0, 2, 2, 3]), np.array([0, 1, 1]))
+    >>> values = np.array([[True, True], [False, True]])
+    >>> segments.any(values).tolist(), segments.all(values).tolist()
+    ([[True, False, True], [True, False, True]], [[True, True, True], [False, True, True]])
+    """
+    def __init__(self, indptr: np.ndarray, indices: np.ndarray):
+        # One dummy item (with its own segment at the end) is appended, so that every segment start is a valid index
+        # for reduceat. For an empty segment, reduceat takes the item at its start; this is corrected with non_empty.
+        self.indices = np.append(indices, 0)
+        self.starts = indptr
+        self.non_empty = np.diff(indptr) > 0
+
+    def any(self, values: np.ndarray) -> np.ndarray:
+        if not values.shape[1]:
+            return np.zeros((values.shape[0], len(self.non_empty)), dtype=bool)
+        return np.logical_or.reduceat(values[:, self.indices], self.starts, axis=1)[:, :-1] & self.non_empty
+
+    def all(self, values: np.ndarray) -> np.ndarray:
+        if not values.shape[1]:
+            return np.ones((values.shape[0], len(self.non_empty)), dtype=bool)
+        return np.logical_and.reduceat(values[:, self.indices], self.starts, axis=1)[:, :-1] | ~self.non_empty
+
+
+class VectorizedFourBoolLabeler(LabelerInterface):
+    """
+    The VectorizedFourBoolLabeler assigns the same Labels as the FourBoolLabeler, but instead of visiting Rules one by
+    one from a worklist, it applies each labeling rule (L-U-a ... R-B-b) to all Literals and all Rules at once, as
+    NumPy operations on arrays of 4-bit codes, until a fixed point is reached. The any/all conditions over antecedents,
+    children and contraries are reductions over the CSR-style arrays of the CompiledArgumentationSystem.
+    This pays off for large ArgumentationSystems; for small ones the FourBoolLabeler is just as fast.
+    All arrays have a leading batch axis, so label_batch labels many knowledge bases in the same passes.
+    """
+
+    def __init__(self, batch_size: int = 1024):
+        """
+        :param batch_size: Maximum number of knowledge bases that label_batch labels in one pass, to bound memory.
+        """
+        super().__init__()
+        self.batch_size = batch_size
+
+    def label(self, argumentation_theory: ArgumentationTheory) -> Labels:
+        compiled = argumentation_theory.argumentation_system.compiled
+        observed = np.array([argumentation_theory.observed], dtype=bool)
+        literal_codes, rule_codes = self.label_codes(compiled, observed)
+        return ArrayLabels(compiled, literal_codes[0], rule_codes[0])
+
+    def label_batch(self, argumentation_system: ArgumentationSystem,
+                    knowledge_bases: Iterable[Iterable[Literal]]) -> np.ndarray:
+        compiled = argumentation_system.compiled
+        knowledge_bases = list(knowledge_bases)
+        chunks = [np.zeros((0, compiled.nr_of_literals), dtype=np.uint8)]
+        for start in range(0, len(knowledge_bases), self.batch_size):
+            chunk = knowledge_bases[start:start + self.batch_size]
+            observed = np.zeros((len(chunk), compiled.nr_of_literals), dtype=bool)
+            for row, knowledge_base in enumerate(chunk):
+                observed[row, compiled.get_literal_ids(knowledge_base)] = True
+            chunks.append(self.label_codes(compiled, observed)[0])
+        return np.concatenate(chunks)
+
+    @staticmethod
+    def satisfiability_codes(compiled: CompiledArgumentationSystem, observed: np.ndarray) -> \
+            Tuple[np.ndarray, np.ndarray]:
+        """
+        Vectorised version of the SatisfiabilityLabeler: Literals and Rules for which there is a potential argument get
+        code ALL_BITS, all others get code UNSATISFIABLE_BIT.
+
+        :param compiled: CompiledArgumentationSystem that should be labelled.
+        :param observed: Boolean array of shape (batch, n_literals): for each Literal id, is it in the knowledge base?
+        :return: Literal codes of shape (batch, n_literals) and Rule codes of shape (batch, n_rules).
+        """
+        antecedents = _Segments(compiled.antecedents_indptr, compiled.antecedents_indices)
+        children = _Segments(compiled.children_indptr, compiled.children_indices)
+        contraries = _Segments(compiled.contraries_indptr, compiled.contraries_indices)
+
+        literal_satisfiable = compiled.is_observable & ~contraries.any(observed)
+        while True:
+            rule_satisfiable = antecedents.all(literal_satisfiable)
+            new_literal_satisfiable = literal_satisfiable | children.any(rule_satisfiable)
+            if np.array_equal(new_literal_satisfiable, literal_satisfiable):
+                break
+            literal_satisfiable = new_literal_satisfiable
+
+        literal_codes = np.where(literal_satisfiable, ALL_BITS, U).astype(np.uint8)
+        rule_codes = np.where(rule_satisfiable, ALL_BITS, U).astype(np.uint8)
+        return literal_codes, rule_codes
+
+    def label_codes(self, compiled: CompiledArgumentationSystem, observed: np.ndarray) -> \
+            Tuple[np.ndarray, np.ndarray]:
+        """
+        Assign a StabilityLabel code to each Literal and Rule id of the CompiledArgumentationSystem.
+
+        :param compiled: CompiledArgumentationSystem that should be labelled.
+        :param observed: Boolean array of shape (batch, n_literals): for each Literal id, is it in the knowledge base?
+        :return: Literal codes of shape (batch, n_literals) and Rule codes of shape (batch, n_rules).
+        """
+        antecedents = _Segments(compiled.antecedents_indptr, compiled.antecedents_indices)
+        children = _Segments(compiled.children_indptr, compiled.children_indices)
+        contraries = _Segments(compiled.contraries_indptr, compiled.contraries_indices)
+        contrary_children = _Segments(compiled.contrary_children_indptr, compiled.contrary_children_indices)
+
+        # Static conditions, depending only on the knowledge base.
+        observable = compiled.is_observable
+        observed = observed & observable
+        contrary_observed = contraries.any(observed)
+        contraries_contrary_observed = contraries.all(contrary_observed)
+
+        literal_clear_u = observed                                                        # L-U-a
+        literal_clear_d = observable & contrary_observed                                  # L-D-a
+        literal_clear_o = observed                                                        # L-O-a
+        literal_clear_b = np.broadcast_to(observable, observed.shape)                     # L-B-a
+        literal_may_clear_o = ~observable | contraries_contrary_observed                  # L-O-b ... L-O-e
+
+        literal_codes, rule_codes = self.satisfiability_codes(compiled, observed)
+
+        # Only the knowledge bases that did not reach their fixed point yet take part in the next pass.
+        active = np.arange(observed.shape[0])
+        while len(active):
+            active_literal_codes = literal_codes[active]
+            active_rule_codes = rule_codes[active]
+
+            # Rules, based on their antecedents.
+            not_u, not_d, not_o, not_b = [(active_literal_codes & bit) == 0 for bit in (U, D, O, B)]
+            not_db = (active_literal_codes & (D | B)) == 0
+            new_rule_codes = active_rule_codes.copy()
+            new_rule_codes[antecedents.all(not_u)] &= ALL_BITS ^ U                        # R-U-a
+            new_rule_codes[antecedents.any(not_d)] &= ALL_BITS ^ D                        # R-D-a
+            new_rule_codes[antecedents.all(not_o)] &= ALL_BITS ^ O                        # R-O-a
+            new_rule_codes[antecedents.all(not_b) | antecedents.any(not_db)] &= ALL_BITS ^ B  # R-B-a, R-B-b
+
+            # Literals, based on the Rules for them and for their contraries.
+            rule_not_u = (new_rule_codes & U) == 0
+            rule_not_d = (new_rule_codes & D) == 0
+            rule_not_o = (new_rule_codes & O) == 0
+            rule_not_b = (new_rule_codes & B) == 0
+            rule_not_uo = (new_rule_codes & (U | O)) == 0
+            rule_not_db = (new_rule_codes & (D | B)) == 0
+            rule_not_uob = (new_rule_codes & (U | O | B)) == 0
+            rule_not_dob = (new_rule_codes & (D | O | B)) == 0
+
+            clear_u = literal_clear_u[active] | children.any(rule_not_u)                  # L-U-a, L-U-b
+            clear_d = literal_clear_d[active] | \
+                (~observable & (children.all(rule_not_d) | contrary_children.any(rule_not_uo)))  # L-D-b, L-D-c
+            clear_o = literal_clear_o[active] | \
+                (literal_may_clear_o[active] & (children.all(rule_not_o) | children.any(rule_not_uo))) | \
+                children.all(rule_not_dob)                                                # L-O-b ... L-O-f
+            clear_b = literal_clear_b[active] | children.all(rule_not_db) | \
+                (contrary_children.all(rule_not_db) &
+                 (children.all(rule_not_b) | children.any(rule_not_uob)))                 # L-B-b ... L-B-d
+
+            new_literal_codes = active_literal_codes.copy()
+            new_literal_codes[clear_u] &= ALL_BITS ^ U
+            new_literal_codes[clear_d] &= ALL_BITS ^ D
+            new_literal_codes[clear_o] &= ALL_BITS ^ O
+            new_literal_codes[clear_b] &= ALL_BITS ^ B
+
+            changed = (new_literal_codes != active_literal_codes).any(axis=1) | \
+                (new_rule_codes != active_rule_codes).any(axis=1)
+            literal_codes[active] = new_literal_codes
+            rule_codes[active] = new_rule_codes
+            active = active[changed]
+
+        return literal_codes, rule_codes
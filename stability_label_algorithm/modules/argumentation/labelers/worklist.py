@@ -0,0 +1,97 @@
+from collections import deque
+from typing import Callable, Iterable, MutableSequence, Tuple
+
+from ..argumentation_theory.compiled_argumentation_system import CompiledArgumentationSystem
+
+
+class Worklist:
+    """
+    First-in-first-out queue of ids in range(size), in which each id occurs at most once. Membership is kept in a
+    bitmap, so adding an id that is already queued takes constant time and does not allocate anything.
+
+    >>> worklist = Worklist(5)
+    >>> worklist.extend([3, 1, 3, 4])
+    >>> worklist.pop(), len(worklist)
+    (3, 2)
+    >>> worklist.add(3)
+    >>> [worklist.pop() for _ in range(len(worklist))]
+    [1, 4, 3]
+    """
+
+    def __init__(self, size: int):
+        self._queue = deque()
+        self._is_queued = bytearray(size)
+
+    def add(self, item_id: int) -> None:
+        if not self._is_queued[item_id]:
+            self._is_queued[item_id] = True
+            self._queue.append(item_id)
+
+    def extend(self, item_ids: Iterable[int]) -> None:
+        for item_id in item_ids:
+            self.add(item_id)
+
+    def pop(self) -> int:
+        item_id = self._queue.popleft()
+        self._is_queued[item_id] = False
+        return item_id
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+
+def propagate(compiled: CompiledArgumentationSystem,
+              color_literal: Callable[[int], None], color_rule: Callable[[int], None],
+              literal_codes: MutableSequence[int], rule_codes: MutableSequence[int]) -> Tuple[int, int]:
+    """
+    Propagation loop shared by the FourBoolLabeler, JustificationLabeler, FQASLabeler and TimedFourBoolLabeler. Starting
+    from the initial codes, first color the leaves (Literals for which there is no Rule) and the observables, and then
+    recolor Rules and (contraries of) their conclusions until no label changes anymore.
+
+    :param compiled: CompiledArgumentationSystem that is labelled.
+    :param color_literal: Function that recolors the Literal with the given id, changing literal_codes in place.
+    :param color_rule: Function that recolors the Rule with the given id, changing rule_codes in place.
+    :param literal_codes: Codes for each Literal id, as changed by color_literal.
+    :param rule_codes: Codes for each Rule id, as changed by color_rule.
+    :return: Number of calls to color_literal and to color_rule.
+    """
+    relabel_literal_calls = 0
+    relabel_rule_calls = 0
+    rules_visited = bytearray(compiled.nr_of_rules)
+    rules_to_reconsider = Worklist(compiled.nr_of_rules)
+
+    # Start by coloring leaves (literals for which there is no rule) and observables (O(|L|))
+    for literal_id, children in enumerate(compiled.literal_children):  # Max |L| iterations
+        if not children or compiled.literal_is_observable[literal_id]:
+            # Max |L||R_l/-l| executions in total = c*|R|
+            color_literal(literal_id)
+            relabel_literal_calls += 1
+            rules_to_reconsider.extend(compiled.literal_parents[literal_id])
+
+    # Color rules and (contraries of) their conclusions
+    while rules_to_reconsider:
+        # Each rule r is considered (i.e. added to rules_to_reconsider) at most 4*|ants(r)| times.
+        rule_id = rules_to_reconsider.pop()
+
+        # Store old label so we can check if the label changed.
+        old_rule_code = rule_codes[rule_id]
+
+        # This takes c*|ants(r)| steps for each consideration of r. So in total O(|R|^2|L|) steps.
+        color_rule(rule_id)
+        relabel_rule_calls += 1
+
+        # If this was the first time the rule was considered or if its label changed, it may influence others.
+        if not rules_visited[rule_id] or rule_codes[rule_id] != old_rule_code:
+            # Considering a literal l takes c*|R| steps. It only happens after initially considering or changing the
+            # label of a rule for l/-l, so at most 4*|R_l/-l| times. So in total considering all literals all times
+            # takes O(|R|^2) steps.
+            consequent_id = compiled.rule_consequents[rule_id]
+            for literal_id in (consequent_id,) + compiled.literal_contraries[consequent_id]:
+                old_literal_code = literal_codes[literal_id]
+                color_literal(literal_id)
+                relabel_literal_calls += 1
+                if literal_codes[literal_id] != old_literal_code:
+                    rules_to_reconsider.extend(compiled.literal_parents[literal_id])
+            rules_visited[rule_id] = True
+
+    return relabel_literal_calls, relabel_rule_calls
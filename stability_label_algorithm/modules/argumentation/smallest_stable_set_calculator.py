@@ -1,11 +1,21 @@
+import bisect
 import itertools
-from typing import List, Tuple, Callable, TypeVar
+import json
+from multiprocessing.pool import Pool
+from typing import Dict, Iterable, Iterator, List, Tuple, Callable, TypeVar, Optional
+
+import numpy as np
+
 from .argumentation_theory.queryable import Queryable
 from .argumentation_theory.literal import Literal
 from .argumentation_theory.argumentation_system import ArgumentationSystem
-from .argumentation_theory.argumentation_theory import ArgumentationTheory
-from .labelers.stability_label import StabilityLabel
+from .argumentation_theory.argumentation_system_slicer import slice_for_topics
+from .exporters.argumentation_system_json_writer import ArgumentationSystemJsonWriter
+from .importers.argumentation_system_json_reader import ArgumentationSystemJsonReader
+from .labelers.stability_label import StabilityLabel, DEFENDED_BIT, ALL_BITS
 from .labelers.labeler_interface import LabelerInterface
+from .labelers.four_bool_labeler import FourBoolLabeler
+from .labelers.incremental_four_bool_labeler import IncrementalFourBoolLabeler
 
 
 T = TypeVar('T')
@@ -129,85 +139,341 @@ def apriori_gen(item_sets: List[Tuple[T, ...]]) -> List[Tuple[T, ...]]:
     return prune_step(item_sets, possible_extensions)
 
 
-def join_and_prune_step(argumentation_system: ArgumentationSystem,
-                        topics: List[Literal],
-                        stability_labeler: LabelerInterface,
-                        stability_function: Callable[[StabilityLabel], bool],
-                        obs_set_k: Tuple[Queryable, ...], verbose=True) -> \
-        Tuple[List[List[Queryable]], List[Tuple[Queryable]]]:
-    smallest_stable_sets_k = []
-    observable_set_k_unstable = []
-
-    if all([not o1.is_contrary_of(o2) for (o1, o2) in itertools.combinations(obs_set_k, 2)]):
-        # obs_set_k is consistent
-        argumentation_theory = ArgumentationTheory(argumentation_system, list(obs_set_k))
-        labels = stability_labeler.label(argumentation_theory)
-        if all([stability_function(labels.literal_labeling[topic]) for topic in topics]):
-            smallest_stable_sets_k.append(list(obs_set_k))
+def item_set_to_bitmask(item_set: Iterable[T], items: List[T]) -> int:
+    """
+    Represent an item set as an integer bitmask. Item i of the SORTED list of all items gets bit len(items) - 1 - i, so
+    that sorting item sets of the same length on decreasing bitmask is the same as sorting the sorted tuples.
+
+    :param item_set: Items to represent.
+    :param items: Sorted list of all items.
+    :return: Bitmask of the item set.
+
+    >>> item_set_to_bitmask(('a', 'c'), ['a', 'b', 'c', 'd'])
+    10
+    """
+    return sum([1 << (len(items) - 1 - bisect.bisect_left(items, item)) for item in item_set])
+
+
+def bitmask_to_item_set(bitmask: int, items: List[T]) -> Tuple[T, ...]:
+    """
+    Inverse of item_set_to_bitmask.
+
+    :param bitmask: Bitmask of an item set.
+    :param items: Sorted list of all items.
+    :return: Sorted tuple of the items in the item set.
+
+    >>> bitmask_to_item_set(10, ['a', 'b', 'c', 'd'])
+    ('a', 'c')
+    """
+    item_set = []
+    while bitmask:
+        highest_bit = bitmask.bit_length() - 1
+        item_set.append(items[len(items) - 1 - highest_bit])
+        bitmask ^= 1 << highest_bit
+    return tuple(item_set)
+
+
+def contrary_bitmasks(queryables: List[Queryable]) -> Dict[int, int]:
+    """
+    For the bit of each Queryable in a SORTED list (see item_set_to_bitmask), the bitmask of the Queryables after it in
+    the list that it is a contrary of. An observation set, taken in sorted order as in queryable_set_is_consistent, is
+    inconsistent if and only if the bitmask of one of its Queryables overlaps with the bitmask of the set.
+
+    :param queryables: Sorted list of all Queryables.
+    :return: Bitmask for the bit of each Queryable.
+    """
+    return {1 << (len(queryables) - 1 - index):
+            item_set_to_bitmask([other for other in queryables[index + 1:] if queryable.is_contrary_of(other)],
+                                queryables)
+            for index, queryable in enumerate(queryables)}
+
+
+def apriori_gen_bitmasks(item_sets: Iterable[int], conflicts: Optional[Dict[int, int]] = None) -> List[int]:
+    """
+    Version of apriori_gen on item sets that are represented as bitmasks (see item_set_to_bitmask). The last item of an
+    item set is its lowest bit and its first k - 1 items are the remaining bits. The join step groups the item sets on
+    these remaining bits and the prune step looks up subsets in a set of bitmasks, so no tuples are built.
+
+    If conflicts are given, two item sets are not joined if their last items conflict. If the item sets do not contain
+    conflicting items, then neither do the candidates, since every other pair of items in a candidate is also in one of
+    its subsets (or, for k = 1, in one of the joined item sets).
+
+    :param item_sets: Bitmasks of item sets of length k, in any order.
+    :param conflicts: For the bit of each item, the bitmask of the items after it that it may not be combined with
+        (such as the result of contrary_bitmasks).
+    :return: Bitmasks of candidate item sets of length k + 1, sorted on decreasing bitmask (which is the same order
+        as the result of apriori_gen).
+
+    >>> # This is the example from join_step, with items 1, ..., 5
+    >>> example_item_sets = [(1, 2, 3), (1, 2, 4), (1, 3, 4), (1, 3, 5), (2, 3, 4)]
+    >>> candidates = apriori_gen_bitmasks([item_set_to_bitmask(s, [1, 2, 3, 4, 5]) for s in example_item_sets])
+    >>> [bitmask_to_item_set(candidate, [1, 2, 3, 4, 5]) for candidate in candidates]
+    [(1, 2, 3, 4)]
+    >>> # Items 1 and 2 conflict
+    >>> candidates = apriori_gen_bitmasks([0b100, 0b010, 0b001], {0b100: 0b010, 0b010: 0, 0b001: 0})
+    >>> [bitmask_to_item_set(candidate, [1, 2, 3]) for candidate in candidates]
+    [(1, 3), (2, 3)]
+    """
+    item_sets = set(item_sets)
+
+    # Join step: group item sets on their first k - 1 items and combine each pair of last items in a group.
+    last_items_per_prefix = {}
+    for item_set in item_sets:
+        last_item = item_set & -item_set
+        last_items_per_prefix.setdefault(item_set ^ last_item, []).append(last_item)
+
+    result = []
+    for prefix, last_items in last_items_per_prefix.items():
+        for last_item_1, last_item_2 in itertools.combinations(last_items, 2):
+            if conflicts is not None and conflicts[max(last_item_1, last_item_2)] & min(last_item_1, last_item_2):
+                continue
+            candidate = prefix | last_item_1 | last_item_2
+
+            # Prune step: the subsets without last_item_1 or last_item_2 are in item_sets by construction, so check
+            # the subsets without one of the items of the prefix.
+            remaining = prefix
+            while remaining:
+                item = remaining & -remaining
+                if candidate ^ item not in item_sets:
+                    break
+                remaining ^= item
+            else:
+                result.append(candidate)
+
+    result.sort(reverse=True)
+    return result
+
+
+def _stable_codes(stability_function: Callable[[StabilityLabel], bool]) -> np.ndarray:
+    """
+    Evaluate the stability function once for each of the 16 StabilityLabel codes.
+
+    :param stability_function: Function that checks if a given label is stable
+    :return: Boolean array, indexed on StabilityLabel code, indicating if the corresponding label is stable
+
+    >>> _stable_codes(lambda x: x.is_stable).nonzero()[0].tolist()
+    [1, 2, 4, 8]
+    """
+    return np.array([stability_function(StabilityLabel.from_code(code)) for code in range(ALL_BITS + 1)], dtype=bool)
+
+
+# State of a worker process of smallest_stable_sets, set once by _init_worker when the process pool starts.
+_worker_state = {}
+
+
+def _batch_labeler(stability_labeler: LabelerInterface) -> LabelerInterface:
+    """
+    The labeler that labels the candidate sets. Consecutive candidate sets mostly differ in one or two observations, so
+    FourBoolLabeler labels are computed by relabelling the difference with the previous candidate set.
+    """
+    if isinstance(stability_labeler, FourBoolLabeler):
+        return IncrementalFourBoolLabeler()
+    return stability_labeler
+
+
+def _init_worker(argumentation_system_json: str, topic_ids: List[int], stability_labeler: LabelerInterface) -> None:
+    """
+    Set up a worker process. The ArgumentationSystem is sent as JSON (see ArgumentationSystemJsonWriter): its linked
+    Literals and Rules nest too deeply to be pickled, which is needed when the worker processes are spawned instead of
+    forked. Its compiled form is rebuilt once in the worker, on first use.
+    """
+    argumentation_system = ArgumentationSystemJsonReader.from_json(json.loads(argumentation_system_json))
+    _worker_state['argumentation_system'] = argumentation_system
+    _worker_state['topic_ids'] = topic_ids
+    _worker_state['stability_labeler'] = _batch_labeler(stability_labeler)
+
+
+def _label_topics(obs_id_sets: List[Tuple[int, ...]]) -> np.ndarray:
+    """
+    Label the topics for a chunk of observation sets in a worker process. Observation sets are passed as Literal ids, so
+    that only integers (and no Literal objects) are sent to the worker.
+    """
+    argumentation_system = _worker_state['argumentation_system']
+    compiled = argumentation_system.compiled
+    obs_sets = [[compiled.literals[literal_id] for literal_id in obs_id_set] for obs_id_set in obs_id_sets]
+    return _worker_state['stability_labeler'].label_batch(argumentation_system, obs_sets)[:, _worker_state['topic_ids']]
+
+
+def _split_stable_unstable(argumentation_system: ArgumentationSystem,
+                           topics: List[Literal],
+                           stability_labeler: LabelerInterface,
+                           stable_codes: np.ndarray,
+                           observables: List[Queryable],
+                           obs_bitmasks: List[int],
+                           verbose: bool,
+                           pool: Optional[Pool] = None,
+                           nr_of_chunks: int = 1) -> Tuple[List[List[Queryable]], List[int]]:
+    """
+    Label all (consistent) observation sets, given as bitmasks over the sorted observables (see item_set_to_bitmask),
+    in one batch and split them into those for which each topic is stable and those for which some topic is not (given
+    by their index in obs_bitmasks). If a process pool is given, the observation sets are split into chunks that are
+    labelled by the workers; the results are merged in the original order.
+    The topic codes of each observation set are remembered in the topic_codes_cache of the compiled ArgumentationSystem,
+    so that observation sets that were labelled before (for example in an earlier search) are not labelled again. They
+    are stored under the bitmask of the observation set over Literal ids (as in ArgumentationTheory), which does not
+    depend on the list of observables.
+    """
+    compiled = argumentation_system.compiled
+    topic_ids = tuple(compiled.get_literal_ids(topics))
+    literal_bits = [1 << literal_id for literal_id in compiled.get_literal_ids(observables)]
+
+    def knowledge_base_bitmask(obs_bitmask: int) -> int:
+        result = 0
+        while obs_bitmask:
+            lowest_bit = obs_bitmask & -obs_bitmask
+            result |= literal_bits[len(observables) - lowest_bit.bit_length()]
+            obs_bitmask ^= lowest_bit
+        return result
+
+    cache_keys = [(type(stability_labeler), topic_ids, knowledge_base_bitmask(obs_bitmask))
+                  for obs_bitmask in obs_bitmasks]
+    topic_codes = [compiled.topic_codes_cache.get(cache_key) for cache_key in cache_keys]
+
+    to_label = [index for index, obs_set_topic_codes in enumerate(topic_codes) if obs_set_topic_codes is None]
+    if to_label:
+        obs_sets = [bitmask_to_item_set(obs_bitmasks[index], observables) for index in to_label]
+        if pool is None or len(obs_sets) < 2:
+            new_topic_codes = _batch_labeler(stability_labeler).label_batch(argumentation_system, obs_sets)[
+                :, list(topic_ids)]
+        else:
+            obs_id_sets = [tuple(compiled.get_literal_ids(obs_set)) for obs_set in obs_sets]
+            chunk_size = -(-len(obs_id_sets) // nr_of_chunks)
+            chunks = [obs_id_sets[start:start + chunk_size] for start in range(0, len(obs_id_sets), chunk_size)]
+            new_topic_codes = np.concatenate(pool.map(_label_topics, chunks))
+        for index, obs_set_topic_codes in zip(to_label, new_topic_codes):
+            topic_codes[index] = obs_set_topic_codes.tobytes()
+            compiled.topic_codes_cache[cache_keys[index]] = topic_codes[index]
+
+    stable_obs_sets, unstable_indices = [], []
+    for index, obs_set_topic_codes in enumerate(topic_codes):
+        if all([stable_codes[topic_code] for topic_code in obs_set_topic_codes]):
+            obs_set = list(bitmask_to_item_set(obs_bitmasks[index], observables))
+            stable_obs_sets.append(obs_set)
             if verbose:
-                print([str(o) for o in obs_set_k])
-                for literal_str, literal in argumentation_system.language.items():
-                    if literal in topics and labels.literal_labeling[literal].defended:
-                        print(literal_str)
+                print([str(o) for o in obs_set])
+                for topic, topic_code in zip(topics, obs_set_topic_codes):
+                    if topic_code & DEFENDED_BIT:
+                        print(str(topic))
         else:
-            observable_set_k_unstable.append(obs_set_k)
-
-    return smallest_stable_sets_k, observable_set_k_unstable
+            unstable_indices.append(index)
+    return stable_obs_sets, unstable_indices
 
 
 def smallest_stable_sets(argumentation_system: ArgumentationSystem,
                          topics: List[Literal],
                          stability_labeler: LabelerInterface,
                          stability_function: Callable[[StabilityLabel], bool] = lambda x: x.is_contested_stable,
-                         verbose: bool = False) -> List[List[Queryable]]:
+                         verbose: bool = False,
+                         workers: int = 1,
+                         prune_irrelevant: bool = False) -> List[List[Queryable]]:
     """
-    Finds all smallest sets of observations for which each topic is stable.
+    Finds all smallest sets of observations for which each topic is stable. All candidate sets of the same size are
+    labelled in one call to stability_labeler.label_batch, or, if workers > 1, in chunks by a pool of worker processes.
 
     :param argumentation_system: Argumentation theory for which we compute the smallest stable sets
     :param topics: Topics that need to be stable in order to form a smallest_stable_set
     :param stability_labeler: Stability labelling object (e.g. FourBoolStabilityLabeler)
     :param stability_function: Function that checks if a given label is stable
     :param verbose: Boolean indicating if intermediate results should be printed to the console
+    :param workers: Number of worker processes that label the candidate sets. The ArgumentationSystem is sent to each
+        worker once, when the pool starts. The result does not depend on the number of workers.
+    :param prune_irrelevant: If True, the search runs on the slice of the ArgumentationSystem for the topics (see
+        slice_for_topics) and only Queryables in the dependency cone of the topics (see
+        CompiledArgumentationSystem.dependency_cone) are observed. This does not change the result for labelers in which
+        the label of a Literal only depends on its Rules, its contraries and observations (such as the
+        FourBoolLabeler), since an observation outside the cone cannot make a set stable, so that a set containing it
+        is never smallest. This is not guaranteed for every labeler, which is why it is off by default.
     :return: All smallest sets of observations for which each topic is stable
     """
+    return list(iter_smallest_stable_sets(argumentation_system, topics, stability_labeler, stability_function, verbose,
+                                          workers, prune_irrelevant=prune_irrelevant))
+
+
+def iter_smallest_stable_sets(argumentation_system: ArgumentationSystem,
+                              topics: List[Literal],
+                              stability_labeler: LabelerInterface,
+                              stability_function: Callable[[StabilityLabel], bool] = lambda x: x.is_contested_stable,
+                              verbose: bool = False,
+                              workers: int = 1,
+                              max_size: Optional[int] = None,
+                              limit: Optional[int] = None,
+                              prune_irrelevant: bool = False) -> Iterator[List[Queryable]]:
+    """
+    Generator version of smallest_stable_sets: yields the smallest stable sets of each size as soon as all candidate
+    sets of that size are labelled, so that the search can be stopped early.
 
-    # First check edge case: are all topics table in case we have no observations at all?
-    initial_labels = stability_labeler.label(ArgumentationTheory(argumentation_system, []))
-    if all([stability_function(initial_labels.literal_labeling[topic]) for topic in topics]):
-        return [[]]
-
-    # We will iteratively fill the smallest_stable_sets list
-    smallest_stable_set_list: List[List[Queryable]] = []
-
-    # Generate all unstable observable sets of size 1 (int representation). NB: (obs,) is a 1-tuple in Python.
-    observables = sorted([q for q in argumentation_system.queryables])
-    observable_sets_k_min_1_candidates = [(obs,) for obs in observables]
-    observable_sets_k_min_1_unstable = []
-    for obs_set in observable_sets_k_min_1_candidates:
-        argumentation_theory = ArgumentationTheory(argumentation_system, list(obs_set))
-        labels = stability_labeler.label(argumentation_theory)
-        if all([stability_function(labels.literal_labeling[topic]) for topic in topics]):
-            smallest_stable_set_list.append(list(obs_set))
-            if verbose:
-                print([str(o) for o in obs_set])
-                for literal_str, literal in argumentation_system.language.items():
-                    if literal in topics and labels.literal_labeling[literal].defended:
-                        print(literal_str)
-        else:
-            observable_sets_k_min_1_unstable.append(obs_set)
-
-    # Given all unstable observable sets of size (k - 1), generate all unstable observable sets of size k.
-    while observable_sets_k_min_1_unstable:
-        observable_sets_k_candidates = apriori_gen(observable_sets_k_min_1_unstable)
-        observable_sets_k_unstable = []
-
-        res = [join_and_prune_step(argumentation_system, topics, stability_labeler, stability_function, c, verbose)
-               for c in observable_sets_k_candidates]
-
-        for stable, unstable in res:
-            smallest_stable_set_list = smallest_stable_set_list + stable
-            observable_sets_k_unstable = observable_sets_k_unstable + unstable
-
-        observable_sets_k_min_1_unstable = observable_sets_k_unstable
+    :param argumentation_system: Argumentation theory for which we compute the smallest stable sets
+    :param topics: Topics that need to be stable in order to form a smallest_stable_set
+    :param stability_labeler: Stability labelling object (e.g. FourBoolStabilityLabeler)
+    :param stability_function: Function that checks if a given label is stable
+    :param verbose: Boolean indicating if intermediate results should be printed to the console
+    :param workers: Number of worker processes that label the candidate sets (see smallest_stable_sets)
+    :param max_size: If given, only smallest stable sets of at most this many observations are searched for
+    :param limit: If given, stop after this many smallest stable sets
+    :param prune_irrelevant: If True, the search runs on the slice for the topics and only Queryables in their
+        dependency cone are observed (see smallest_stable_sets)
+    :return: Iterator over the smallest sets of observations for which each topic is stable, in the same order as the
+        result of smallest_stable_sets
+    """
+    observables = sorted(argumentation_system.queryables)
+    if prune_irrelevant:
+        compiled = argumentation_system.compiled
+        cone = compiled.dependency_cone(compiled.get_literal_ids(topics))
+        observables = [queryable for queryable in observables if compiled.literal_ids[queryable] in cone]
+        # The Queryables of the slice are equal to the original ones, so the observables can be labelled on the slice.
+        argumentation_system = slice_for_topics(argumentation_system, topics)
+
+    stable_codes = _stable_codes(stability_function)
+
+    if workers <= 1:
+        yield from itertools.islice(_iter_smallest_stable_sets(
+            argumentation_system, topics, stability_labeler, stable_codes, observables, verbose, max_size), limit)
+        return
+
+    compiled = argumentation_system.compiled
+    with Pool(workers, initializer=_init_worker,
+              initargs=(ArgumentationSystemJsonWriter.to_json(argumentation_system), compiled.get_literal_ids(topics),
+                        stability_labeler)) as pool:
+        yield from itertools.islice(_iter_smallest_stable_sets(
+            argumentation_system, topics, stability_labeler, stable_codes, observables, verbose, max_size, pool,
+            4 * workers), limit)
+
+
+def _iter_smallest_stable_sets(argumentation_system: ArgumentationSystem,
+                               topics: List[Literal],
+                               stability_labeler: LabelerInterface,
+                               stable_codes: np.ndarray,
+                               observables: List[Queryable],
+                               verbose: bool,
+                               max_size: Optional[int],
+                               pool: Optional[Pool] = None,
+                               nr_of_chunks: int = 1) -> Iterator[List[Queryable]]:
+    # Observation sets are handled as bitmasks (see item_set_to_bitmask) and only turned into tuples for labelling.
+    nr_of_observables = len(observables)
 
-    return smallest_stable_set_list
+    # First check edge case: are all topics table in case we have no observations at all?
+    initial_stable, _ = _split_stable_unstable(argumentation_system, topics, stability_labeler, stable_codes,
+                                               observables, [0], False)
+    if initial_stable:
+        yield []
+        return
+
+    observable_conflicts = contrary_bitmasks(observables)
+
+    # Start with all observable sets of size 1.
+    candidate_bitmasks = [1 << (nr_of_observables - 1 - index) for index in range(nr_of_observables)]
+    size = 1
+
+    while candidate_bitmasks and (max_size is None or size <= max_size):
+        smallest_stable_sets_k, unstable_indices = _split_stable_unstable(
+            argumentation_system, topics, stability_labeler, stable_codes, observables, candidate_bitmasks, verbose,
+            pool, nr_of_chunks)
+        yield from smallest_stable_sets_k
+
+        # Given all unstable observable sets of size k, generate the candidate sets of size k + 1. Contraries are never
+        # joined, so all candidates are consistent.
+        if max_size is not None and size == max_size:
+            break
+        observable_sets_k_unstable = [candidate_bitmasks[index] for index in unstable_indices]
+        candidate_bitmasks = apriori_gen_bitmasks(observable_sets_k_unstable, observable_conflicts)
+        size += 1
@@ -1,12 +1,20 @@
-from typing import List
+import re
+from typing import Dict, List, Optional
 
 from stability_label_algorithm.modules.argumentation.argumentation_theory.argumentation_system import ArgumentationSystem
 from stability_label_algorithm.modules.argumentation.argumentation_theory.literal import Literal
 from stability_label_algorithm.modules.argumentation.argumentation_theory.queryable import Queryable
 from stability_label_algorithm.modules.argumentation.labelers.stability_label import StabilityLabel
-from stability_label_algorithm.modules.dataset_generator.dataset_item import DatasetItem
+from stability_label_algorithm.modules.dataset_generator.dataset_item import DatasetItem, knowledge_str_to_list
 from stability_label_algorithm.modules.dataset_generator.utils import get_argumentation_system_from_name
 
+ANNOTATED_DATASET_ITEM_PATTERN = re.compile(
+    r'(?:AS=)?(?P<argumentation_system_name>[^,]*),(?:K=)?(?P<knowledge>[^,]*),(?:t=)?(?P<topic>[^,]*),'
+    r'(?:acc=)?(?P<acceptability_label>\([^)]*\)),(?:stab=)?(?P<stability_label>\([^)]*\))')
+
+# Codes of the StabilityLabel strings that were read before; there are only 16 different StabilityLabels.
+_stability_label_codes: Dict[str, int] = {}
+
 
 class AnnotatedDatasetItem(DatasetItem):
     """
@@ -39,13 +47,31 @@ class AnnotatedDatasetItem(DatasetItem):
         return f'AS={as_name},K={knowledge_str},t={str(self.topic_literal)},acc={acc_str},stab={stab_str}'
 
     @classmethod
-    def from_str(cls, dataset_item_str: str):
-        argumentation_system_name, knowledge_str, topic_literal_str, acc_str, stab_str = dataset_item_str.split(',', 5)
-        argumentation_system = get_argumentation_system_from_name(argumentation_system_name)
-        knowledge_base = [argumentation_system.language[k] for k in knowledge_str.split('+')]
-        topic_literal = argumentation_system.language[topic_literal_str]
-        acc_label = StabilityLabel.from_str(acc_str)
-        stab_label = StabilityLabel.from_str(stab_str)
+    def from_str(cls, dataset_item_str: str, argumentation_system: Optional[ArgumentationSystem] = None):
+        """
+        Read the AnnotatedDatasetItem from a string.
+
+        :param dataset_item_str: String representation of the AnnotatedDatasetItem.
+        :param argumentation_system: Optional, the ArgumentationSystem of the AnnotatedDatasetItem. Otherwise it is
+            obtained with get_argumentation_system_from_name.
+        :return: AnnotatedDatasetItem represented by the input string.
+        """
+        match = ANNOTATED_DATASET_ITEM_PATTERN.fullmatch(dataset_item_str)
+        argumentation_system_name = match.group('argumentation_system_name')
+        if argumentation_system is None:
+            argumentation_system = get_argumentation_system_from_name(argumentation_system_name)
+        knowledge_base = [argumentation_system.language[k] for k in knowledge_str_to_list(match.group('knowledge'))]
+        topic_literal = argumentation_system.language[match.group('topic')]
+        acc_label = _stability_label_from_str(match.group('acceptability_label'))
+        stab_label = _stability_label_from_str(match.group('stability_label'))
         # noinspection PyTypeChecker
         return cls(argumentation_system, argumentation_system_name, knowledge_base, topic_literal,
                    acc_label, stab_label)
+
+
+def _stability_label_from_str(label_str: str) -> StabilityLabel:
+    code = _stability_label_codes.get(label_str)
+    if code is None:
+        code = StabilityLabel.from_str(label_str).code
+        _stability_label_codes[label_str] = code
+    return StabilityLabel.from_code(code)
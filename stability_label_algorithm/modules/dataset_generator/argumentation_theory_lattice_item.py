@@ -1,17 +1,22 @@
+from typing import Optional
+
 from stability_label_algorithm.modules.argumentation.argumentation_theory.argumentation_theory import ArgumentationTheory
 from stability_label_algorithm.modules.argumentation.labelers.labels import Labels
 
 
 class ArgumentationTheoryLatticeItem:
-    def __init__(self, argumentation_theory: ArgumentationTheory, acceptability_labels: Labels):
+    def __init__(self, argumentation_theory: ArgumentationTheory, acceptability_labels: Labels,
+                 stability_labels: Optional[Labels] = None):
         self.argumentation_theory = argumentation_theory
         self.acceptability_labels = acceptability_labels
 
         self.direct_future_theories = []
         self.direct_previous_theories = []
-        self.stability_labels = \
-            Labels({literal: acceptability_labels.literal_labeling[literal].__copy__()
-                    for literal in acceptability_labels.literal_labeling.keys()}, {})
+        if stability_labels is None:
+            stability_labels = \
+                Labels({literal: acceptability_labels.literal_labeling[literal].__copy__()
+                        for literal in acceptability_labels.literal_labeling.keys()}, {})
+        self.stability_labels = stability_labels
 
     def connect(self, other: 'ArgumentationTheoryLatticeItem'):
         if abs(len(self.argumentation_theory.knowledge_base) - len(other.argumentation_theory.knowledge_base)) == 1:
@@ -19,8 +24,8 @@ class ArgumentationTheoryLatticeItem:
                 longest, shortest = self, other
             else:
                 longest, shortest = other, self
-            if all([q in longest.argumentation_theory.knowledge_base
-                    for q in shortest.argumentation_theory.knowledge_base]):
+            if shortest.argumentation_theory.knowledge_base_bitmask & \
+                    ~longest.argumentation_theory.knowledge_base_bitmask == 0:
                 shortest._add_direct_future_theory(longest)
 
     def _add_direct_future_theory(self, direct_future_theory: 'ArgumentationTheoryLatticeItem'):
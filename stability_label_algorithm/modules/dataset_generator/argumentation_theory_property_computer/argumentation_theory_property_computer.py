@@ -1,7 +1,9 @@
-from typing import List
+from typing import Iterator, List
 
 from ...argumentation.argumentation_theory.argumentation_theory import ArgumentationTheory
-from ...argumentation.smallest_stable_set_calculator import apriori_gen
+from ...argumentation.argumentation_theory.queryable import Queryable
+from ...argumentation.smallest_stable_set_calculator import apriori_gen_bitmasks, bitmask_to_item_set, \
+    contrary_bitmasks, item_set_to_bitmask
 from .argumentation_framework import ArgumentationFramework
 from .argumentation_theory_properties import ArgumentationTheoryProperties
 from .incomplete_argumentation_framework import IncompleteArgumentationFramework
@@ -41,21 +43,101 @@ def enumerate_future_argumentation_theories(argumentation_theory: ArgumentationT
     original_knowledge_base = argumentation_theory.knowledge_base
     future_argumentation_theories = [argumentation_theory]
     candidates = sorted(argumentation_theory.future_knowledge_base_candidates)
-    k_min_1_candidates = [(obs,) for obs in candidates]
 
-    for obs_set in k_min_1_candidates:
-        future_argumentation_theory = ArgumentationTheory(argumentation_system, original_knowledge_base + list(obs_set))
+    for obs in candidates:
+        future_argumentation_theory = ArgumentationTheory(argumentation_system, original_knowledge_base + [obs])
         future_argumentation_theories.append(future_argumentation_theory)
 
+    # Sets of candidates are handled as bitmasks (see item_set_to_bitmask). A new knowledge base is consistent (in the
+    # sense of queryable_set_is_consistent) if and only if the original knowledge base is, none of the added candidates
+    # is a contrary of the original knowledge base and the added candidates are consistent. So only those candidates
+    # are combined, and apriori_gen_bitmasks never joins contraries, which makes all joined candidate sets consistent.
+    original_is_consistent = \
+        stability_label_algorithm.modules.test_consistency_queryable_set.queryable_set_is_consistent(
+            original_knowledge_base)
+    contraries_of_original = {contrary for queryable in argumentation_theory.knowledge_base_set
+                              for contrary in queryable.contraries}
+    candidate_conflicts = contrary_bitmasks(candidates)
+    k_min_1_candidates = []
+    if original_is_consistent:
+        k_min_1_candidates = [item_set_to_bitmask([obs], candidates) for obs in candidates
+                              if obs not in contraries_of_original]
+
     while k_min_1_candidates:
-        observable_sets_k_candidates = apriori_gen(k_min_1_candidates)
-        k_min_1_candidates = []
-        for observable_sets_k_candidate in observable_sets_k_candidates:
-            new_knowledge_base = original_knowledge_base + list(observable_sets_k_candidate)
-            if stability_label_algorithm.modules.test_consistency_queryable_set.queryable_set_is_consistent(
-                    new_knowledge_base):
-                future_argumentation_theories.append(ArgumentationTheory(argumentation_system, new_knowledge_base))
-                if verbose:
-                    print(str(new_knowledge_base))
-                k_min_1_candidates.append(observable_sets_k_candidate)
+        k_min_1_candidates = apriori_gen_bitmasks(k_min_1_candidates, candidate_conflicts)
+        for observable_sets_k_candidate in k_min_1_candidates:
+            new_knowledge_base = original_knowledge_base + \
+                list(bitmask_to_item_set(observable_sets_k_candidate, candidates))
+            future_argumentation_theories.append(ArgumentationTheory(argumentation_system, new_knowledge_base))
+            if verbose:
+                print(str(new_knowledge_base))
     return future_argumentation_theories
+
+
+def iter_future_knowledge_bases(argumentation_theory: ArgumentationTheory, part: int = 0, nr_of_parts: int = 1) -> \
+        Iterator[List[Queryable]]:
+    """
+    Generate the knowledge bases of all future ArgumentationTheories of this ArgumentationTheory: the same knowledge
+    bases as those of enumerate_future_argumentation_theories, but not in the same order. Sets of candidates are
+    enumerated depth-first as bitmasks (see item_set_to_bitmask), so only a stack of at most quadratic size in the
+    number of candidates is kept in memory instead of all future ArgumentationTheories.
+
+    The bitmasks can be split into disjoint parts, for example to handle them in different processes. Each range of
+    bitmasks that starts with the same first few candidates (so the same highest bits) is a block; the blocks are dealt
+    to the parts in turn.
+
+    :param argumentation_theory: ArgumentationTheory for which future knowledge bases should be generated.
+    :param part: Index of the part that should be generated, in range(nr_of_parts).
+    :param nr_of_parts: Number of parts. Together, the parts contain each future knowledge base exactly once.
+    :return: Iterator over the knowledge bases of all future ArgumentationTheories (in the given part).
+    """
+    original_knowledge_base = argumentation_theory.knowledge_base
+    candidates = sorted(argumentation_theory.future_knowledge_base_candidates)
+
+    # Blocks are identified by their first prefix_length bits; there are at least nr_of_parts blocks (if possible).
+    prefix_length = min(len(candidates), (nr_of_parts - 1).bit_length())
+    free_length = len(candidates) - prefix_length
+
+    def is_in_part(candidate_set: int) -> bool:
+        return (candidate_set >> free_length) % nr_of_parts == part
+
+    if is_in_part(0):
+        yield original_knowledge_base
+    for obs in candidates:
+        if is_in_part(item_set_to_bitmask([obs], candidates)):
+            yield original_knowledge_base + [obs]
+
+    # As in enumerate_future_argumentation_theories, larger sets are only added to a consistent knowledge base and
+    # only consist of candidates that are not contraries of it and are consistent among each other.
+    if not stability_label_algorithm.modules.test_consistency_queryable_set.queryable_set_is_consistent(
+            original_knowledge_base):
+        return
+    contraries_of_original = {contrary for queryable in argumentation_theory.knowledge_base_set
+                              for contrary in queryable.contraries}
+    candidate_conflicts = contrary_bitmasks(candidates)
+    allowed = item_set_to_bitmask([obs for obs in candidates if obs not in contraries_of_original], candidates)
+
+    for prefix in range(part, 1 << prefix_length, nr_of_parts):
+        # The candidates in the prefix must be allowed and consistent among each other.
+        prefix_set = prefix << free_length
+        prefix_conflicts = 0
+        remaining = prefix_set
+        while remaining:
+            bit = remaining & -remaining
+            remaining ^= bit
+            prefix_conflicts |= candidate_conflicts[bit]
+        if prefix_set & (prefix_conflicts | ~allowed):
+            continue
+        extensions = allowed & ~prefix_conflicts & ((1 << free_length) - 1)
+
+        # Each stack entry is a set of candidates and the bitmask of later candidates that can still be added to it.
+        stack = [(prefix_set, extensions)]
+        while stack:
+            candidate_set, extensions = stack.pop()
+            if candidate_set & (candidate_set - 1):
+                yield original_knowledge_base + list(bitmask_to_item_set(candidate_set, candidates))
+            remaining = extensions
+            while remaining:
+                bit = remaining & -remaining
+                remaining ^= bit
+                stack.append((candidate_set | bit, extensions & (bit - 1) & ~candidate_conflicts[bit]))
@@ -32,12 +32,13 @@ class IncompleteArgumentationFramework(ArgumentationFramework):
         argumentation_system = argumentation_theory.argumentation_system
         potential_arguments = {literal: [] for literal in argumentation_system.language.values()}
 
+        compiled = argumentation_system.compiled
         for literal in argumentation_system.language.values():
             if literal.is_observable:
-                if literal in argumentation_theory.knowledge_base:
+                if literal in argumentation_theory.knowledge_base_set:
                     obs_based_argument = Argument.create_observation_based(literal, True)
                     potential_arguments[literal].append(obs_based_argument)
-                elif all([contrary not in argumentation_theory.knowledge_base for contrary in literal.contraries]):
+                elif not argumentation_theory.contrary_observed[compiled.literal_ids[literal]]:
                     obs_based_potential_argument = PotentialArgument.create_observation_based(literal, False)
                     potential_arguments[literal].append(obs_based_potential_argument)
 
@@ -1,12 +1,13 @@
-from typing import List
+from typing import Iterable
 
 from stability_label_algorithm.modules.dataset_generator.dataset_item import DatasetItem
 
 
 class Dataset:
-    def __init__(self, name: str, argumentation_system_name: str, dataset_items: List[DatasetItem]):
+    def __init__(self, name: str, argumentation_system_name: str, dataset_items: Iterable[DatasetItem]):
         """
-        A Dataset has a name, the name of its ArgumentationSystem and a list of DatasetItems.
+        A Dataset has a name, the name of its ArgumentationSystem and a list of DatasetItems. For writing a Dataset to
+        file, dataset_items can also be an iterator that generates the DatasetItems.
 
         :param name: Name of the Dataset.
         :param argumentation_system_name: Name of the ArgumentationSystem on which the Dataset is based.
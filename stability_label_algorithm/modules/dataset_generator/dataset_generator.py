@@ -1,19 +1,26 @@
+import json
 from datetime import datetime
-from itertools import combinations, chain
-from typing import List, Optional
+from collections import defaultdict
+from multiprocessing.pool import Pool
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
 
 from ..argumentation.argumentation_theory.argumentation_system import ArgumentationSystem
 from ..argumentation.argumentation_theory.argumentation_theory import ArgumentationTheory
+from ..argumentation.argumentation_theory.queryable import Queryable
+from ..argumentation.exporters.argumentation_system_json_writer import ArgumentationSystemJsonWriter
+from ..argumentation.importers.argumentation_system_json_reader import ArgumentationSystemJsonReader
 from ..argumentation.importers.argumentation_system_xlsx_reader import ArgumentationSystemXLSXReader
 from ..argumentation.labelers.acceptability_labeler import JustificationLabeler
+from ..argumentation.labelers.array_labels import ArrayLabels
 from .annotated_dataset_item import AnnotatedDatasetItem
 from .argumentation_theory_lattice_item import ArgumentationTheoryLatticeItem
 from .dataset import Dataset
 from .dataset_item import DatasetItem
 from .dataset_sample_generator.dataset_sample_generator import generate_dataset_sample
-from .exporters.dataset_json_writer import DatasetJsonWriter
+from .exporters.dataset_json_writer import DatasetJsonWriter, DEFAULT_CHUNK_SIZE
 from .utils import write_argumentation_system
-from ..test_consistency_queryable_set import queryable_set_is_consistent
 from tests.utils import path_to_resources
 
 
@@ -32,7 +39,7 @@ class DatasetGenerator:
         :param argumentation_system_file_name: Name of ArgumentationSystem for which a Dataset should be generated.
         :return: Dataset for specified ArgumentationSystem.
         """
-        asr = ArgumentationSystemXLSXReader(path_to_resources(argumentation_system_file_name))
+        asr = ArgumentationSystemXLSXReader.from_snapshot_or_xlsx(path_to_resources(argumentation_system_file_name))
         arg_system = ArgumentationSystem(asr.language, asr.rules, asr.topic_literals)
         return cls(arg_system, argumentation_system_file_name)
 
@@ -81,7 +88,7 @@ class DatasetGenerator:
         raise NotImplementedError('Moet nog!')
 
     def generate_dataset(self, custom_dataset_name: Optional[str] = None, include_ground_truth: bool = True,
-                         verbose: bool = True) -> Dataset:
+                         verbose: bool = True, workers: int = 1) -> Dataset:
         """
         Generate a Dataset, where all possible ArgumentationTheories for the given ArgumentationSystem are generated.
         Note: for ArgumentationSystems with many Queryables, this takes a lot of time.
@@ -89,6 +96,7 @@ class DatasetGenerator:
         :param custom_dataset_name: Optional, name of the Dataset. Otherwise a name based on the timestamp is chosen.
         :param include_ground_truth: Boolean indicating if the ground truth should be computed. Note: this takes time!
         :param verbose: Boolean indicating if information should be printed.
+        :param workers: Number of worker processes that compute the justification labels for the ground truth.
         :return: The resulting Dataset.
         """
         timestamp = datetime.now().strftime('%Y%m%d-%H%M%S%f')
@@ -108,30 +116,92 @@ class DatasetGenerator:
         # Compute and store annotated dataset if required
         annotated_dataset_name = dataset_name + '_annotated'
         annotated_dataset = DatasetGenerator._generate_dataset_for_argumentation_system_with_ground_truth(
-            annotated_dataset_name, self.argumentation_system, argumentation_system_name, argumentation_theory_dataset)
+            annotated_dataset_name, self.argumentation_system, argumentation_system_name, argumentation_theory_dataset,
+            workers)
         DatasetJsonWriter().write_to_json(annotated_dataset)
         return annotated_dataset
 
+    def generate_dataset_file(self, custom_dataset_name: Optional[str] = None, verbose: bool = True,
+                              chunk_size: int = DEFAULT_CHUNK_SIZE) -> str:
+        """
+        Generate all possible ArgumentationTheories for the given ArgumentationSystem (without ground truth), like
+        generate_dataset, but write them to file while they are generated instead of keeping the Dataset in memory. The
+        memory use does not depend on the number of DatasetItems, so this also works for millions of DatasetItems.
+
+        :param custom_dataset_name: Optional, name of the Dataset. Otherwise a name based on the timestamp is chosen.
+        :param verbose: Boolean indicating if information should be printed.
+        :param chunk_size: Number of DatasetItems that are written to file at once.
+        :return: Name of the written Dataset.
+        """
+        timestamp = datetime.now().strftime('%Y%m%d-%H%M%S%f')
+
+        argumentation_system_name = self._get_argumentation_system_name(timestamp)
+        write_argumentation_system(self.argumentation_system, argumentation_system_name)
+
+        dataset_name = self._get_dataset_name(custom_dataset_name, argumentation_system_name, timestamp)
+        dataset_items = DatasetGenerator._iter_argumentation_theory_dataset_items(
+            self.argumentation_system, argumentation_system_name, verbose)
+        DatasetJsonWriter().write_to_json(Dataset(dataset_name, argumentation_system_name, dataset_items), chunk_size)
+        return dataset_name
+
     @staticmethod
     def _generate_argumentation_theory_dataset(dataset_name: str,
                                                argumentation_system: ArgumentationSystem,
                                                argumentation_system_name: str,
                                                verbose: bool) -> Dataset:
-        queryables = argumentation_system.queryables
-        all_queryable_combinations = chain.from_iterable(combinations(queryables, r)
-                                                         for r in range(len(queryables) + 1))
-
-        dataset_items: List[DatasetItem] = []
-        for queryable_tuple in all_queryable_combinations:
-            queryable_list = list(queryable_tuple)
-            if queryable_set_is_consistent(queryable_list):
-                dataset_items.append(DatasetItem(argumentation_system, argumentation_system_name, queryable_list))
-                if verbose and len(dataset_items) % 100000 == 0:
-                    queryable_list_str = '+'.join([str(q) for q in queryable_list])
-                    print(f'Added {str(len(queryable_list))}-length knowledge base {str(len(dataset_items))}: '
-                          f'{queryable_list_str}.')
+        dataset_items = list(DatasetGenerator._iter_argumentation_theory_dataset_items(
+            argumentation_system, argumentation_system_name, verbose))
         return Dataset(dataset_name, argumentation_system_name, dataset_items)
 
+    @staticmethod
+    def _iter_argumentation_theory_dataset_items(argumentation_system: ArgumentationSystem,
+                                                 argumentation_system_name: str,
+                                                 verbose: bool) -> Iterator[DatasetItem]:
+        nr_of_dataset_items = 0
+        for queryable_list in DatasetGenerator._iter_consistent_knowledge_bases(argumentation_system):
+            nr_of_dataset_items += 1
+            yield DatasetItem(argumentation_system, argumentation_system_name, queryable_list)
+            if verbose and nr_of_dataset_items % 100000 == 0:
+                queryable_list_str = '+'.join([str(q) for q in queryable_list])
+                print(f'Added {str(len(queryable_list))}-length knowledge base {str(nr_of_dataset_items)}: '
+                      f'{queryable_list_str}.')
+
+    @staticmethod
+    def _iter_consistent_knowledge_bases(argumentation_system: ArgumentationSystem) -> Iterator[List[Queryable]]:
+        """
+        Generate all consistent knowledge bases (in the sense of queryable_set_is_consistent) one by one: ordered by
+        size and, for each size, in the order of itertools.combinations on the Queryables. Instead of testing each
+        combination of Queryables, combinations are extended depth-first with Queryables that are not a contrary of
+        the chosen ones only, so only the current combination is kept in memory.
+
+        :param argumentation_system: ArgumentationSystem for which knowledge bases should be generated.
+        :return: Iterator over all consistent knowledge bases.
+        """
+        queryables = argumentation_system.queryables
+        nr_of_queryables = len(queryables)
+        # For Queryable i, a bitmask of the later Queryables j such that Queryable i is a contrary of Queryable j.
+        later_conflicts = [sum(1 << j for j in range(i + 1, nr_of_queryables)
+                               if queryables[i].is_contrary_of(queryables[j]))
+                           for i in range(nr_of_queryables)]
+
+        def extend(chosen: List[int], allowed: int, size: int) -> Iterator[List[Queryable]]:
+            if len(chosen) == size:
+                yield [queryables[i] for i in chosen]
+                return
+            remaining = allowed
+            while remaining:
+                bit = remaining & -remaining
+                remaining ^= bit
+                i = bit.bit_length() - 1
+                if nr_of_queryables - i < size - len(chosen):
+                    return
+                chosen.append(i)
+                yield from extend(chosen, remaining & ~later_conflicts[i], size)
+                chosen.pop()
+
+        for size in range(nr_of_queryables + 1):
+            yield from extend([], (1 << nr_of_queryables) - 1, size)
+
     @staticmethod
     def _generate_argumentation_theory_dataset_sample(dataset_name: str,
                                                       argumentation_system: ArgumentationSystem,
@@ -147,50 +217,142 @@ class DatasetGenerator:
         return Dataset(dataset_name, argumentation_system_name, dataset_items)
 
     @staticmethod
-    def _generate_argumentation_theory_lattice(argumentation_theory_dataset: Dataset) \
+    def _generate_argumentation_theory_lattice(argumentation_theory_dataset: Dataset, workers: int = 1) \
             -> List[ArgumentationTheoryLatticeItem]:
-        acceptability_labeler = JustificationLabeler()
-        argumentation_theories = (ArgumentationTheory(dataset_item.argumentation_system, dataset_item.knowledge_base)
-                                  for dataset_item in argumentation_theory_dataset.dataset_items)
+        argumentation_theories = [ArgumentationTheory(dataset_item.argumentation_system, dataset_item.knowledge_base)
+                                  for dataset_item in argumentation_theory_dataset.dataset_items]
+        if workers <= 1 or len(argumentation_theories) < 2:
+            acceptability_labeler = JustificationLabeler()
+            all_labels = [acceptability_labeler.label(argumentation_theory)
+                          for argumentation_theory in argumentation_theories]
+        else:
+            # The ArgumentationTheories are labelled in chunks by the workers, which return the codes of the labels.
+            argumentation_system = argumentation_theories[0].argumentation_system
+            compiled = argumentation_system.compiled
+            knowledge_base_ids = [tuple(compiled.get_literal_ids(argumentation_theory.knowledge_base))
+                                  for argumentation_theory in argumentation_theories]
+            chunk_size = -(-len(knowledge_base_ids) // (4 * workers))
+            chunks = [knowledge_base_ids[start:start + chunk_size]
+                      for start in range(0, len(knowledge_base_ids), chunk_size)]
+            with Pool(workers, initializer=_init_worker,
+                      initargs=(ArgumentationSystemJsonWriter.to_json(argumentation_system),)) as pool:
+                chunk_codes = pool.map(_label_knowledge_bases, chunks)
+            all_labels = [ArrayLabels(compiled, literal_codes, rule_codes)
+                          for literal_codes_chunk, rule_codes_chunk in chunk_codes
+                          for literal_codes, rule_codes in zip(literal_codes_chunk, rule_codes_chunk)]
+
+        if not argumentation_theories:
+            return []
+        compiled = argumentation_theories[0].argumentation_system.compiled
+
+        # The ArgumentationTheories are indexed by knowledge base bitmask, so that the direct future theories of each
+        # ArgumentationTheory are found by adding one Queryable that is not in its knowledge base.
+        indices_by_bitmask = defaultdict(list)
+        for index, argumentation_theory in enumerate(argumentation_theories):
+            indices_by_bitmask[argumentation_theory.knowledge_base_bitmask].append(index)
+        queryable_bits = [1 << int(queryable_id) for queryable_id in compiled.queryable_ids]
+        direct_future_indices = []
+        for argumentation_theory in argumentation_theories:
+            bitmask = argumentation_theory.knowledge_base_bitmask
+            direct_future_indices.append([future_index
+                                          for queryable_bit in queryable_bits if not bitmask & queryable_bit
+                                          for future_index in indices_by_bitmask.get(bitmask | queryable_bit, [])])
+
+        literal_codes, rule_codes = DatasetGenerator._propagate_stability_codes(
+            argumentation_theories, all_labels, direct_future_indices)
+
         argumentation_theory_lattice_items = \
-            [ArgumentationTheoryLatticeItem(argumentation_theory, acceptability_labeler.label(argumentation_theory))
-             for argumentation_theory in argumentation_theories]
-        for i1, first_item in enumerate(argumentation_theory_lattice_items):
-            for second_item in argumentation_theory_lattice_items[i1 + 1:]:
-                first_item.connect(second_item)
+            [ArgumentationTheoryLatticeItem(argumentation_theory, labels,
+                                            ArrayLabels(compiled, literal_codes[index], rule_codes[index]))
+             for index, (argumentation_theory, labels) in enumerate(zip(argumentation_theories, all_labels))]
+        for lattice_item, future_indices in zip(argumentation_theory_lattice_items, direct_future_indices):
+            for future_index in future_indices:
+                lattice_item._add_direct_future_theory(argumentation_theory_lattice_items[future_index])
         return argumentation_theory_lattice_items
 
+    @staticmethod
+    def _propagate_stability_codes(argumentation_theories: List[ArgumentationTheory], all_labels: List[ArrayLabels],
+                                   direct_future_indices: List[List[int]]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Compute the stability label codes of all ArgumentationTheories in a lattice: the bitwise or of the acceptability
+        label codes of the ArgumentationTheory and those of its direct future theories. This is done in one pass, from
+        the largest knowledge bases to the smallest, so the codes of the direct future theories are final when used.
+
+        :param argumentation_theories: The ArgumentationTheories in the lattice.
+        :param all_labels: Acceptability labels of each ArgumentationTheory.
+        :param direct_future_indices: For each ArgumentationTheory, indices of its direct future theories.
+        :return: Literal codes and Rule codes, with one row for each ArgumentationTheory.
+        """
+        literal_codes = np.stack([labels.literal_codes for labels in all_labels])
+        rule_codes = np.stack([labels.rule_codes for labels in all_labels])
+
+        indices_by_size = defaultdict(list)
+        for index, argumentation_theory in enumerate(argumentation_theories):
+            indices_by_size[len(argumentation_theory.knowledge_base)].append(index)
+        for size in sorted(indices_by_size.keys(), reverse=True):
+            edges = [(index, future_index) for index in indices_by_size[size]
+                     for future_index in direct_future_indices[index]]
+            if edges:
+                indices, future_indices = (np.array(column, dtype=np.int64) for column in zip(*edges))
+                np.bitwise_or.at(literal_codes, indices, literal_codes[future_indices])
+                np.bitwise_or.at(rule_codes, indices, rule_codes[future_indices])
+        return literal_codes, rule_codes
+
     @staticmethod
     def _generate_dataset_for_argumentation_system_with_ground_truth(
             dataset_name: str,
             argumentation_system: ArgumentationSystem,
             argumentation_system_name: str,
-            argumentation_theory_dataset: Dataset) -> Dataset:
+            argumentation_theory_dataset: Dataset,
+            workers: int = 1) -> Dataset:
         if argumentation_system.topic_literals:
             topics = argumentation_system.topic_literals
         else:
             topics = argumentation_system.language.values()
 
-        lattice_items = DatasetGenerator._generate_argumentation_theory_lattice(argumentation_theory_dataset)
-        lattice_update_round = {lattice_item for lattice_item in lattice_items if lattice_item.is_largest}
+        lattice_items = DatasetGenerator._generate_argumentation_theory_lattice(argumentation_theory_dataset, workers)
 
+        # The stability labels are final already, so each item is annotated once (largest knowledge bases first).
         dataset_items = []
+        for lattice_item in sorted(lattice_items, key=lambda item: len(item.argumentation_theory.knowledge_base),
+                                   reverse=True):
+            for topic_literal in topics:
+                gt_acceptability_label = lattice_item.acceptability_labels.literal_labeling[topic_literal]
+                gt_stability_label = lattice_item.stability_labels.literal_labeling[topic_literal]
+                new_item = AnnotatedDatasetItem(argumentation_system, argumentation_system_name,
+                                                lattice_item.argumentation_theory.knowledge_base,
+                                                topic_literal, gt_acceptability_label, gt_stability_label)
+                dataset_items.append(new_item)
 
-        while lattice_update_round:
-            new_round = set()
+        return Dataset(dataset_name, argumentation_system_name, dataset_items)
 
-            for lattice_item in lattice_update_round:
-                lattice_item.update_possible_future_acceptability_statuses()
-                for topic_literal in topics:
-                    gt_acceptability_label = lattice_item.acceptability_labels.literal_labeling[topic_literal]
-                    gt_stability_label = lattice_item.stability_labels.literal_labeling[topic_literal]
-                    new_item = AnnotatedDatasetItem(argumentation_system, argumentation_system_name,
-                                                    lattice_item.argumentation_theory.knowledge_base,
-                                                    topic_literal, gt_acceptability_label, gt_stability_label)
-                    dataset_items.append(new_item)
 
-                new_round |= set(lattice_item.direct_previous_theories)
+# State of a worker process of the DatasetGenerator, set once by _init_worker when the process pool starts.
+_worker_state = {}
 
-            lattice_update_round = new_round
 
-        return Dataset(dataset_name, argumentation_system_name, dataset_items)
+def _init_worker(argumentation_system_json: str) -> None:
+    """
+    Rebuild the ArgumentationSystem in a worker process from its JSON form (see ArgumentationSystemJsonWriter), so that
+    neither the linked Literals and Rules nor the caches of the compiled ArgumentationSystem have to be pickled.
+    """
+    argumentation_system = ArgumentationSystemJsonReader.from_json(json.loads(argumentation_system_json))
+    _worker_state['argumentation_system'] = argumentation_system
+
+
+def _label_knowledge_bases(knowledge_base_ids: List[Tuple[int, ...]]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compute the JustificationLabeler codes for a chunk of knowledge bases (given as Literal ids) in a worker process.
+
+    :return: Literal codes and Rule codes, with one row for each knowledge base.
+    """
+    argumentation_system = _worker_state['argumentation_system']
+    compiled = argumentation_system.compiled
+    acceptability_labeler = JustificationLabeler()
+    literal_codes, rule_codes = [], []
+    for literal_ids in knowledge_base_ids:
+        knowledge_base = [compiled.literals[literal_id] for literal_id in literal_ids]
+        labels = acceptability_labeler.label(ArgumentationTheory(argumentation_system, knowledge_base))
+        literal_codes.append(labels.literal_codes)
+        rule_codes.append(labels.rule_codes)
+    return np.stack(literal_codes), np.stack(rule_codes)
@@ -1,9 +1,12 @@
-from typing import List
+import re
+from typing import List, Optional
 
 from stability_label_algorithm.modules.argumentation.argumentation_theory.argumentation_system import ArgumentationSystem
 from stability_label_algorithm.modules.argumentation.argumentation_theory.queryable import Queryable
 from stability_label_algorithm.modules.dataset_generator.utils import get_argumentation_system_from_name
 
+DATASET_ITEM_PATTERN = re.compile(r'(?:AS=)?(?P<argumentation_system_name>[^,]*),(?:K=)?(?P<knowledge>[^,]*)')
+
 
 class DatasetItem:
     def __init__(self,
@@ -27,15 +30,30 @@ class DatasetItem:
         return f'AS={as_name},K={knowledge_str}'
 
     @classmethod
-    def from_str(cls, dataset_item_str: str):
+    def from_str(cls, dataset_item_str: str, argumentation_system: Optional[ArgumentationSystem] = None):
         """
         Read the DatasetItem from a string.
 
         :param dataset_item_str: String representation of the DatasetItem.
+        :param argumentation_system: Optional, the ArgumentationSystem of the DatasetItem. Otherwise it is obtained
+            with get_argumentation_system_from_name.
         :return: DatasetItem represented by the input string.
         """
-        argumentation_system_name, knowledge_str = dataset_item_str.split(',', 2)
-        argumentation_system = get_argumentation_system_from_name(argumentation_system_name)
-        knowledge_str_list = knowledge_str.split('+')
-        knowledge_base = argumentation_system.get_queryables(knowledge_str_list)
+        match = DATASET_ITEM_PATTERN.fullmatch(dataset_item_str)
+        argumentation_system_name = match.group('argumentation_system_name')
+        if argumentation_system is None:
+            argumentation_system = get_argumentation_system_from_name(argumentation_system_name)
+        knowledge_base = argumentation_system.get_queryables(knowledge_str_to_list(match.group('knowledge')))
         return cls(argumentation_system, argumentation_system_name, knowledge_base)
+
+
+def knowledge_str_to_list(knowledge_str: str) -> List[str]:
+    """
+    Split the string of a knowledge base (as in the string of a DatasetItem) into the names of its Queryables.
+
+    >>> knowledge_str_to_list('a+~b'), knowledge_str_to_list('')
+    (['a', '~b'], [])
+    """
+    if not knowledge_str:
+        return []
+    return knowledge_str.split('+')
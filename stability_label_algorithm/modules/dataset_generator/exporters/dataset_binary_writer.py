@@ -0,0 +1,131 @@
+import json
+import os
+import shutil
+import struct
+from typing import List, Optional
+
+import numpy as np
+
+from stability_label_algorithm.modules.argumentation.argumentation_theory.argumentation_system import \
+    ArgumentationSystem
+from stability_label_algorithm.modules.dataset_generator.annotated_dataset_item import AnnotatedDatasetItem
+from stability_label_algorithm.modules.dataset_generator.dataset import Dataset
+from stability_label_algorithm.modules.dataset_generator.dataset_item import DatasetItem
+from stability_label_algorithm.modules.dataset_generator.exporters.dataset_json_writer import DEFAULT_CHUNK_SIZE
+from stability_label_algorithm.modules.dataset_generator.utils import get_argumentation_system_from_name, \
+    get_binary_path
+
+# A binary Dataset file starts with BINARY_DATASET_MAGIC, the length of the header (unsigned 64-bit little-endian) and
+# the header in JSON. Each column starts at a multiple of BINARY_DATASET_ALIGNMENT bytes, so it can be memory-mapped.
+BINARY_DATASET_MAGIC = b'SLADS\x00\x01\x00'
+BINARY_DATASET_ALIGNMENT = 64
+
+
+class DatasetBinaryWriter:
+    """
+    Writes a Dataset in a columnar binary format (see DatasetBinaryReader for reading it):
+
+    - knowledge_bases: for each DatasetItem, the knowledge base as a bitmask over the Queryables of the header, packed
+      with numpy.packbits (uint8, one row per DatasetItem);
+    - topics (AnnotatedDatasetItems only): the index of the topic Literal in the Literals of the header (int32);
+    - label_codes (AnnotatedDatasetItems only): the 4-bit code of the acceptability label in the low bits and that of
+      the stability label in the high bits (uint8).
+
+    The header refers to the ArgumentationSystem by name and lists its Queryables and Literals by name.
+    """
+    def __init__(self):
+        pass
+
+    def write_to_binary(self, dataset: Dataset, argumentation_system: Optional[ArgumentationSystem] = None,
+                        chunk_size: int = DEFAULT_CHUNK_SIZE):
+        """
+        Write the Dataset to file. The DatasetItems are consumed once and encoded in chunks, so dataset_items can also
+        be an iterator that generates them while writing.
+
+        :param dataset: Dataset to write.
+        :param argumentation_system: Optional, the ArgumentationSystem of the Dataset. Otherwise it is obtained with
+            get_argumentation_system_from_name.
+        :param chunk_size: Number of DatasetItems that are encoded at once.
+        """
+        if argumentation_system is None:
+            argumentation_system = get_argumentation_system_from_name(dataset.argumentation_system_name)
+        queryable_names = [str(queryable) for queryable in argumentation_system.queryables]
+        literal_names = list(argumentation_system.language.keys())
+        queryable_indices = {queryable_name: index for index, queryable_name in enumerate(queryable_names)}
+        literal_indices = {literal_name: index for index, literal_name in enumerate(literal_names)}
+
+        # The columns are first written to temporary files, as the number of DatasetItems is not known beforehand.
+        file_path = str(get_binary_path(dataset.name))
+        column_names = ['knowledge_bases', 'topics', 'label_codes']
+        column_paths = {column_name: f'{file_path}.{column_name}.tmp' for column_name in column_names}
+        column_files = {column_name: open(column_path, 'wb') for column_name, column_path in column_paths.items()}
+        nr_of_items = 0
+        annotated = None
+        try:
+            chunk: List[DatasetItem] = []
+            for dataset_item in dataset.dataset_items:
+                if annotated is None:
+                    annotated = isinstance(dataset_item, AnnotatedDatasetItem)
+                chunk.append(dataset_item)
+                if len(chunk) >= chunk_size:
+                    self._write_chunk(chunk, column_files, queryable_indices, literal_indices, annotated)
+                    nr_of_items += len(chunk)
+                    chunk = []
+            if chunk:
+                self._write_chunk(chunk, column_files, queryable_indices, literal_indices, annotated)
+                nr_of_items += len(chunk)
+        finally:
+            for column_file in column_files.values():
+                column_file.close()
+
+        annotated = bool(annotated)
+        nr_of_bytes = (len(queryable_names) + 7) // 8
+        column_specs = [('knowledge_bases', 'uint8', [nr_of_items, nr_of_bytes])]
+        if annotated:
+            column_specs += [('topics', '<i4', [nr_of_items]), ('label_codes', 'uint8', [nr_of_items])]
+
+        # Offsets are relative to the start of the data (after the header), which is aligned as well.
+        columns = {}
+        offset = 0
+        for column_name, dtype, shape in column_specs:
+            columns[column_name] = {'dtype': dtype, 'shape': shape, 'offset': offset}
+            size = os.path.getsize(column_paths[column_name])
+            offset += -(-size // BINARY_DATASET_ALIGNMENT) * BINARY_DATASET_ALIGNMENT
+        header = {'name': dataset.name, 'argumentation_system_name': dataset.argumentation_system_name,
+                  'annotated': annotated, 'nr_of_items': nr_of_items, 'queryables': queryable_names,
+                  'literals': literal_names, 'columns': columns}
+        header_bytes = json.dumps(header).encode('utf-8')
+
+        try:
+            with open(file_path, 'wb') as writer:
+                writer.write(BINARY_DATASET_MAGIC)
+                writer.write(struct.pack('<Q', len(header_bytes)))
+                writer.write(header_bytes)
+                self._pad(writer)
+                for column_name, _, _ in column_specs:
+                    with open(column_paths[column_name], 'rb') as column_reader:
+                        shutil.copyfileobj(column_reader, writer)
+                    self._pad(writer)
+        finally:
+            for column_path in column_paths.values():
+                os.remove(column_path)
+
+    @staticmethod
+    def _write_chunk(chunk: List[DatasetItem], column_files, queryable_indices, literal_indices, annotated: bool):
+        knowledge_bases = np.zeros((len(chunk), len(queryable_indices)), dtype=bool)
+        for row, dataset_item in enumerate(chunk):
+            knowledge_bases[row, [queryable_indices[str(queryable)] for queryable in dataset_item.knowledge_base]] = \
+                True
+        column_files['knowledge_bases'].write(np.packbits(knowledge_bases, axis=1).tobytes())
+
+        if annotated:
+            topics = np.array([literal_indices[str(dataset_item.topic_literal)] for dataset_item in chunk],
+                              dtype='<i4')
+            label_codes = np.array([dataset_item.gt_acceptability_label.code | dataset_item.gt_stability_label.code << 4
+                                    for dataset_item in chunk], dtype=np.uint8)
+            column_files['topics'].write(topics.tobytes())
+            column_files['label_codes'].write(label_codes.tobytes())
+
+    @staticmethod
+    def _pad(writer):
+        writer.write(b'\x00' * (-writer.tell() % BINARY_DATASET_ALIGNMENT))
@@ -3,6 +3,8 @@ import simplejson as json
 from stability_label_algorithm.modules.dataset_generator.dataset import Dataset
 from stability_label_algorithm.modules.dataset_generator.utils import get_path
 
+DEFAULT_CHUNK_SIZE = 10000
+
 
 class DatasetJsonWriter:
     def __init__(self):
@@ -14,7 +16,14 @@ class DatasetJsonWriter:
                      'dataset_items': (str(dataset_item) for dataset_item in dataset.dataset_items)}
         return json.dumps(json_dict, iterable_as_array=True)
 
-    def write_to_json(self, dataset: Dataset):
+    def write_to_json(self, dataset: Dataset, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        """
+        Write the Dataset to file, one line per DatasetItem. The DatasetItems are consumed once and written in chunks,
+        so dataset_items can also be an iterator that generates them while writing.
+
+        :param dataset: Dataset to write.
+        :param chunk_size: Number of DatasetItems that are written at once.
+        """
         # file_path = get_path(dataset.name)
         # with open(file_path, 'w') as writer:
             # writer.write(self.to_json(dataset))
@@ -22,5 +31,10 @@ class DatasetJsonWriter:
         with open(file_path, 'w') as writer:
             writer.write(dataset.name + '\n')
             writer.write(dataset.argumentation_system_name + '\n')
+            chunk = []
             for dataset_item in dataset.dataset_items:
-                writer.write(str(dataset_item) + '\n')
+                chunk.append(str(dataset_item) + '\n')
+                if len(chunk) >= chunk_size:
+                    writer.writelines(chunk)
+                    chunk = []
+            writer.writelines(chunk)
@@ -0,0 +1,136 @@
+import json
+import struct
+from typing import Iterator, List, Optional, Union
+
+import numpy as np
+
+from stability_label_algorithm.modules.argumentation.argumentation_theory.argumentation_system import \
+    ArgumentationSystem
+from stability_label_algorithm.modules.argumentation.argumentation_theory.literal import Literal
+from stability_label_algorithm.modules.argumentation.argumentation_theory.queryable import Queryable
+from stability_label_algorithm.modules.argumentation.labelers.stability_label import StabilityLabel
+from stability_label_algorithm.modules.dataset_generator.annotated_dataset_item import AnnotatedDatasetItem
+from stability_label_algorithm.modules.dataset_generator.dataset import Dataset
+from stability_label_algorithm.modules.dataset_generator.dataset_item import DatasetItem
+from stability_label_algorithm.modules.dataset_generator.exporters.dataset_binary_writer import \
+    BINARY_DATASET_ALIGNMENT, BINARY_DATASET_MAGIC
+from stability_label_algorithm.modules.dataset_generator.utils import get_argumentation_system_from_name
+
+
+class DatasetBinaryReader:
+    """
+    Reads a Dataset that was written by DatasetBinaryWriter. The columns are memory-mapped, so slicing them (for
+    example dataset_reader.stability_codes(slice(1000000))) does not parse anything and only reads the pages that are
+    used.
+    The ArgumentationSystem is only resolved (with get_argumentation_system_from_name) when DatasetItems are needed.
+    """
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        with open(file_path, 'rb') as reader:
+            if reader.read(len(BINARY_DATASET_MAGIC)) != BINARY_DATASET_MAGIC:
+                raise ValueError(f'{file_path} is not a binary Dataset file.')
+            header_length, = struct.unpack('<Q', reader.read(8))
+            self.header = json.loads(reader.read(header_length).decode('utf-8'))
+        header_end = len(BINARY_DATASET_MAGIC) + 8 + header_length
+        data_start = -(-header_end // BINARY_DATASET_ALIGNMENT) * BINARY_DATASET_ALIGNMENT
+
+        self.name: str = self.header['name']
+        self.argumentation_system_name: str = self.header['argumentation_system_name']
+        self.annotated: bool = self.header['annotated']
+        self.queryable_names: List[str] = self.header['queryables']
+        self.literal_names: List[str] = self.header['literals']
+
+        columns = {}
+        for column_name, column in self.header['columns'].items():
+            shape = tuple(column['shape'])
+            if np.prod(shape) == 0:
+                columns[column_name] = np.zeros(shape, dtype=column['dtype'])
+            else:
+                columns[column_name] = np.memmap(file_path, dtype=column['dtype'], mode='r',
+                                                 offset=data_start + column['offset'], shape=shape)
+        self.knowledge_bases: np.ndarray = columns['knowledge_bases']
+        self.topics: Optional[np.ndarray] = columns.get('topics')
+        self.label_codes: Optional[np.ndarray] = columns.get('label_codes')
+
+        self._argumentation_system: Optional[ArgumentationSystem] = None
+
+    def __len__(self) -> int:
+        return self.header['nr_of_items']
+
+    def acceptability_codes(self, index: Union[int, slice] = slice(None)) -> np.ndarray:
+        """
+        The 4-bit code of the acceptability label of the topic of some DatasetItems. Only the selected items are read.
+
+        :param index: Index or slice of the DatasetItems.
+        :return: The code of each selected DatasetItem.
+        """
+        return self._get_label_codes(index) & 15
+
+    def stability_codes(self, index: Union[int, slice] = slice(None)) -> np.ndarray:
+        """
+        The 4-bit code of the stability label of the topic of some DatasetItems. Only the selected items are read.
+
+        :param index: Index or slice of the DatasetItems.
+        :return: The code of each selected DatasetItem.
+        """
+        return self._get_label_codes(index) >> 4
+
+    def _get_label_codes(self, index: Union[int, slice]) -> np.ndarray:
+        if not self.annotated:
+            raise ValueError(f'{self.file_path} is not an annotated Dataset, so it has no labels.')
+        return self.label_codes[index]
+
+    def knowledge_base_masks(self, index: Union[int, slice] = slice(None)) -> np.ndarray:
+        """
+        Unpack the knowledge bases of some DatasetItems.
+
+        :param index: Index or slice of the DatasetItems.
+        :return: Boolean array that is True where the Queryable (in the order of queryable_names) is in the knowledge
+            base, with one row for each DatasetItem if index is a slice.
+        """
+        packed = self.knowledge_bases[index]
+        return np.unpackbits(packed, axis=-1, count=len(self.queryable_names)).astype(bool)
+
+    @property
+    def argumentation_system(self) -> ArgumentationSystem:
+        if self._argumentation_system is None:
+            self._argumentation_system = get_argumentation_system_from_name(self.argumentation_system_name)
+        return self._argumentation_system
+
+    @property
+    def queryables(self) -> List[Queryable]:
+        return [self.argumentation_system.language[queryable_name] for queryable_name in self.queryable_names]
+
+    @property
+    def literals(self) -> List[Literal]:
+        return [self.argumentation_system.language[literal_name] for literal_name in self.literal_names]
+
+    def __getitem__(self, index: int) -> DatasetItem:
+        """
+        Decode a single DatasetItem (or AnnotatedDatasetItem).
+        """
+        return self._decode(index, self.queryables, self.literals)
+
+    def iter_dataset_items(self) -> Iterator[DatasetItem]:
+        """
+        Decode the DatasetItems one by one.
+        """
+        queryables, literals = self.queryables, self.literals
+        for index in range(len(self)):
+            yield self._decode(index, queryables, literals)
+
+    def _decode(self, index: int, queryables: List[Queryable], literals: List[Literal]) -> DatasetItem:
+        knowledge_base = [queryables[queryable_index]
+                          for queryable_index in np.flatnonzero(self.knowledge_base_masks(index))]
+        if not self.annotated:
+            return DatasetItem(self.argumentation_system, self.argumentation_system_name, knowledge_base)
+        label_code = int(self.label_codes[index])
+        return AnnotatedDatasetItem(self.argumentation_system, self.argumentation_system_name, knowledge_base,
+                                    literals[int(self.topics[index])], StabilityLabel.from_code(label_code & 15),
+                                    StabilityLabel.from_code(label_code >> 4))
+
+    def to_dataset(self) -> Dataset:
+        """
+        Decode all DatasetItems into a Dataset.
+        """
+        return Dataset(self.name, self.argumentation_system_name, list(self.iter_dataset_items()))
@@ -1,22 +1,70 @@
 import json
+from typing import Iterator
 
+from stability_label_algorithm.modules.argumentation.argumentation_theory.argumentation_system import \
+    ArgumentationSystem
+from stability_label_algorithm.modules.dataset_generator.annotated_dataset_item import AnnotatedDatasetItem, \
+    ANNOTATED_DATASET_ITEM_PATTERN
 from stability_label_algorithm.modules.dataset_generator.dataset import Dataset
 from stability_label_algorithm.modules.dataset_generator.dataset_item import DatasetItem
+from stability_label_algorithm.modules.dataset_generator.utils import get_argumentation_system_from_name
 
 
 class DatasetJsonReader:
+    """
+    Reads Datasets. The ArgumentationSystem of a Dataset is resolved only once (see get_argumentation_system_from_name)
+    and all DatasetItems are parsed against it.
+    """
     def __init__(self):
         pass
 
     @staticmethod
     def from_json(json_str: str):
         json_object = json.loads(json_str)
-        dataset_items = [DatasetItem.from_str(dataset_item_str) for dataset_item_str in json_object['dataset_items']]
-        dataset = Dataset(json_object['name'], json_object['argumentation_system_name'])
-        dataset.dataset_items = dataset_items
-        return dataset
+        argumentation_system = get_argumentation_system_from_name(json_object['argumentation_system_name'])
+        dataset_items = [DatasetJsonReader.dataset_item_from_str(dataset_item_str, argumentation_system)
+                         for dataset_item_str in json_object['dataset_items']]
+        return Dataset(json_object['name'], json_object['argumentation_system_name'], dataset_items)
 
     def read_from_json(self, file_path: str) -> Dataset:
+        """
+        Read a Dataset from file: either in the format written by DatasetJsonWriter.write_to_json (the name of the
+        Dataset, the name of its ArgumentationSystem and then one line per DatasetItem) or in the format of to_json.
+
+        :param file_path: Path to the Dataset file.
+        :return: The Dataset.
+        """
+        with open(file_path, 'r') as reader:
+            if reader.read(1) == '{':
+                reader.seek(0)
+                return self.from_json(reader.read())
+        with open(file_path, 'r') as reader:
+            name = reader.readline().rstrip('\n')
+            argumentation_system_name = reader.readline().rstrip('\n')
+        return Dataset(name, argumentation_system_name, list(self.iter_dataset_items(file_path)))
+
+    @staticmethod
+    def iter_dataset_items(file_path: str) -> Iterator[DatasetItem]:
+        """
+        Read the DatasetItems in a file written by DatasetJsonWriter.write_to_json one by one, so that the Dataset does
+        not need to fit in memory.
+
+        :param file_path: Path to the Dataset file.
+        :return: Iterator over the DatasetItems (or AnnotatedDatasetItems) in the file.
+        """
         with open(file_path, 'r') as reader:
-            argumentation_system_json = reader.read()
-        return self.from_json(argumentation_system_json)
+            reader.readline()
+            argumentation_system = get_argumentation_system_from_name(reader.readline().rstrip('\n'))
+            for line in reader:
+                dataset_item_str = line.rstrip('\n')
+                if dataset_item_str:
+                    yield DatasetJsonReader.dataset_item_from_str(dataset_item_str, argumentation_system)
+
+    @staticmethod
+    def dataset_item_from_str(dataset_item_str: str, argumentation_system: ArgumentationSystem) -> DatasetItem:
+        """
+        Read a DatasetItem or AnnotatedDatasetItem from its string, parsed against the given ArgumentationSystem.
+        """
+        if ANNOTATED_DATASET_ITEM_PATTERN.fullmatch(dataset_item_str):
+            return AnnotatedDatasetItem.from_str(dataset_item_str, argumentation_system)
+        return DatasetItem.from_str(dataset_item_str, argumentation_system)
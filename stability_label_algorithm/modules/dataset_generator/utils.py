@@ -1,16 +1,26 @@
 import pathlib
 
+from stability_label_algorithm.modules.lru_cache import LRUCache
 from stability_label_algorithm.modules.argumentation.argumentation_theory.argumentation_system import ArgumentationSystem
 from stability_label_algorithm.modules.argumentation.exporters.argumentation_system_json_writer import ArgumentationSystemJsonWriter
 from stability_label_algorithm.modules.argumentation.importers.argumentation_system_json_reader import ArgumentationSystemJsonReader
 
 dataset_folder_path = pathlib.Path(__file__).parent.parent.parent / 'resources' / 'datasets'
 
+# ArgumentationSystems that were read by get_argumentation_system_from_name, by name. Their names contain a timestamp,
+# so a name always refers to the same file.
+ARGUMENTATION_SYSTEM_REGISTRY_SIZE = 16
+argumentation_system_registry = LRUCache(ARGUMENTATION_SYSTEM_REGISTRY_SIZE)
+
 
 def get_path(file_name: str) -> pathlib.Path:
     return pathlib.Path(dataset_folder_path / str(file_name + '.json'))
 
 
+def get_binary_path(file_name: str) -> pathlib.Path:
+    return pathlib.Path(dataset_folder_path / str(file_name + '.bin'))
+
+
 def write_argumentation_system(argumentation_system: ArgumentationSystem, argumentation_system_name: str):
     argumentation_system_path = get_path(argumentation_system_name)
     folder_path = argumentation_system_path.parent
@@ -20,6 +30,16 @@ def write_argumentation_system(argumentation_system: ArgumentationSystem, argume
 
 
 def get_argumentation_system_from_name(argumentation_system_name: str) -> ArgumentationSystem:
-    argumentation_system_path = get_path(argumentation_system_name)
-    argumentation_system = ArgumentationSystemJsonReader().read_from_json(str(argumentation_system_path))
+    """
+    Obtain the ArgumentationSystem with this name. The file is only read the first time; afterwards the same
+    ArgumentationSystem is taken from the argumentation_system_registry.
+
+    :param argumentation_system_name: Name of the ArgumentationSystem.
+    :return: The ArgumentationSystem.
+    """
+    argumentation_system = argumentation_system_registry.get(argumentation_system_name)
+    if argumentation_system is None:
+        argumentation_system_path = get_path(argumentation_system_name)
+        argumentation_system = ArgumentationSystemJsonReader().read_from_json(str(argumentation_system_path))
+        argumentation_system_registry[argumentation_system_name] = argumentation_system
     return argumentation_system
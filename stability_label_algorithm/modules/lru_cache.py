@@ -0,0 +1,128 @@
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Generic, Hashable, Optional, TypeVar
+
+V = TypeVar('V')
+
+
+class LRUCache(Generic[V]):
+    """
+    A dict-like cache that holds at most maxsize items. When it is full, the least recently used item is dropped.
+    Each operation is atomic, so a cache can be shared by multiple threads (such as the caches of a
+    CompiledArgumentationSystem that is shared by concurrent ArgumentationSessions).
+
+    >>> cache = LRUCache(2)
+    >>> cache['a'] = 1
+    >>> cache['b'] = 2
+    >>> cache.get('a')
+    1
+    >>> cache['c'] = 3
+    >>> 'b' in cache, 'a' in cache, len(cache)
+    (False, True, 2)
+    >>> cache.remove_keys(lambda key: key == 'a')
+    >>> 'a' in cache, len(cache)
+    (False, 1)
+    """
+
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self._items: 'OrderedDict[Hashable, V]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Optional[V] = None) -> Optional[V]:
+        """
+        Obtain the item for this key (and mark it as most recently used), or default if it is not in the cache.
+        """
+        with self._lock:
+            if key not in self._items:
+                return default
+            self._items.move_to_end(key)
+            return self._items[key]
+
+    def __setitem__(self, key: Hashable, value: V) -> None:
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def remove_keys(self, predicate: Callable[[Hashable], bool]) -> None:
+        """
+        Remove the items whose key satisfies the predicate, for example all items of an ArgumentationSystem that is
+        no longer used.
+        """
+        with self._lock:
+            for key in [key for key in self._items if predicate(key)]:
+                self._remove(key)
+
+    def _remove(self, key: Hashable) -> None:
+        self._items.pop(key, None)
+
+    def __getstate__(self) -> dict:
+        # Locks cannot be pickled (e.g. when an ArgumentationSystem is sent to worker processes), so the unpickled
+        # cache gets a new one.
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._items
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+
+class SizedLRUCache(LRUCache[V]):
+    """
+    An LRUCache that is bounded by the total size of its items instead of their number: the size of each item is
+    estimated by size_of when it is added, and least recently used items are dropped while the total exceeds maxbytes.
+    Items that are larger than maxbytes by themselves are not stored.
+
+    >>> cache = SizedLRUCache(10, len)
+    >>> cache['a'] = 'xxxx'
+    >>> cache['b'] = 'yyyy'
+    >>> cache['c'] = 'zzzz'
+    >>> 'a' in cache, len(cache), cache.total_size
+    (False, 2, 8)
+    >>> cache['d'] = 'too large for the cache'
+    >>> 'd' in cache
+    False
+    """
+
+    def __init__(self, maxbytes: int, size_of: Callable[[V], int]):
+        super().__init__()
+        self.maxbytes = maxbytes
+        self.size_of = size_of
+        self.total_size = 0
+        self._sizes: Dict[Hashable, int] = {}
+
+    def __setitem__(self, key: Hashable, value: V) -> None:
+        size = self.size_of(value)
+        with self._lock:
+            self._remove(key)
+            if size > self.maxbytes:
+                return
+            self._items[key] = value
+            self._sizes[key] = size
+            self.total_size += size
+            while self.total_size > self.maxbytes:
+                self._remove(next(iter(self._items)))
+
+    def _remove(self, key: Hashable) -> None:
+        if key in self._items:
+            del self._items[key]
+            self.total_size -= self._sizes.pop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self._sizes.clear()
+            self.total_size = 0
@@ -1,20 +1,16 @@
 # -*- coding: utf-8 -*-
 import dash
 import pathlib
-from os import listdir
 from dash.dependencies import Input, Output, State
 from dash import dcc
 from dash import html
 import dash_daq as daq
 
-from stability_label_algorithm.modules.argumentation.argumentation_theory.argumentation_system import \
-    ArgumentationSystem
-from stability_label_algorithm.modules.argumentation.importers.argumentation_system_xlsx_reader import \
-    ArgumentationSystemXLSXReader
 from stability_label_algorithm.modules.argumentation.argumentation_theory.argumentation_theory import \
     ArgumentationTheory
 from stability_label_algorithm.modules.visualisation_interface.html_divs.structured_column_div import \
-    get_structured_column_div
+    forget_rule_set, get_structured_column_div
+from stability_label_algorithm.modules.visualisation_interface.rule_set_registry import RuleSetRegistry
 
 visualisation_screen = dash.Dash(__name__)
 
@@ -28,8 +24,8 @@ visualisation_screen.layout = html.Div([
 ])
 
 argumentation_system_options_path = pathlib.Path(__file__).parent.parent.parent / 'resources' / 'rule_sets'
-argumentation_system_options_str = [f for f in listdir(argumentation_system_options_path) if f.endswith('.xlsx')]
-argumentation_system_options_str.sort()
+# Only the About texts are read here; each ArgumentationSystem is loaded when its page is first requested.
+rule_set_registry = RuleSetRegistry(argumentation_system_options_path, on_load=forget_rule_set)
 
 visualisation_screen.title = 'Structured argumentation visualisation'
 
@@ -65,38 +61,28 @@ index_elements = [
     ], style={'margin': 'auto', 'width': '70%', 'padding': '10px'}),
     html.Br([])
 ]
-argumentation_systems = {}
-about_texts = {}
-for file_str in argumentation_system_options_str:
-    try:
-        label = file_str[:-5]
-        asr = ArgumentationSystemXLSXReader(
-            pathlib.Path(__file__).parent.parent.parent / 'resources' / 'rule_sets' / file_str)
-        argumentation_systems[label] = ArgumentationSystem(asr.language, asr.rules, asr.topic_literals)
-        about_texts[label] = asr.about_text
-
-        index_as = []
-        show_name = label.replace('_', ' ')
-        if show_name.startswith('0'):
-            show_name = show_name[3:]
-
-        index_as.append(html.H2(show_name, style={
-            'font-family': '"Merriweather","Bembo",Georgia,Times,"Times New Roman",serif',
-            'font-size': '25px', 'line-height': '30px'}))
-        index_as.append(html.P([about_texts[label],
-                                html.Br(),
-                                html.Br(),
-                                dcc.Link('Go to \"' + show_name + '\"', href='/' + label, style={'color': 'black'})],
-                               style={
-                                   'font-family': '"Merriweather","Bembo",Georgia,Times,"Times New Roman",serif',
-                                   'font-size': '18px', 'line-height': '25px'})
-                        )
-        index_elements.append(html.Div(index_as, style={'margin': 'auto', 'width': '70%',
-                                                        'background-color': 'rgb(239,239,239)',
-                                                        'padding': '10px'}))
-        index_elements.append(html.Br())
-    except ImportError:
-        print('This argumentation system could not be loaded: ' + file_str)
+about_texts = rule_set_registry.about_texts
+for label in rule_set_registry.labels:
+    index_as = []
+    show_name = label.replace('_', ' ')
+    if show_name.startswith('0'):
+        show_name = show_name[3:]
+
+    index_as.append(html.H2(show_name, style={
+        'font-family': '"Merriweather","Bembo",Georgia,Times,"Times New Roman",serif',
+        'font-size': '25px', 'line-height': '30px'}))
+    index_as.append(html.P([about_texts[label],
+                            html.Br(),
+                            html.Br(),
+                            dcc.Link('Go to \"' + show_name + '\"', href='/' + label, style={'color': 'black'})],
+                           style={
+                               'font-family': '"Merriweather","Bembo",Georgia,Times,"Times New Roman",serif',
+                               'font-size': '18px', 'line-height': '25px'})
+                    )
+    index_elements.append(html.Div(index_as, style={'margin': 'auto', 'width': '70%',
+                                                    'background-color': 'rgb(239,239,239)',
+                                                    'padding': '10px'}))
+    index_elements.append(html.Br())
 
 index_page = html.Div(index_elements, style={'width': '100%'})
 
@@ -233,13 +219,29 @@ def get_page_layout(argumentation_system, about_text):
     return main_div
 
 
+def get_argumentation_system(path_name):
+    """
+    Obtain the ArgumentationSystem of the rule set of a page, or None if there is no such rule set or it could not be
+    loaded.
+    """
+    if not path_name or path_name[1:] not in rule_set_registry:
+        return None
+    try:
+        return rule_set_registry.get(path_name[1:])
+    except ImportError:
+        return None
+
+
 @visualisation_screen.callback(Output('page-content', 'children'),
                                [Input('url', 'pathname')])
 def display_page(path_name):
     if path_name == '/':
         return index_page
-    if path_name and len(path_name) > 1 and path_name[1:] in argumentation_systems.keys():
-        return get_page_layout(argumentation_systems[path_name[1:]], about_texts[path_name[1:]])
+    if path_name and len(path_name) > 1 and path_name[1:] in rule_set_registry:
+        argumentation_system = get_argumentation_system(path_name)
+        if argumentation_system is None:
+            return html.H3('This argumentation system could not be loaded.')
+        return get_page_layout(argumentation_system, about_texts[path_name[1:]])
     return html.H3('404')
 
 
@@ -248,7 +250,9 @@ def display_page(path_name):
 def update_observation_options(path_name, current_value):
     if path_name == '/':
         return []
-    argumentation_system = argumentation_systems[path_name[1:]]
+    argumentation_system = get_argumentation_system(path_name)
+    if argumentation_system is None:
+        return []
     current_literals = [argumentation_system.language[literal_str] for literal_str in current_value]
     new_options = [
         {'label': str(literal), 'value': str(literal)}
@@ -285,14 +289,16 @@ def update_figure(path_name, knowledge_base_str, topic_literal_str, click_data,
     if path_name == '/':
         return None, '', '', []
 
-    argumentation_system = argumentation_systems[path_name[1:]]
+    argumentation_system = get_argumentation_system(path_name)
+    if argumentation_system is None:
+        return {'data': [], 'layout': {}}
 
     knowledge_base = argumentation_system.get_queryables(knowledge_base_str)
     argumentation_theory = ArgumentationTheory(argumentation_system, knowledge_base)
 
     topic_literal = argumentation_system.language[topic_literal_str]
 
-    figure = get_structured_column_div(argumentation_theory, topic_literal, labeler_value)
+    figure = get_structured_column_div(argumentation_theory, topic_literal, labeler_value, path_name[1:])
 
     return figure
 
@@ -0,0 +1,75 @@
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from ...argumentation.labelers.array_labels import LabelingView
+
+
+class GraphLayout:
+    """
+    The geometry of an argumentation graph (see create_multi_node_graph and create_single_node_graph): the positions of
+    its Literal and Rule vertices, its visible edges and the arrows on its support edges. As the graph only depends on
+    the ArgumentationSystem and the topic, not on the knowledge base, a GraphLayout can be computed once and then be
+    coloured for each knowledge base from the label codes of its Literals and Rules.
+    """
+    def __init__(self, graph):
+        literal_vertices = [vertex for vertex in graph.vs if vertex['type'] == 'literal_instance']
+        rule_vertices = [vertex for vertex in graph.vs if vertex['type'] == 'rule_instance']
+
+        self.literals = [vertex['literal'] for vertex in literal_vertices]
+        self.literal_texts = [str(literal) for literal in self.literals]
+        self.literal_x = np.array([vertex['pos'][0] for vertex in literal_vertices], dtype=float)
+        self.literal_y = np.array([vertex['pos'][1] for vertex in literal_vertices], dtype=float)
+
+        self.rules = [vertex['rule'] for vertex in rule_vertices]
+        self.rule_texts = [str(rule) for rule in self.rules]
+        self.rule_x = np.array([vertex['pos'][0] for vertex in rule_vertices], dtype=float)
+        self.rule_y = np.array([vertex['pos'][1] for vertex in rule_vertices], dtype=float)
+
+        # Visible edges by colour, as x and y coordinates of line segments separated by None.
+        self.edge_segments: Dict[str, Tuple[List, List]] = {}
+        self.arrows: List[dict] = []
+        for edge in graph.es:
+            if not edge['visible']:
+                continue
+            x0, y0 = graph.vs[edge.source]['pos']
+            x1, y1 = graph.vs[edge.target]['pos']
+            edge_x, edge_y = self.edge_segments.setdefault(edge['color'], ([], []))
+            edge_x.extend([x0, x1, None])
+            edge_y.extend([y0, y1, None])
+            if edge['color'] != 'red':
+                self.arrows.append(self._get_arrow(x0, y0, x1, y1))
+
+    @staticmethod
+    def _get_arrow(x0: float, y0: float, x1: float, y1: float) -> dict:
+        start_f = 0.45
+        end_f = 1 - start_f
+        return {
+            'ax': x0 + end_f * (x1 - x0),
+            'ay': y0 + end_f * (y1 - y0),
+            'x': x0 + start_f * (x1 - x0),
+            'y': y0 + start_f * (y1 - y0),
+            'axref': 'x',
+            'ayref': 'y',
+            'xref': 'x',
+            'yref': 'y',
+            'showarrow': True,
+            'arrowsize': 2,
+            'arrowwidth': 1
+        }
+
+    @staticmethod
+    def get_label_codes(labeling, keys: list) -> np.ndarray:
+        """
+        Obtain the 4-bit codes (see StabilityLabel.code) of the labels of some Literals or Rules.
+
+        :param labeling: Literal or Rule labeling of a Labels object.
+        :param keys: The Literals or Rules, for example GraphLayout.literals.
+        :return: Array with the code of the label of each key, or zeros if the labeling is empty.
+        """
+        if len(labeling) == 0:
+            return np.zeros(len(keys), dtype=np.uint8)
+        if isinstance(labeling, LabelingView):
+            # The labeling of ArrayLabels: read the codes directly from its array.
+            return labeling.codes[np.array([labeling.ids[key] for key in keys], dtype=np.intp)]
+        return np.fromiter((labeling[key].code for key in keys), dtype=np.uint8, count=len(keys))
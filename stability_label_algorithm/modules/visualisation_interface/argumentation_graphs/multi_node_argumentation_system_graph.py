@@ -1,9 +1,9 @@
 import igraph
 
 
-def create_multi_node_graph(argumentation_theory, topic_literal):
-    node_counters = {literal_str: 0 for literal_str in argumentation_theory.argumentation_system.language.keys()}
-    rule_counters = {str(rule): 0 for rule in argumentation_theory.argumentation_system.rules}
+def create_multi_node_graph(argumentation_system, topic_literal):
+    node_counters = {literal_str: 0 for literal_str in argumentation_system.language.keys()}
+    rule_counters = {str(rule): 0 for rule in argumentation_system.rules}
 
     graph = igraph.Graph()
 
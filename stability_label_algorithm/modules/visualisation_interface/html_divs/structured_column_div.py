@@ -1,250 +1,158 @@
+import json
+from typing import List, Tuple
+
+import numpy as np
 import plotly.graph_objs as go
+import plotly.utils
 
+from ..argumentation_graphs.graph_layout import GraphLayout
 from ..argumentation_graphs.multi_node_argumentation_system_graph import create_multi_node_graph
 from ..argumentation_graphs.read_single_node_argumentation_system_graph import create_single_node_graph
+from ...argumentation.argumentation_theory.argumentation_system_slicer import slice_for_topics
+from ...argumentation.argumentation_theory.argumentation_theory import ArgumentationTheory
 from ...argumentation.labelers.four_bool_labeler import FourBoolLabeler
 from ...argumentation.labelers.acceptability_labeler import JustificationLabeler
 from ...argumentation.labelers.fqas_labeler import FQASLabeler
-from ...argumentation.labelers.labels import StabilityLabel
+from ...argumentation.labelers.labels import Labels
+from ...argumentation.labelers.stability_label import UNSATISFIABLE_BIT, DEFENDED_BIT, OUT_BIT, BLOCKED_BIT
+from ...lru_cache import LRUCache, SizedLRUCache
 
+# Labels and figures are cached on (rule set label, knowledge base bitmask, labeler, topic), so repeated views of the
+# same configuration are not recomputed. The cache is bounded by the estimated size of its entries.
+FIGURE_CACHE_MAXBYTES = 64 * 1024 * 1024
 
-def get_structured_column_div(argumentation_theory, topic_literal, labeler_str):
-    if topic_literal.position is None:
-        argumentation_theory_graph = create_multi_node_graph(argumentation_theory, topic_literal)
-    else:
-        argumentation_theory_graph = create_single_node_graph(argumentation_theory)
-
-    trace_recode = []
-
-    for edge in list(argumentation_theory_graph.es):
-        if edge['visible']:
-            x0, y0 = argumentation_theory_graph.vs[edge.source]['pos']
-            x1, y1 = argumentation_theory_graph.vs[edge.target]['pos']
-            edge_trace = go.Scatter(x=tuple([x0, x1, None]), y=tuple([y0, y1, None]),
-                                    mode='lines',
-                                    line_shape='spline',
-                                    line_color=edge['color'],
-                                    opacity=1)
-            trace_recode.append(edge_trace)
-
-    relevant_literal_trace = go.Scatter(x=[], y=[], hovertext=[], text=[], mode='markers+text',
-                                        textposition='top center',
-                                        hoverinfo='text',
-                                        marker={'size': 50, 'color': 'SkyBlue'})
-    observed_literal_trace = go.Scatter(x=[], y=[], hovertext=[], text=[], mode='markers+text',
-                                     textposition='top center',
-                                     hoverinfo='text',
-                                     marker={'size': 50, 'color': 'darkblue'})
-    other_literal_trace = go.Scatter(x=[], y=[], hovertext=[], text=[], mode='markers+text', textposition='top center',
-                               hoverinfo='text',
-                               marker={'size': 50, 'color': 'lightgrey'})
-
-    # Label using the selected Labels
+
+def _size_of_figure_cache_entry(entry: Tuple[Labels, dict]) -> int:
+    labels, figure = entry
+    return len(json.dumps(figure, cls=plotly.utils.PlotlyJSONEncoder)) + \
+        64 * (len(labels.literal_labeling) + len(labels.rule_labeling))
+
+
+figure_cache = SizedLRUCache(FIGURE_CACHE_MAXBYTES, _size_of_figure_cache_entry)
+
+# The graph layout only depends on the ArgumentationSystem and topic, so it is cached separately for all knowledge
+# bases (see get_graph_layout).
+GRAPH_LAYOUT_CACHE_SIZE = 32
+graph_layout_cache = LRUCache(GRAPH_LAYOUT_CACHE_SIZE)
+
+
+def forget_rule_set(rule_set_label: str) -> None:
+    """
+    Remove the cached figures and graph layouts of a rule set, for example when its ArgumentationSystem is reloaded
+    (see RuleSetRegistry), so the caches do not keep earlier ArgumentationSystems alive.
+
+    :param rule_set_label: Label of the rule set.
+    """
+    figure_cache.remove_keys(lambda cache_key: cache_key[0] == rule_set_label)
+    graph_layout_cache.remove_keys(lambda cache_key: cache_key[0] == rule_set_label)
+
+
+# Marker size and colour that show each of the four booleans of a label; the markers are drawn on top of each other.
+LABEL_BIT_MARKERS = [(UNSATISFIABLE_BIT, 40, 'black'), (DEFENDED_BIT, 30, 'green'), (OUT_BIT, 20, 'red'),
+                     (BLOCKED_BIT, 10, 'yellow')]
+
+
+def get_structured_column_div(argumentation_theory, topic_literal, labeler_str, rule_set_label: str):
+    cache_key = (rule_set_label, argumentation_theory.knowledge_base_bitmask, labeler_str, str(topic_literal))
+    entry = figure_cache.get(cache_key)
+    if entry is None:
+        labels = _get_labels(argumentation_theory, topic_literal, labeler_str)
+        entry = (labels, _create_figure(argumentation_theory, topic_literal, labels, rule_set_label))
+        figure_cache[cache_key] = entry
+    return entry[1]
+
+
+def _get_labels(argumentation_theory, topic_literal, labeler_str) -> Labels:
     if labeler_str == 'four_bool':
         labeler = FourBoolLabeler()
     elif labeler_str == 'fqas':
         labeler = FQASLabeler()
     else:
         labeler = JustificationLabeler()
-    labels = labeler.label(argumentation_theory)
-
-    unsatisfiable_literal_true_trace = go.Scatter(x=[], y=[],
-                                                  hovertext=[], text=[],
-                                                  hoverinfo='text',
-                                                  mode='markers',
-                                                  marker={'size': 40, 'color': 'black'})
-    defended_literal_true_trace = go.Scatter(x=[], y=[], hovertext=[], text=[], mode='markers',
-                                             hoverinfo='text',
-                                             marker={'size': 30, 'color': 'green'})
-    out_literal_true_trace = go.Scatter(x=[], y=[], hovertext=[], text=[], mode='markers',
-                                        hoverinfo='text',
-                                        marker={'size': 20, 'color': 'red'})
-    blocked_literal_true_trace = go.Scatter(x=[], y=[], hovertext=[], text=[], mode='markers',
-                                            hoverinfo='text',
-                                            marker={'size': 10, 'color': 'yellow'})
-    unsatisfiable_literal_false_trace = go.Scatter(x=[], y=[], hovertext=[], text=[], mode='markers',
-                                                   hoverinfo='text',
-                                                   marker={'size': 40, 'color': 'lightgrey'})
-    defended_literal_false_trace = go.Scatter(x=[], y=[], hovertext=[], text=[], mode='markers',
-                                              hoverinfo='text',
-                                              marker={'size': 30, 'color': 'lightgrey'})
-    out_literal_false_trace = go.Scatter(x=[], y=[], hovertext=[], text=[], mode='markers',
-                                         hoverinfo='text',
-                                         marker={'size': 20, 'color': 'lightgrey'})
-    blocked_literal_false_trace = go.Scatter(x=[], y=[], hovertext=[], text=[], mode='markers',
-                                             hoverinfo='text',
-                                             marker={'size': 10, 'color': 'lightgrey'})
-
-    unsatisfiable_rule_true_trace = go.Scatter(x=[], y=[], hovertext=[], text=[], mode='markers',
-                                               hoverinfo='text',
-                                               marker={'size': 40, 'color': 'black', 'symbol': 'diamond'})
-    defended_rule_true_trace = go.Scatter(x=[], y=[], hovertext=[], text=[], mode='markers',
-                                          hoverinfo='text',
-                                          marker={'size': 30, 'color': 'green', 'symbol': 'diamond'})
-    out_rule_true_trace = go.Scatter(x=[], y=[], hovertext=[], text=[], mode='markers',
-                                     hoverinfo='text',
-                                     marker={'size': 20, 'color': 'red', 'symbol': 'diamond'})
-    blocked_rule_true_trace = go.Scatter(x=[], y=[], hovertext=[], text=[], mode='markers',
-                                         hoverinfo='text',
-                                         marker={'size': 10, 'color': 'yellow', 'symbol': 'diamond'})
-    unsatisfiable_rule_false_trace = go.Scatter(x=[], y=[], hovertext=[], text=[], mode='markers',
-                                                hoverinfo='text',
-                                                marker={'size': 40, 'color': 'lightgrey', 'symbol': 'diamond'})
-    defended_rule_false_trace = go.Scatter(x=[], y=[], hovertext=[], text=[], mode='markers',
-                                           hoverinfo='text',
-                                           marker={'size': 30, 'color': 'lightgrey', 'symbol': 'diamond'})
-    out_rule_false_trace = go.Scatter(x=[], y=[], hovertext=[], text=[], mode='markers',
-                                      hoverinfo='text',
-                                      marker={'size': 20, 'color': 'lightgrey', 'symbol': 'diamond'})
-    blocked_rule_false_trace = go.Scatter(x=[], y=[], hovertext=[], text=[], mode='markers',
-                                          hoverinfo='text',
-                                          marker={'size': 10, 'color': 'lightgrey', 'symbol': 'diamond'})
-
-    for vertex in list(argumentation_theory_graph.vs):
-        if vertex['name'] != 'ROOT':
-            x, y = vertex['pos']
-            if vertex['type'] == 'rule_instance':
-                if len(labels.rule_labeling) > 0:
-                    rule_label = labels.rule_labeling[vertex['rule']]
-                else:
-                    rule_label = StabilityLabel(False, False, False, False)
-
-                if rule_label.unsatisfiable:
-                    unsatisfiable_rule_true_trace['x'] += (x,)
-                    unsatisfiable_rule_true_trace['y'] += (y,)
-                    unsatisfiable_rule_true_trace['hovertext'] += (str(vertex['rule']),)
-                else:
-                    unsatisfiable_rule_false_trace['x'] += (x,)
-                    unsatisfiable_rule_false_trace['y'] += (y,)
-                    unsatisfiable_rule_false_trace['hovertext'] += (str(vertex['rule']),)
-                if rule_label.defended:
-                    defended_rule_true_trace['x'] += (x,)
-                    defended_rule_true_trace['y'] += (y,)
-                    defended_rule_true_trace['hovertext'] += (str(vertex['rule']),)
-                else:
-                    defended_rule_false_trace['x'] += (x,)
-                    defended_rule_false_trace['y'] += (y,)
-                    defended_rule_false_trace['hovertext'] += (str(vertex['rule']),)
-                if rule_label.out:
-                    out_rule_true_trace['x'] += (x,)
-                    out_rule_true_trace['y'] += (y,)
-                    out_rule_true_trace['hovertext'] += (str(vertex['rule']),)
-                else:
-                    out_rule_false_trace['x'] += (x,)
-                    out_rule_false_trace['y'] += (y,)
-                    out_rule_false_trace['hovertext'] += (str(vertex['rule']),)
-                if rule_label.blocked:
-                    blocked_rule_true_trace['x'] += (x,)
-                    blocked_rule_true_trace['y'] += (y,)
-                    blocked_rule_true_trace['hovertext'] += (str(vertex['rule']),)
-                else:
-                    blocked_rule_false_trace['x'] += (x,)
-                    blocked_rule_false_trace['y'] += (y,)
-                    blocked_rule_false_trace['hovertext'] += (str(vertex['rule']),)
-            else:
-                if vertex['literal'] in argumentation_theory.knowledge_base:
-                    trace = observed_literal_trace
-                else:
-                    trace = other_literal_trace
-                trace['text'] += (vertex['literal'],)
-                trace['x'] += tuple([x])
-                trace['y'] += tuple([y])
-
-                literal_label = labels.literal_labeling[vertex['literal']]
-
-                if literal_label.unsatisfiable:
-                    unsatisfiable_literal_true_trace['x'] += (x,)
-                    unsatisfiable_literal_true_trace['y'] += (y,)
-                    unsatisfiable_literal_true_trace['hovertext'] += (vertex['literal'],)
-                else:
-                    unsatisfiable_literal_false_trace['x'] += (x,)
-                    unsatisfiable_literal_false_trace['y'] += (y,)
-                    unsatisfiable_literal_false_trace['hovertext'] += (vertex['literal'],)
-                if literal_label.defended:
-                    defended_literal_true_trace['x'] += (x,)
-                    defended_literal_true_trace['y'] += (y,)
-                    defended_literal_true_trace['hovertext'] += (vertex['literal'],)
-                else:
-                    defended_literal_false_trace['x'] += (x,)
-                    defended_literal_false_trace['y'] += (y,)
-                    defended_literal_false_trace['hovertext'] += (vertex['literal'],)
-                if literal_label.out:
-                    out_literal_true_trace['x'] += (x,)
-                    out_literal_true_trace['y'] += (y,)
-                    out_literal_true_trace['hovertext'] += (vertex['literal'],)
-                else:
-                    out_literal_false_trace['x'] += (x,)
-                    out_literal_false_trace['y'] += (y,)
-                    out_literal_false_trace['hovertext'] += (vertex['literal'],)
-                if literal_label.blocked:
-                    blocked_literal_true_trace['x'] += (x,)
-                    blocked_literal_true_trace['y'] += (y,)
-                    blocked_literal_true_trace['hovertext'] += (vertex['literal'],)
-                else:
-                    blocked_literal_false_trace['x'] += (x,)
-                    blocked_literal_false_trace['y'] += (y,)
-                    blocked_literal_false_trace['hovertext'] += (vertex['literal'],)
-
-    trace_recode.append(unsatisfiable_rule_true_trace)
-    trace_recode.append(unsatisfiable_rule_false_trace)
-    trace_recode.append(defended_rule_true_trace)
-    trace_recode.append(defended_rule_false_trace)
-    trace_recode.append(out_rule_true_trace)
-    trace_recode.append(out_rule_false_trace)
-    trace_recode.append(blocked_rule_true_trace)
-    trace_recode.append(blocked_rule_false_trace)
-
-    trace_recode.append(observed_literal_trace)
-    trace_recode.append(relevant_literal_trace)
-    trace_recode.append(other_literal_trace)
-    trace_recode.append(unsatisfiable_literal_true_trace)
-    trace_recode.append(unsatisfiable_literal_false_trace)
-    trace_recode.append(defended_literal_true_trace)
-    trace_recode.append(defended_literal_false_trace)
-    trace_recode.append(out_literal_true_trace)
-    trace_recode.append(out_literal_false_trace)
-    trace_recode.append(blocked_literal_true_trace)
-    trace_recode.append(blocked_literal_false_trace)
-
-    edge_annotation_list = []
-    for edge in list(argumentation_theory_graph.es):
-        if edge['visible'] and edge['color'] != 'red':
-            x0, y0 = argumentation_theory_graph.vs[edge.source]['pos']
-            x1, y1 = argumentation_theory_graph.vs[edge.target]['pos']
-
-            start_f = 0.45
-            end_f = 1 - start_f
-
-            x_start = x0 + start_f * (x1 - x0)
-            x_end = x0 + end_f * (x1 - x0)
-            y_start = y0 + start_f * (y1 - y0)
-            y_end = y0 + end_f * (y1 - y0)
-
-            edge_annotation_list.append({
-                'ax': x_end,
-                'ay': y_end,
-                'x': x_start,
-                'y': y_start,
-                'axref': 'x',
-                'ayref': 'y',
-                'xref': 'x',
-                'yref': 'y',
-                'showarrow': True,
-                'arrowsize': 2,
-                'arrowwidth': 1
-            })
-
-    figure = {
-        "data": trace_recode,
-        "layout": go.Layout(
-            showlegend=False,
-            hovermode='closest',
-            margin={'b': 10, 'l': 10, 'r': 10, 't': 10},
-            xaxis={'showgrid': False, 'zeroline': False, 'showticklabels': False},
-            yaxis={'showgrid': False, 'zeroline': False, 'showticklabels': False},
-            height=600,
-            annotations=edge_annotation_list
-        )
-    }
-
-    return figure
+    if topic_literal.position is None:
+        # The multi node graph only contains Literals and Rules that are relevant for the topic, so label only those.
+        sliced_argumentation_system = slice_for_topics(argumentation_theory.argumentation_system, [topic_literal])
+        sliced_knowledge_base = [queryable for queryable in argumentation_theory.knowledge_base
+                                 if str(queryable) in sliced_argumentation_system.language]
+        return labeler.label(ArgumentationTheory(sliced_argumentation_system, sliced_knowledge_base))
+    return labeler.label(argumentation_theory)
+
+
+def get_graph_layout(argumentation_system, topic_literal, rule_set_label: str) -> \
+        Tuple[GraphLayout, list, go.Layout]:
+    """
+    Obtain the GraphLayout of an ArgumentationSystem and topic, together with the traces of its edges and the figure
+    layout (with the edge arrows), which do not depend on the knowledge base either. These are computed once and then
+    taken from the graph layout cache.
+
+    :param argumentation_system: The ArgumentationSystem that is shown.
+    :param topic_literal: The topic; if it has no position, a multi node graph of the topic is shown.
+    :param rule_set_label: Label of the rule set of the ArgumentationSystem, on which the layout is cached.
+    :return: The GraphLayout, the edge traces and the figure layout.
+    """
+    # The single node graph shows the whole ArgumentationSystem, so its layout does not depend on the topic.
+    cache_key = (rule_set_label, str(topic_literal) if topic_literal.position is None else None)
+    entry = graph_layout_cache.get(cache_key)
+    if entry is not None:
+        return entry
+
+    if topic_literal.position is None:
+        graph_layout = GraphLayout(create_multi_node_graph(argumentation_system, topic_literal))
+    else:
+        graph_layout = GraphLayout(create_single_node_graph(argumentation_system))
+    edge_traces = [go.Scatter(x=edge_x, y=edge_y, mode='lines', line_shape='spline', line_color=color, opacity=1)
+                   for color, (edge_x, edge_y) in graph_layout.edge_segments.items()]
+    figure_layout = go.Layout(
+        showlegend=False,
+        hovermode='closest',
+        margin={'b': 10, 'l': 10, 'r': 10, 't': 10},
+        xaxis={'showgrid': False, 'zeroline': False, 'showticklabels': False},
+        yaxis={'showgrid': False, 'zeroline': False, 'showticklabels': False},
+        height=600,
+        annotations=graph_layout.arrows
+    )
+    entry = (graph_layout, edge_traces, figure_layout)
+    graph_layout_cache[cache_key] = entry
+    return entry
+
+
+def _get_marker_traces(x, y, texts: List[str], codes, symbol: str) -> list:
+    """
+    For each of the four booleans of the labels, a trace of the vertices for which it is True (in the colour of the
+    boolean) and a trace of the vertices for which it is False (in light grey).
+    """
+    traces = []
+    for bit, size, color in LABEL_BIT_MARKERS:
+        is_true = (codes & bit) != 0
+        for mask, marker_color in ((is_true, color), (~is_true, 'lightgrey')):
+            traces.append(go.Scatter(x=x[mask], y=y[mask], hovertext=[text for text, m in zip(texts, mask) if m],
+                                     mode='markers', hoverinfo='text',
+                                     marker={'size': size, 'color': marker_color, 'symbol': symbol}))
+    return traces
+
+
+def _create_figure(argumentation_theory, topic_literal, labels: Labels, rule_set_label: str) -> dict:
+    graph_layout, edge_traces, figure_layout = get_graph_layout(argumentation_theory.argumentation_system,
+                                                                topic_literal, rule_set_label)
+
+    # Only the colouring depends on the knowledge base: which Literals are observed and what their labels are.
+    literal_codes = GraphLayout.get_label_codes(labels.literal_labeling, graph_layout.literals)
+    rule_codes = GraphLayout.get_label_codes(labels.rule_labeling, graph_layout.rules)
+    is_observed = np.array([literal in argumentation_theory.knowledge_base_set for literal in graph_layout.literals],
+                           dtype=bool)
+
+    def literal_name_trace(mask, color):
+        return go.Scatter(x=graph_layout.literal_x[mask], y=graph_layout.literal_y[mask],
+                          hovertext=[], text=[text for text, m in zip(graph_layout.literal_texts, mask) if m],
+                          mode='markers+text', textposition='top center', hoverinfo='text',
+                          marker={'size': 50, 'color': color})
+
+    no_literals = np.zeros(len(graph_layout.literals), dtype=bool)
+    traces = edge_traces + \
+        _get_marker_traces(graph_layout.rule_x, graph_layout.rule_y, graph_layout.rule_texts, rule_codes, 'diamond') + \
+        [literal_name_trace(is_observed, 'darkblue'), literal_name_trace(no_literals, 'SkyBlue'),
+         literal_name_trace(~is_observed, 'lightgrey')] + \
+        _get_marker_traces(graph_layout.literal_x, graph_layout.literal_y, graph_layout.literal_texts, literal_codes,
+                           'circle')
+
+    return {"data": traces, "layout": figure_layout}
@@ -0,0 +1,68 @@
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Union
+
+from ..argumentation.argumentation_theory.argumentation_system import ArgumentationSystem
+from ..argumentation.importers.argumentation_system_xlsx_reader import ArgumentationSystemXLSXReader
+from ..lru_cache import LRUCache
+
+
+class RuleSetRegistry:
+    """
+    The rule sets (XLSX files) in a folder, by label (the file name without extension). On construction, only their
+    About texts are read. An ArgumentationSystem is loaded the first time it is requested and kept in an LRU cache of
+    at most maxsize ArgumentationSystems, so memory use depends on the rule sets that are actually in use. The registry
+    can be shared by multiple threads. If on_load is given, it is called with the label of a rule set whenever its
+    ArgumentationSystem is (re)loaded, so that caches can drop what they computed for an earlier ArgumentationSystem
+    of that rule set.
+    """
+    DEFAULT_MAXSIZE = 8
+
+    def __init__(self, folder: Union[Path, str], maxsize: int = DEFAULT_MAXSIZE,
+                 on_load: Optional[Callable[[str], None]] = None):
+        self.folder = Path(folder)
+        self.on_load = on_load
+        self.about_texts: Dict[str, str] = {}
+        for path in sorted(self.folder.glob('*.xlsx')):
+            try:
+                self.about_texts[path.stem] = ArgumentationSystemXLSXReader.read_about_text(path)
+            except ImportError:
+                print('This argumentation system could not be loaded: ' + path.name)
+
+        self._argumentation_systems = LRUCache(maxsize)
+        self._lock = threading.Lock()
+
+    @property
+    def labels(self) -> List[str]:
+        return list(self.about_texts.keys())
+
+    def __contains__(self, label: str) -> bool:
+        return label in self.about_texts
+
+    def get(self, label: str) -> ArgumentationSystem:
+        """
+        Obtain the ArgumentationSystem of a rule set, loading it (see ArgumentationSystemXLSXReader) if it is not in
+        the cache.
+
+        :param label: Label of the rule set.
+        :return: The ArgumentationSystem of the rule set.
+        """
+        if label not in self.about_texts:
+            raise KeyError(label)
+        with self._lock:
+            argumentation_system = self._argumentation_systems.get(label)
+        if argumentation_system is not None:
+            return argumentation_system
+
+        # Load without holding the lock, so that requests for other rule sets are not blocked.
+        asr = ArgumentationSystemXLSXReader.from_snapshot_or_xlsx(self.folder / (label + '.xlsx'))
+        argumentation_system = ArgumentationSystem(asr.language, asr.rules, asr.topic_literals)
+        with self._lock:
+            # If another thread loaded the rule set meanwhile, all threads use the same ArgumentationSystem.
+            cached_argumentation_system = self._argumentation_systems.get(label)
+            if cached_argumentation_system is not None:
+                return cached_argumentation_system
+            self._argumentation_systems[label] = argumentation_system
+            if self.on_load is not None:
+                self.on_load(label)
+        return argumentation_system
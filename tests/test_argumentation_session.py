@@ -0,0 +1,112 @@
+import random
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from stability_label_algorithm.modules.argumentation.argumentation_engine import ArgumentationEngine
+from stability_label_algorithm.modules.argumentation.argumentation_theory.argumentation_system import \
+    ArgumentationSystem
+from stability_label_algorithm.modules.argumentation.importers.argumentation_system_xlsx_reader import \
+    ArgumentationSystemXLSXReader
+from stability_label_algorithm.modules.argumentation.labelers.four_bool_labeler import FourBoolLabeler
+from stability_label_algorithm.modules.argumentation.labelers.fqas_labeler import FQASLabeler
+from tests.utils import assert_same_labels, path_to_resources, random_argumentation_system
+
+
+class TestArgumentationSession(unittest.TestCase):
+    def assert_same_labels_as_update(self, engine: ArgumentationEngine, rng: random.Random, nr_of_updates=30):
+        """
+        Add and retract random observations (possibly inconsistent ones) in a session and compare its labels with those
+        of ArgumentationEngine.update for the same observations.
+        """
+        session = engine.open_session()
+        queryable_names = sorted(str(queryable) for queryable in engine.argumentation_system.queryables)
+        observations = []
+        for _ in range(nr_of_updates):
+            if observations and rng.random() < 0.4:
+                observation = rng.choice(observations)
+                observations.remove(observation)
+                session.retract_observation(observation)
+            else:
+                observation = rng.choice(queryable_names)
+                if observation not in observations:
+                    observations.append(observation)
+                session.add_observation(observation)
+            self.assertEqual(sorted(str(queryable) for queryable in session.observations), sorted(observations))
+            self.assertEqual(set(session.knowledge_base),
+                             set(engine._get_consistent_observations(observations)) &
+                             set(engine.labeled_argumentation_system.language.values()))
+            assert_same_labels(engine.update(observations).labels, session.labels,
+                               engine.labeled_argumentation_system)
+
+    def test_sessions_on_fqas_example(self):
+        asr = ArgumentationSystemXLSXReader(path_to_resources('03_2019_FQAS_Paper_Example'))
+        arg_system = ArgumentationSystem(asr.language, asr.rules, asr.topic_literals)
+        for labeler in [FourBoolLabeler(), FQASLabeler()]:
+            session = ArgumentationEngine(arg_system, labeler).open_session(['wrong_product'])
+            self.assertFalse(session.labels.literal_labeling[arg_system.language['fraud']].is_stable)
+            session.add_observation('counter_party_delivered')
+            self.assertTrue(session.labels.literal_labeling[arg_system.language['fraud']].is_stable)
+
+            # The contrary observations exclude each other from the knowledge base, until one is retracted.
+            session.add_observation('~wrong_product')
+            self.assertEqual([str(queryable) for queryable in session.knowledge_base], ['counter_party_delivered'])
+            session.retract_observation('~wrong_product')
+            self.assertEqual(sorted(str(queryable) for queryable in session.knowledge_base),
+                             ['counter_party_delivered', 'wrong_product'])
+
+            session.retract_observation('wrong_product')
+            self.assertTrue(session.labels.literal_labeling[arg_system.language['fraud']].is_contested_stable)
+
+    def test_labels_are_copied_only_after_changes(self):
+        asr = ArgumentationSystemXLSXReader(path_to_resources('03_2019_FQAS_Paper_Example'))
+        arg_system = ArgumentationSystem(asr.language, asr.rules, asr.topic_literals)
+        session = ArgumentationEngine(arg_system, FourBoolLabeler()).open_session(['wrong_product'])
+        labels = session.labels
+        self.assertIs(session.labels, labels)
+        session.add_observation('wrong_product')
+        self.assertIs(session.labels, labels)
+
+        # Earlier Labels do not change when the session is updated.
+        session.add_observation('counter_party_delivered')
+        self.assertIsNot(session.labels, labels)
+        self.assertFalse(labels.literal_labeling[arg_system.language['fraud']].is_stable)
+        self.assertTrue(session.labels.literal_labeling[arg_system.language['fraud']].is_stable)
+
+    def test_sessions_on_random_argumentation_systems(self):
+        rng = random.Random(0)
+        for _ in range(5):
+            argumentation_system = random_argumentation_system()
+            topics = [rng.choice(list(argumentation_system.language.values()))]
+            for labeler in [FourBoolLabeler(), FQASLabeler()]:
+                for engine in [ArgumentationEngine(argumentation_system, labeler),
+                               ArgumentationEngine(argumentation_system, labeler, topics)]:
+                    self.assert_same_labels_as_update(engine, rng)
+
+    def test_concurrent_sessions(self):
+        asr = ArgumentationSystemXLSXReader(path_to_resources('02_2020_COMMA_Paper_Example'))
+        arg_system = ArgumentationSystem(asr.language, asr.rules, asr.topic_literals)
+        engine = ArgumentationEngine(arg_system, FourBoolLabeler())
+        queryable_names = sorted(str(queryable) for queryable in arg_system.queryables)
+
+        def run_session(seed):
+            rng = random.Random(seed)
+            session = engine.open_session()
+            observations = set()
+            for _ in range(20):
+                observation = rng.choice(queryable_names)
+                if observation in observations:
+                    observations.remove(observation)
+                    session.retract_observation(observation)
+                else:
+                    observations.add(observation)
+                    session.add_observation(observation)
+            return sorted(observations), session.labels
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(run_session, range(32)))
+        for observations, labels in results:
+            assert_same_labels(engine.update(observations).labels, labels, arg_system)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+
+from stability_label_algorithm.modules.argumentation.argumentation_engine import ArgumentationEngine
+from stability_label_algorithm.modules.argumentation.argumentation_theory.argumentation_system import \
+    ArgumentationSystem
+from stability_label_algorithm.modules.argumentation.argumentation_theory.argumentation_system_slicer import \
+    slice_for_topics
+from stability_label_algorithm.modules.argumentation.argumentation_theory.argumentation_theory import \
+    ArgumentationTheory
+from stability_label_algorithm.modules.argumentation.importers.argumentation_system_xlsx_reader import \
+    ArgumentationSystemXLSXReader
+from stability_label_algorithm.modules.argumentation.labelers.acceptability_labeler import JustificationLabeler
+from stability_label_algorithm.modules.argumentation.labelers.four_bool_labeler import FourBoolLabeler
+from stability_label_algorithm.modules.argumentation.labelers.fqas_labeler import FQASLabeler
+from tests.utils import path_to_resources_folder
+
+
+class TestArgumentationSystemSlicer(unittest.TestCase):
+    def setUp(self):
+        self.arg_systems = []
+        for path in sorted(path_to_resources_folder().glob('*.xlsx')):
+            asr = ArgumentationSystemXLSXReader(path)
+            self.arg_systems.append(ArgumentationSystem(asr.language, asr.rules, asr.topic_literals))
+
+    def test_slice_is_closed(self):
+        for arg_system in self.arg_systems:
+            for topic in arg_system.language.values():
+                sliced_arg_system = slice_for_topics(arg_system, [topic])
+                self.assertIs(slice_for_topics(arg_system, [topic]), sliced_arg_system)
+                self.assertEqual(sliced_arg_system.topic_literals, [topic])
+                for literal in sliced_arg_system.language.values():
+                    original = arg_system.language[str(literal)]
+                    self.assertEqual(literal.contraries, original.contraries)
+                    self.assertEqual(literal.children, original.children)
+                    for contrary in literal.contraries:
+                        self.assertIs(sliced_arg_system.language[str(contrary)], contrary)
+                for rule in sliced_arg_system.rules:
+                    for antecedent in rule.antecedents:
+                        self.assertIs(sliced_arg_system.language[str(antecedent)], antecedent)
+
+    def test_same_labels_on_slice(self):
+        nr_of_smaller_slices = 0
+        for arg_system in self.arg_systems:
+            knowledge_bases = [[]] + [[queryable] for queryable in arg_system.queryables]
+            for topic in arg_system.topic_literals + arg_system.queryables[:2]:
+                sliced_arg_system = slice_for_topics(arg_system, [topic])
+                nr_of_smaller_slices += len(sliced_arg_system.rules) < len(arg_system.rules)
+                for knowledge_base in knowledge_bases:
+                    sliced_knowledge_base = [queryable for queryable in knowledge_base
+                                             if str(queryable) in sliced_arg_system.language]
+                    for labeler in [FourBoolLabeler(), JustificationLabeler(), FQASLabeler()]:
+                        labels = labeler.label(ArgumentationTheory(arg_system, knowledge_base))
+                        sliced_labels = labeler.label(ArgumentationTheory(sliced_arg_system, sliced_knowledge_base))
+                        for literal in sliced_arg_system.language.values():
+                            self.assertEqual(sliced_labels.literal_labeling[literal],
+                                             labels.literal_labeling[literal])
+                        for rule in sliced_arg_system.rules:
+                            self.assertEqual(sliced_labels.rule_labeling[rule], labels.rule_labeling[rule])
+        self.assertGreater(nr_of_smaller_slices, 0)
+
+    def test_argumentation_engine_on_slice(self):
+        arg_system = self.arg_systems[0]
+        topic = arg_system.topic_literals[0]
+        observations = [str(queryable) for queryable in arg_system.positive_queryables]
+        labels = ArgumentationEngine(arg_system, FourBoolLabeler()).update(observations).labels
+        sliced_labels = ArgumentationEngine(arg_system, FourBoolLabeler(), [topic]).update(observations).labels
+        self.assertEqual(sliced_labels.literal_labeling[topic], labels.literal_labeling[topic])
+        self.assertLessEqual(len(sliced_labels.literal_labeling), len(labels.literal_labeling))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import json
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from stability_label_algorithm.modules.argumentation.importers.argumentation_system_snapshot import \
+    get_snapshot_path
+from stability_label_algorithm.modules.argumentation.importers.argumentation_system_xlsx_reader import \
+    ArgumentationSystemXLSXReader
+from tests.utils import path_to_resources
+
+
+loaded_payloads = []
+
+
+def load_payload():
+    loaded_payloads.append(True)
+
+
+class Payload:
+    # Unpickling a Payload calls load_payload, as a malicious pickle could call anything.
+    def __reduce__(self):
+        return load_payload, ()
+
+
+def rule_key(rule):
+    # The antecedents of a Rule are a set, so str(rule) depends on their order; compare them as a set instead.
+    return frozenset(str(antecedent) for antecedent in rule.antecedents), str(rule.consequent)
+
+
+class TestArgumentationSystemSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.path = Path(self.folder) / 'rule_set.xlsx'
+        shutil.copyfile(path_to_resources('03_2019_FQAS_Paper_Example'), self.path)
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def assert_same_argumentation_system(self, reader: ArgumentationSystemXLSXReader,
+                                         expected: ArgumentationSystemXLSXReader):
+        self.assertEqual(list(reader.language.keys()), list(expected.language.keys()))
+        for literal_str, literal in reader.language.items():
+            expected_literal = expected.language[literal_str]
+            self.assertEqual(type(literal), type(expected_literal))
+            self.assertEqual(vars(literal).keys(), vars(expected_literal).keys())
+            self.assertEqual(literal.contraries, expected_literal.contraries)
+            self.assertEqual(literal.negation, expected_literal.negation)
+            self.assertEqual(sorted(map(rule_key, literal.children), key=str),
+                             sorted(map(rule_key, expected_literal.children), key=str))
+            self.assertEqual(sorted(map(rule_key, literal.parents), key=str),
+                             sorted(map(rule_key, expected_literal.parents), key=str))
+        self.assertEqual([(rule.id, set(rule.antecedents), rule.consequent) for rule in reader.rules],
+                         [(rule.id, set(rule.antecedents), rule.consequent) for rule in expected.rules])
+        self.assertEqual(reader.topic_literals, expected.topic_literals)
+        self.assertEqual(reader.about_text, expected.about_text)
+        self.assertTrue(reader.rule_preference_matrix.equals(expected.rule_preference_matrix))
+
+    def test_snapshot_is_used(self):
+        expected = ArgumentationSystemXLSXReader(self.path)
+        ArgumentationSystemXLSXReader.from_snapshot_or_xlsx(self.path)
+        self.assertTrue(get_snapshot_path(self.path).is_file())
+
+        # The second time, the XLSX file is not read.
+        with mock.patch('pandas.read_excel', side_effect=AssertionError('XLSX file was read')):
+            reader = ArgumentationSystemXLSXReader.from_snapshot_or_xlsx(self.path)
+            self.assert_same_argumentation_system(reader, expected)
+
+            # A new modification time with the same content does not invalidate the snapshot.
+            os.utime(self.path, ns=(0, 0))
+            reader = ArgumentationSystemXLSXReader.from_snapshot_or_xlsx(self.path)
+            self.assert_same_argumentation_system(reader, expected)
+
+    def test_snapshot_is_invalidated(self):
+        ArgumentationSystemXLSXReader.from_snapshot_or_xlsx(self.path)
+        shutil.copyfile(path_to_resources('02_2020_COMMA_Paper_Example'), self.path)
+        reader = ArgumentationSystemXLSXReader.from_snapshot_or_xlsx(self.path)
+        self.assert_same_argumentation_system(reader, ArgumentationSystemXLSXReader(self.path))
+
+    def test_pickled_snapshot_is_not_loaded(self):
+        expected = ArgumentationSystemXLSXReader(self.path)
+        source_stat = os.stat(self.path)
+        header = {'version': 1, 'mtime_ns': source_stat.st_mtime_ns, 'size': source_stat.st_size}
+        with open(get_snapshot_path(self.path), 'wb') as writer:
+            pickle.dump(header, writer)
+            pickle.dump(Payload(), writer)
+
+        reader = ArgumentationSystemXLSXReader.from_snapshot_or_xlsx(self.path)
+        self.assertEqual(loaded_payloads, [])
+        self.assert_same_argumentation_system(reader, expected)
+
+        # The snapshot is replaced by one that consists of JSON only.
+        with open(get_snapshot_path(self.path), 'r', encoding='utf-8') as snapshot_reader:
+            self.assertEqual(json.loads(snapshot_reader.readline())['version'], 2)
+            json.loads(snapshot_reader.readline())
+
+
+if __name__ == '__main__':
+    unittest.main()
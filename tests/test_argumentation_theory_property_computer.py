@@ -55,3 +55,25 @@ class TestArgumentationTheoryPropertyComputer(unittest.TestCase):
         self.assertEqual(at_properties.nr_of_inconsistent_potential_arguments, 0)
         self.assertEqual(len(at_properties.future_argumentation_theories),
                          3 ** (len(at.future_knowledge_base_candidates) / 2))
+
+    def test_iter_future_knowledge_bases(self):
+        asr = ArgumentationSystemXLSXReader(path_to_resources('02_2020_COMMA_Paper_Example'))
+        arg_system = ArgumentationSystem(asr.language, asr.rules, asr.topic_literals)
+
+        for kb_str in [[], ['citizen_tried_to_buy', 'suspicious_url'],
+                       ['citizen_tried_to_buy', '~citizen_tried_to_buy']]:
+            at = ArgumentationTheory(arg_system, [arg_system.get_queryable(s) for s in kb_str])
+            future_knowledge_bases = list(argumentation_theory_property_computer.iter_future_knowledge_bases(at))
+            self.assertEqual(
+                sorted([sorted(str(queryable) for queryable in knowledge_base)
+                        for knowledge_base in future_knowledge_bases]),
+                sorted([sorted(str(queryable) for queryable in future_at.knowledge_base) for future_at in
+                        argumentation_theory_property_computer.enumerate_future_argumentation_theories(at)]))
+
+            # The parts are disjoint and together contain all future knowledge bases.
+            for nr_of_parts in [2, 5]:
+                parts = [sorted(str(queryable) for queryable in knowledge_base) for part in range(nr_of_parts)
+                         for knowledge_base in argumentation_theory_property_computer.iter_future_knowledge_bases(
+                             at, part, nr_of_parts)]
+                self.assertEqual(sorted(parts), sorted([sorted(str(queryable) for queryable in knowledge_base)
+                                                        for knowledge_base in future_knowledge_bases]))
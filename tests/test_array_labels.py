@@ -0,0 +1,48 @@
+import unittest
+
+from stability_label_algorithm.modules.argumentation.argumentation_theory.argumentation_system import \
+    ArgumentationSystem
+from stability_label_algorithm.modules.argumentation.argumentation_theory.argumentation_theory import \
+    ArgumentationTheory
+from stability_label_algorithm.modules.argumentation.importers.argumentation_system_xlsx_reader import \
+    ArgumentationSystemXLSXReader
+from stability_label_algorithm.modules.argumentation.labelers.array_labels import ArrayLabels
+from stability_label_algorithm.modules.argumentation.labelers.four_bool_labeler import FourBoolLabeler
+from stability_label_algorithm.modules.argumentation.labelers.stability_label import StabilityLabel
+from tests.utils import path_to_resources
+
+
+class TestArrayLabels(unittest.TestCase):
+    def setUp(self):
+        asr = ArgumentationSystemXLSXReader(path_to_resources('02_2020_COMMA_Paper_Example'))
+        self.arg_system = ArgumentationSystem(asr.language, asr.rules, asr.topic_literals)
+        knowledge_base = self.arg_system.get_queryables(['citizen_tried_to_buy', 'citizen_sent_money'])
+        self.labels = FourBoolLabeler().label(ArgumentationTheory(self.arg_system, knowledge_base))
+
+    def test_codes(self):
+        for code in range(16):
+            self.assertEqual(StabilityLabel.from_code(code).code, code)
+
+    def test_views_match_codes(self):
+        self.assertIsInstance(self.labels, ArrayLabels)
+        compiled = self.arg_system.compiled
+        self.assertEqual(len(self.labels.literal_labeling), compiled.nr_of_literals)
+        for literal, literal_id in compiled.literal_ids.items():
+            label = self.labels.literal_labeling[literal]
+            self.assertEqual(label, StabilityLabel.from_code(self.labels.literal_codes[literal_id]))
+        for rule, rule_id in compiled.rule_ids.items():
+            label = self.labels.rule_labeling[rule]
+            self.assertEqual(label, StabilityLabel.from_code(self.labels.rule_codes[rule_id]))
+
+    def test_write_through_view(self):
+        literal = self.arg_system.language['fraud']
+        literal_id = self.arg_system.compiled.literal_ids[literal]
+        self.labels.literal_labeling[literal] = StabilityLabel(True, False, True, False)
+        self.assertEqual(self.labels.literal_codes[literal_id], 5)
+        self.labels.literal_labeling[literal].blocked = True
+        self.assertEqual(self.labels.literal_codes[literal_id], 13)
+        self.assertTrue(self.labels.literal_labeling[literal].blocked)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+import unittest
+
+from stability_label_algorithm.modules.argumentation.argumentation_theory.argumentation_system import \
+    ArgumentationSystem
+from stability_label_algorithm.modules.argumentation.argumentation_theory.argumentation_theory import \
+    ArgumentationTheory
+from stability_label_algorithm.modules.argumentation.argumentation_theory.compiled_argumentation_system import \
+    CompiledArgumentationSystem
+from stability_label_algorithm.modules.argumentation.importers.argumentation_system_xlsx_reader import \
+    ArgumentationSystemXLSXReader
+from stability_label_algorithm.modules.argumentation.labelers.four_bool_labeler import FourBoolLabeler
+from stability_label_algorithm.modules.argumentation.labelers.satisfiability_labeler import SatisfiabilityLabeler
+from tests.utils import path_to_resources
+
+
+class TestCompiledArgumentationSystem(unittest.TestCase):
+    def setUp(self):
+        asr = ArgumentationSystemXLSXReader(path_to_resources('02_2020_COMMA_Paper_Example'))
+        self.arg_system = ArgumentationSystem(asr.language, asr.rules, asr.topic_literals)
+
+    def test_ids_and_adjacency(self):
+        compiled = self.arg_system.compiled
+        self.assertIs(compiled, self.arg_system.compiled)
+        self.assertIs(compiled, compiled.compiled)
+        self.assertEqual(compiled.nr_of_literals, 24)
+        self.assertEqual(compiled.nr_of_rules, 8)
+        self.assertEqual(len(compiled.queryable_ids), 16)
+
+        for rule_id, rule in enumerate(compiled.rules):
+            self.assertEqual(compiled.rule_ids[rule], rule_id)
+            self.assertEqual(compiled.literals[compiled.consequents[rule_id]], rule.consequent)
+            start, end = compiled.antecedents_indptr[rule_id], compiled.antecedents_indptr[rule_id + 1]
+            self.assertEqual([compiled.literals[i] for i in compiled.antecedents_indices[start:end]],
+                             list(rule.antecedents))
+
+        for literal_id, literal in enumerate(compiled.literals):
+            self.assertEqual(compiled.literal_ids[literal], literal_id)
+            start, end = compiled.contraries_indptr[literal_id], compiled.contraries_indptr[literal_id + 1]
+            self.assertEqual([compiled.literals[i] for i in compiled.contraries_indices[start:end]],
+                             literal.contraries)
+            start, end = compiled.parents_indptr[literal_id], compiled.parents_indptr[literal_id + 1]
+            self.assertEqual([compiled.rules[i] for i in compiled.parents_indices[start:end]], literal.parents)
+            start, end = compiled.children_indptr[literal_id], compiled.children_indptr[literal_id + 1]
+            self.assertEqual([compiled.rules[i] for i in compiled.children_indices[start:end]], literal.children)
+
+    def test_label_on_compiled_argumentation_system(self):
+        compiled = CompiledArgumentationSystem(self.arg_system)
+        knowledge_base = self.arg_system.get_queryables(['citizen_tried_to_buy', 'citizen_sent_money'])
+        labels = FourBoolLabeler().label(ArgumentationTheory(self.arg_system, knowledge_base))
+        compiled_labels = FourBoolLabeler().label(ArgumentationTheory(compiled, knowledge_base))
+        for literal in self.arg_system.language.values():
+            self.assertEqual(labels.literal_labeling[literal], compiled_labels.literal_labeling[literal])
+        for rule in self.arg_system.rules:
+            self.assertEqual(labels.rule_labeling[rule], compiled_labels.rule_labeling[rule])
+
+    def test_forward_chain(self):
+        compiled = self.arg_system.compiled
+        literal_derived, rule_derived = compiled.forward_chain([False] * compiled.nr_of_literals)
+        self.assertFalse(any(literal_derived))
+        self.assertFalse(any(rule_derived))
+
+        literal_derived, rule_derived = compiled.forward_chain(compiled.literal_mask(compiled.queryables))
+        for rule_id, antecedents in enumerate(compiled.rule_antecedents):
+            self.assertEqual(rule_derived[rule_id], all([literal_derived[literal_id] for literal_id in antecedents]))
+            if rule_derived[rule_id]:
+                self.assertTrue(literal_derived[compiled.rule_consequents[rule_id]])
+
+    def test_satisfiability_cache(self):
+        compiled = self.arg_system.compiled
+        compiled.satisfiability_cache.clear()
+        knowledge_base = self.arg_system.get_queryables(['citizen_tried_to_buy', 'citizen_sent_money'])
+        first_codes = SatisfiabilityLabeler().label_codes(compiled, compiled.literal_mask(knowledge_base))
+        self.assertEqual(len(compiled.satisfiability_cache), 1)
+
+        # Same excluded Queryables, so the cached result is used (and copied).
+        first_codes[0][0] = 0
+        second_codes = SatisfiabilityLabeler().label_codes(compiled, compiled.literal_mask(knowledge_base[:1]))
+        self.assertEqual(len(compiled.satisfiability_cache), 2)
+        third_codes = SatisfiabilityLabeler().label_codes(compiled, compiled.literal_mask(knowledge_base))
+        self.assertEqual(len(compiled.satisfiability_cache), 2)
+        self.assertNotEqual(third_codes[0][0], 0)
+        self.assertNotEqual(second_codes, third_codes)
+
+    def test_knowledge_base_masks(self):
+        compiled = self.arg_system.compiled
+        knowledge_base = self.arg_system.get_queryables(['citizen_tried_to_buy', 'citizen_sent_money'])
+        argumentation_theory = ArgumentationTheory(self.arg_system, knowledge_base)
+        self.assertEqual(argumentation_theory.knowledge_base_set, frozenset(knowledge_base))
+
+        for literal_id, literal in enumerate(compiled.literals):
+            self.assertEqual(argumentation_theory.observed[literal_id], literal in knowledge_base)
+            self.assertEqual(argumentation_theory.contrary_observed[literal_id],
+                             any([contrary in knowledge_base for contrary in literal.contraries]))
+            self.assertEqual(bool(argumentation_theory.knowledge_base_bitmask >> literal_id & 1),
+                             literal in knowledge_base)
+
+        self.assertEqual(argumentation_theory.future_knowledge_base_candidates,
+                         [queryable for queryable in self.arg_system.queryables
+                          if queryable not in knowledge_base and
+                          all([contrary not in knowledge_base for contrary in queryable.contraries])])
+
+
+if __name__ == '__main__':
+    unittest.main()
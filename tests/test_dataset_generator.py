@@ -1,13 +1,44 @@
+import multiprocessing
+import shutil
+import tempfile
 import unittest
+from itertools import chain, combinations
+from pathlib import Path
+from unittest import mock
 
+from stability_label_algorithm.modules.argumentation.argumentation_theory.argumentation_system \
+    import ArgumentationSystem
+from stability_label_algorithm.modules.argumentation.argumentation_theory.argumentation_theory \
+    import ArgumentationTheory
+from stability_label_algorithm.modules.argumentation.importers.argumentation_system_xlsx_reader \
+    import ArgumentationSystemXLSXReader
+from stability_label_algorithm.modules.argumentation.labelers.naive_stability_labeler import NaiveStabilityLabeler
 from stability_label_algorithm.modules.dataset_generator.argumentation_system_generator.random.\
     random_argumentation_system_generator import RandomArgumentationSystemGenerator
 from stability_label_algorithm.modules.dataset_generator.argumentation_system_generator.random.\
     random_argumentation_system_generator_parameters import RandomArgumentationSystemGeneratorParameters
+from stability_label_algorithm.modules.dataset_generator import dataset_generator
+from stability_label_algorithm.modules.dataset_generator import utils as dataset_utils
 from stability_label_algorithm.modules.dataset_generator.dataset_generator import DatasetGenerator
+from stability_label_algorithm.modules.dataset_generator.exporters.dataset_binary_writer import DatasetBinaryWriter
+from stability_label_algorithm.modules.dataset_generator.importers.dataset_binary_reader import DatasetBinaryReader
+from stability_label_algorithm.modules.dataset_generator.importers.dataset_json_reader import DatasetJsonReader
+from stability_label_algorithm.modules.dataset_generator.utils import get_binary_path, get_path
+from stability_label_algorithm.modules.test_consistency_queryable_set import queryable_set_is_consistent
+from tests.utils import path_to_resources
 
 
 class TestDatasetGenerator(unittest.TestCase):
+    def setUp(self):
+        # Generated datasets are written to a temporary folder instead of the resources folder.
+        self.folder = tempfile.mkdtemp()
+        dataset_folder_patcher = mock.patch.object(dataset_utils, 'dataset_folder_path', Path(self.folder))
+        dataset_folder_patcher.start()
+        self.addCleanup(dataset_folder_patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
     def test_random_argumentation_system_generation(self):
         argumentation_system_generation_parameters = \
             RandomArgumentationSystemGeneratorParameters(10, 4, {1: 2, 2: 2}, 2)
@@ -50,6 +81,109 @@ class TestDatasetGenerator(unittest.TestCase):
                 self.assertEqual(nr_rules, len([rule for rule in argumentation_system.rules
                                                 if len(rule.antecedents) == nr_antecedents]))
 
+    def test_parallel_argumentation_theory_lattice(self):
+        asr = ArgumentationSystemXLSXReader(path_to_resources('02_2020_COMMA_Paper_Example'))
+        argumentation_system = ArgumentationSystem(asr.language, asr.rules, asr.topic_literals)
+        dataset = DatasetGenerator._generate_argumentation_theory_dataset('test', argumentation_system, 'test',
+                                                                          False)
+
+        lattice_items = DatasetGenerator._generate_argumentation_theory_lattice(dataset)
+        parallel_lattice_items = DatasetGenerator._generate_argumentation_theory_lattice(dataset, workers=2)
+        # Spawned workers (the default on macOS and Windows) do not inherit the ArgumentationSystem from a fork.
+        spawn_context = multiprocessing.get_context('spawn')
+        with mock.patch.object(dataset_generator, 'Pool', lambda *args, **kwargs: spawn_context.Pool(*args, **kwargs)):
+            spawned_lattice_items = DatasetGenerator._generate_argumentation_theory_lattice(dataset, workers=2)
+        for other_lattice_items in [parallel_lattice_items, spawned_lattice_items]:
+            self.assertEqual(len(lattice_items), len(other_lattice_items))
+            for lattice_item, other_lattice_item in zip(lattice_items, other_lattice_items):
+                self.assertEqual(lattice_item.acceptability_labels.literal_labeling,
+                                 other_lattice_item.acceptability_labels.literal_labeling)
+                self.assertEqual(lattice_item.acceptability_labels.rule_labeling,
+                                 other_lattice_item.acceptability_labels.rule_labeling)
+
+    def test_ground_truth_lattice(self):
+        asr = ArgumentationSystemXLSXReader(path_to_resources('counter05_BOU_irrelevant_in_B_lit_b'))
+        argumentation_system = ArgumentationSystem(asr.language, asr.rules, asr.topic_literals)
+        dataset = DatasetGenerator._generate_argumentation_theory_dataset('test', argumentation_system, 'test',
+                                                                          False)
+        lattice_items = DatasetGenerator._generate_argumentation_theory_lattice(dataset)
+        for lattice_item in lattice_items:
+            knowledge_base = set(lattice_item.argumentation_theory.knowledge_base)
+            self.assertEqual(len(lattice_item.direct_future_theories),
+                             len(lattice_item.argumentation_theory.future_knowledge_base_candidates))
+            for future_item in lattice_item.direct_future_theories:
+                self.assertTrue(knowledge_base < set(future_item.argumentation_theory.knowledge_base))
+                self.assertEqual(len(future_item.argumentation_theory.knowledge_base), len(knowledge_base) + 1)
+
+        # The ground truth stability label is the label of the NaiveStabilityLabeler, for each item exactly once.
+        annotated_dataset = DatasetGenerator._generate_dataset_for_argumentation_system_with_ground_truth(
+            'test', argumentation_system, 'test', dataset)
+        self.assertEqual(len(annotated_dataset.dataset_items),
+                         len(dataset.dataset_items) * len(argumentation_system.topic_literals))
+        for annotated_item in annotated_dataset.dataset_items:
+            if len(annotated_item.knowledge_base) <= 1:
+                labels = NaiveStabilityLabeler().label(
+                    ArgumentationTheory(argumentation_system, annotated_item.knowledge_base))
+                self.assertEqual(annotated_item.gt_stability_label,
+                                 labels.literal_labeling[annotated_item.topic_literal])
+
+    def test_generate_dataset_file(self):
+        asr = ArgumentationSystemXLSXReader(path_to_resources('03_2019_FQAS_Paper_Example'))
+        argumentation_system = ArgumentationSystem(asr.language, asr.rules, asr.topic_literals)
+
+        # The knowledge bases are the consistent combinations of Queryables, in the same order.
+        queryables = argumentation_system.queryables
+        all_queryable_combinations = chain.from_iterable(combinations(queryables, r)
+                                                         for r in range(len(queryables) + 1))
+        self.assertEqual([list(queryable_tuple) for queryable_tuple in all_queryable_combinations
+                          if queryable_set_is_consistent(list(queryable_tuple))],
+                         list(DatasetGenerator._iter_consistent_knowledge_bases(argumentation_system)))
+
+        dataset_name = DatasetGenerator(argumentation_system).generate_dataset_file(verbose=False, chunk_size=7)
+        with open(get_path(dataset_name), 'r') as reader:
+            lines = reader.read().splitlines()
+        argumentation_system_name = lines[1]
+        dataset = DatasetGenerator._generate_argumentation_theory_dataset(dataset_name, argumentation_system,
+                                                                          argumentation_system_name, False)
+        self.assertEqual(lines, [dataset_name, argumentation_system_name] +
+                         [str(dataset_item) for dataset_item in dataset.dataset_items])
+
+    def test_read_dataset(self):
+        dataset_generator = DatasetGenerator.from_file('counter04_OU_irrelevant_in_D_lit_c')
+        for include_ground_truth in [False, True]:
+            dataset = dataset_generator.generate_dataset(include_ground_truth=include_ground_truth, verbose=False)
+            read_dataset = DatasetJsonReader().read_from_json(str(get_path(dataset.name)))
+            self.assertEqual(read_dataset.name, dataset.name)
+            self.assertEqual(read_dataset.argumentation_system_name, dataset.argumentation_system_name)
+            self.assertEqual([str(dataset_item) for dataset_item in read_dataset.dataset_items],
+                             [str(dataset_item) for dataset_item in dataset.dataset_items])
+
+            # The ArgumentationSystem is read only once.
+            self.assertEqual(len({id(dataset_item.argumentation_system)
+                                  for dataset_item in read_dataset.dataset_items}), 1)
+
+    def test_binary_dataset(self):
+        dataset_generator = DatasetGenerator.from_file('counter04_OU_irrelevant_in_D_lit_c')
+        for include_ground_truth in [False, True]:
+            dataset = dataset_generator.generate_dataset(include_ground_truth=include_ground_truth, verbose=False)
+            DatasetBinaryWriter().write_to_binary(dataset, chunk_size=7)
+            dataset_reader = DatasetBinaryReader(str(get_binary_path(dataset.name)))
+            self.assertEqual(len(dataset_reader), len(dataset.dataset_items))
+            self.assertEqual(dataset_reader.argumentation_system_name, dataset.argumentation_system_name)
+            self.assertEqual([str(dataset_item) for dataset_item in dataset_reader.iter_dataset_items()],
+                             [str(dataset_item) for dataset_item in dataset.dataset_items])
+            self.assertEqual(str(dataset_reader[3]), str(dataset.dataset_items[3]))
+            if include_ground_truth:
+                self.assertEqual(list(dataset_reader.stability_codes()),
+                                 [dataset_item.gt_stability_label.code for dataset_item in dataset.dataset_items])
+                self.assertEqual(list(dataset_reader.acceptability_codes(slice(2, 5))),
+                                 [dataset_item.gt_acceptability_label.code
+                                  for dataset_item in dataset.dataset_items[2:5]])
+                self.assertEqual(dataset_reader.stability_codes(3), dataset.dataset_items[3].gt_stability_label.code)
+            else:
+                self.assertRaises(ValueError, dataset_reader.stability_codes, slice(2, 5))
+                self.assertRaises(ValueError, dataset_reader.acceptability_codes)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,97 @@
+import random
+import unittest
+
+from stability_label_algorithm.modules.argumentation.argumentation_engine import ArgumentationEngine
+from stability_label_algorithm.modules.argumentation.argumentation_theory.argumentation_system import \
+    ArgumentationSystem
+from stability_label_algorithm.modules.argumentation.argumentation_theory.argumentation_theory import \
+    ArgumentationTheory
+from stability_label_algorithm.modules.argumentation.importers.argumentation_system_xlsx_reader import \
+    ArgumentationSystemXLSXReader
+from stability_label_algorithm.modules.argumentation.labelers.four_bool_labeler import FourBoolLabeler
+from stability_label_algorithm.modules.argumentation.labelers.incremental_four_bool_labeler import \
+    IncrementalFourBoolLabeler
+from tests.utils import assert_same_labels, path_to_resources, random_argumentation_system
+
+
+class TestIncrementalFourBoolLabeler(unittest.TestCase):
+    @staticmethod
+    def assert_same_labels_as_four_bool_labeler(argumentation_system, labels, knowledge_base):
+        expected_labels = FourBoolLabeler().label(ArgumentationTheory(argumentation_system, knowledge_base))
+        assert_same_labels(expected_labels, labels, argumentation_system)
+
+    def assert_same_labels_after_updates(self, argumentation_system, rng, nr_of_updates=30,
+                                         full_relabel_fraction=IncrementalFourBoolLabeler.FULL_RELABEL_FRACTION):
+        labeler = IncrementalFourBoolLabeler()
+        labeler.FULL_RELABEL_FRACTION = full_relabel_fraction
+        self.assert_same_labels_as_four_bool_labeler(argumentation_system, labeler.start(argumentation_system), [])
+        knowledge_base = []
+        for _ in range(nr_of_updates):
+            if knowledge_base and rng.random() < 0.4:
+                queryable = rng.choice(knowledge_base)
+                knowledge_base.remove(queryable)
+                labeler.remove_queryable(queryable)
+            else:
+                candidates = [queryable for queryable in argumentation_system.queryables
+                              if queryable not in knowledge_base and
+                              all([not queryable.is_contrary_of(other) for other in knowledge_base])]
+                if not candidates:
+                    continue
+                queryable = rng.choice(candidates)
+                knowledge_base.append(queryable)
+                labeler.add_queryable(queryable)
+            self.assertEqual(set(labeler.knowledge_base), set(knowledge_base))
+            self.assert_same_labels_as_four_bool_labeler(argumentation_system, labeler.labels, knowledge_base)
+
+    def test_updates_on_comma_example(self):
+        asr = ArgumentationSystemXLSXReader(path_to_resources('02_2020_COMMA_Paper_Example'))
+        argumentation_system = ArgumentationSystem(asr.language, asr.rules, asr.topic_literals)
+        self.assert_same_labels_after_updates(argumentation_system, random.Random(0))
+
+    def test_updates_on_random_argumentation_systems(self):
+        rng = random.Random(0)
+        for _ in range(10):
+            argumentation_system = random_argumentation_system()
+            for full_relabel_fraction in [0.0, 0.5, 1.0]:
+                self.assert_same_labels_after_updates(argumentation_system, rng,
+                                                      full_relabel_fraction=full_relabel_fraction)
+
+    def test_label_batch(self):
+        asr = ArgumentationSystemXLSXReader(path_to_resources('02_2020_COMMA_Paper_Example'))
+        arg_system = ArgumentationSystem(asr.language, asr.rules, asr.topic_literals)
+        queryables = sorted(arg_system.queryables)
+        knowledge_bases = [[queryable] for queryable in queryables] + \
+            [[queryable, other] for queryable in queryables for other in queryables if queryable < other]
+        self.assertTrue((IncrementalFourBoolLabeler().label_batch(arg_system, knowledge_bases) ==
+                         FourBoolLabeler().label_batch(arg_system, knowledge_bases)).all())
+
+    def test_argumentation_engine(self):
+        asr = ArgumentationSystemXLSXReader(path_to_resources('03_2019_FQAS_Paper_Example'))
+        arg_system = ArgumentationSystem(asr.language, asr.rules, asr.topic_literals)
+        arg_engine = ArgumentationEngine(arg_system, IncrementalFourBoolLabeler())
+        for observations in [['wrong_product'], ['wrong_product', 'counter_party_delivered'],
+                             ['counter_party_delivered'], []]:
+            labels = arg_engine.update(observations).labels
+            self.assert_same_labels_as_four_bool_labeler(arg_system, labels, arg_system.get_queryables(observations))
+
+    def test_label_inconsistent_knowledge_base(self):
+        asr = ArgumentationSystemXLSXReader(path_to_resources('03_2019_FQAS_Paper_Example'))
+        arg_system = ArgumentationSystem(asr.language, asr.rules, asr.topic_literals)
+        labeler = IncrementalFourBoolLabeler()
+        for observations in [['wrong_product'], ['counter_party_delivered', '~counter_party_delivered'],
+                             ['wrong_product', 'counter_party_delivered']]:
+            knowledge_base = arg_system.get_queryables(observations)
+            labels = labeler.label(ArgumentationTheory(arg_system, knowledge_base))
+            self.assert_same_labels_as_four_bool_labeler(arg_system, labels, knowledge_base)
+
+    def test_add_inconsistent_queryable(self):
+        asr = ArgumentationSystemXLSXReader(path_to_resources('03_2019_FQAS_Paper_Example'))
+        arg_system = ArgumentationSystem(asr.language, asr.rules, asr.topic_literals)
+        labeler = IncrementalFourBoolLabeler()
+        labeler.start(arg_system, arg_system.get_queryables(['wrong_product']))
+        with self.assertRaises(ValueError):
+            labeler.add_queryable(arg_system.language['~wrong_product'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from stability_label_algorithm.modules.argumentation.importers.argumentation_system_xlsx_reader import \
+    ArgumentationSystemXLSXReader
+from stability_label_algorithm.modules.visualisation_interface.rule_set_registry import RuleSetRegistry
+from tests.utils import path_to_resources
+
+
+class TestRuleSetRegistry(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.labels = ['02_2020_COMMA_Paper_Example', '03_2019_FQAS_Paper_Example', 'counter02_support_cycle']
+        for label in self.labels:
+            shutil.copyfile(path_to_resources(label), Path(self.folder) / (label + '.xlsx'))
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def test_rule_set_registry(self):
+        loaded_labels = []
+        registry = RuleSetRegistry(self.folder, maxsize=2, on_load=loaded_labels.append)
+        self.assertEqual(registry.labels, self.labels)
+        for label in self.labels:
+            self.assertEqual(registry.about_texts[label],
+                             ArgumentationSystemXLSXReader(path_to_resources(label)).about_text)
+        self.assertNotIn('unknown', registry)
+        self.assertRaises(KeyError, registry.get, 'unknown')
+
+        # Rule sets are loaded on first use and then taken from the cache, until they are the least recently used.
+        first_argumentation_system = registry.get(self.labels[0])
+        self.assertEqual(len(first_argumentation_system.rules),
+                         len(ArgumentationSystemXLSXReader(path_to_resources(self.labels[0])).rules))
+        self.assertIs(registry.get(self.labels[0]), first_argumentation_system)
+        registry.get(self.labels[1])
+        registry.get(self.labels[2])
+        self.assertIsNot(registry.get(self.labels[0]), first_argumentation_system)
+        self.assertEqual(loaded_labels, self.labels + [self.labels[0]])
+
+
+if __name__ == '__main__':
+    unittest.main()
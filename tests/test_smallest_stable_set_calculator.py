@@ -0,0 +1,106 @@
+import itertools
+import multiprocessing
+import random
+import unittest
+from unittest import mock
+
+from stability_label_algorithm.modules.argumentation.argumentation_theory.argumentation_system import \
+    ArgumentationSystem
+from stability_label_algorithm.modules.argumentation.argumentation_theory.argumentation_theory import \
+    ArgumentationTheory
+from stability_label_algorithm.modules.argumentation.importers.argumentation_system_xlsx_reader import \
+    ArgumentationSystemXLSXReader
+from stability_label_algorithm.modules.argumentation.labelers.four_bool_labeler import FourBoolLabeler
+from stability_label_algorithm.modules.argumentation import smallest_stable_set_calculator
+from stability_label_algorithm.modules.argumentation.smallest_stable_set_calculator import apriori_gen, \
+    apriori_gen_bitmasks, bitmask_to_item_set, contrary_bitmasks, item_set_to_bitmask, iter_smallest_stable_sets, \
+    smallest_stable_sets
+from stability_label_algorithm.modules.test_consistency_queryable_set import queryable_set_is_consistent
+from tests.utils import path_to_resources, random_argumentation_system
+
+
+class TestSmallestStableSetCalculator(unittest.TestCase):
+    def setUp(self):
+        asr = ArgumentationSystemXLSXReader(path_to_resources('02_2020_COMMA_Paper_Example'))
+        self.arg_system = ArgumentationSystem(asr.language, asr.rules, asr.topic_literals)
+        self.topics = asr.topic_literals
+
+    def test_smallest_stable_sets(self):
+        result = smallest_stable_sets(self.arg_system, self.topics, FourBoolLabeler())
+        self.assertEqual(len(result), 12)
+        self.assertIn(self.arg_system.get_queryables(['citizen_received_money', 'citizen_received_product']), result)
+        for stable_set in result:
+            labels = FourBoolLabeler().label(ArgumentationTheory(self.arg_system, stable_set))
+            self.assertTrue(all([labels.literal_labeling[topic].is_contested_stable for topic in self.topics]))
+
+    def test_topic_codes_cache(self):
+        compiled = self.arg_system.compiled
+        compiled.topic_codes_cache.clear()
+        result = smallest_stable_sets(self.arg_system, self.topics, FourBoolLabeler())
+        nr_of_cached_topic_codes = len(compiled.topic_codes_cache)
+        self.assertGreater(nr_of_cached_topic_codes, 0)
+        self.assertEqual(smallest_stable_sets(self.arg_system, self.topics, FourBoolLabeler()), result)
+        self.assertEqual(len(compiled.topic_codes_cache), nr_of_cached_topic_codes)
+
+    def test_smallest_stable_sets_with_workers(self):
+        self.assertEqual(smallest_stable_sets(self.arg_system, self.topics, FourBoolLabeler(), workers=2),
+                         smallest_stable_sets(self.arg_system, self.topics, FourBoolLabeler()))
+
+    def test_smallest_stable_sets_with_spawned_workers(self):
+        # Spawned workers (the default on macOS and Windows) receive the ArgumentationSystem pickled, not forked.
+        spawn_context = multiprocessing.get_context('spawn')
+        arg_system = random_argumentation_system(language_size=200, rule_size=300)
+        topics = arg_system.compiled.literals[:1]
+        with mock.patch.object(smallest_stable_set_calculator, 'Pool',
+                               lambda *args, **kwargs: spawn_context.Pool(*args, **kwargs)):
+            result = list(iter_smallest_stable_sets(arg_system, topics, FourBoolLabeler(), workers=2, max_size=1))
+        self.assertEqual(result, list(iter_smallest_stable_sets(arg_system, topics, FourBoolLabeler(), max_size=1)))
+
+    def test_iter_smallest_stable_sets(self):
+        result = smallest_stable_sets(self.arg_system, self.topics, FourBoolLabeler())
+        self.assertEqual(list(iter_smallest_stable_sets(self.arg_system, self.topics, FourBoolLabeler())), result)
+        self.assertEqual(list(iter_smallest_stable_sets(self.arg_system, self.topics, FourBoolLabeler(), max_size=2)),
+                         [stable_set for stable_set in result if len(stable_set) <= 2])
+        self.assertEqual(list(iter_smallest_stable_sets(self.arg_system, self.topics, FourBoolLabeler(), limit=3)),
+                         result[:3])
+        self.assertEqual(list(iter_smallest_stable_sets(self.arg_system, self.topics, FourBoolLabeler(), max_size=1)),
+                         [])
+
+    def test_prune_irrelevant(self):
+        compiled = self.arg_system.compiled
+        queryable_ids = set(compiled.get_literal_ids(self.arg_system.queryables))
+        nr_of_pruned_topics = 0
+        for topic in self.arg_system.language.values():
+            cone = compiled.dependency_cone(compiled.get_literal_ids([topic]))
+            self.assertIn(compiled.literal_ids[topic], cone)
+            nr_of_pruned_topics += not queryable_ids <= cone
+            self.assertEqual(list(iter_smallest_stable_sets(self.arg_system, [topic], FourBoolLabeler(), max_size=2,
+                                                            prune_irrelevant=True)),
+                             list(iter_smallest_stable_sets(self.arg_system, [topic], FourBoolLabeler(), max_size=2)))
+        self.assertGreater(nr_of_pruned_topics, 0)
+        self.assertEqual(smallest_stable_sets(self.arg_system, self.topics, FourBoolLabeler(), prune_irrelevant=True),
+                         smallest_stable_sets(self.arg_system, self.topics, FourBoolLabeler()))
+
+    def test_apriori_gen_bitmasks(self):
+        rng = random.Random(0)
+        items = list(range(10))
+        for k in range(1, 5):
+            item_sets = sorted([item_set for item_set in itertools.combinations(items, k) if rng.random() < 0.6])
+            bitmasks = [item_set_to_bitmask(item_set, items) for item_set in item_sets]
+            self.assertEqual([bitmask_to_item_set(bitmask, items) for bitmask in apriori_gen_bitmasks(bitmasks)],
+                             apriori_gen(item_sets))
+
+    def test_apriori_gen_bitmasks_without_contraries(self):
+        queryables = sorted(self.arg_system.queryables)
+        conflicts = contrary_bitmasks(queryables)
+        item_sets = [(queryable,) for queryable in queryables]
+        while item_sets:
+            candidates = [bitmask_to_item_set(bitmask, queryables) for bitmask in apriori_gen_bitmasks(
+                [item_set_to_bitmask(item_set, queryables) for item_set in item_sets], conflicts)]
+            self.assertEqual(candidates, [item_set for item_set in apriori_gen(item_sets)
+                                          if queryable_set_is_consistent(list(item_set))])
+            item_sets = candidates
+
+
+if __name__ == '__main__':
+    unittest.main()
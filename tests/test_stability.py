@@ -1,14 +1,23 @@
+import multiprocessing
 import unittest
+from unittest import mock
 
 from stability_label_algorithm.modules.argumentation.importers.argumentation_system_xlsx_reader import \
     ArgumentationSystemXLSXReader
 from stability_label_algorithm.modules.argumentation.argumentation_theory.argumentation_system import \
     ArgumentationSystem
 from stability_label_algorithm.modules.argumentation.argumentation_engine import ArgumentationEngine
+from stability_label_algorithm.modules.argumentation.argumentation_theory.argumentation_theory import \
+    ArgumentationTheory
 from stability_label_algorithm.modules.argumentation.labelers.fqas_labeler import FQASLabeler
 from stability_label_algorithm.modules.argumentation.labelers.four_bool_labeler import FourBoolLabeler
 from stability_label_algorithm.modules.argumentation.labelers.satisfiability_labeler import SatisfiabilityLabeler
 from stability_label_algorithm.modules.argumentation.labelers.acceptability_labeler import JustificationLabeler
+from stability_label_algorithm.modules.argumentation.labelers import naive_stability_labeler
+from stability_label_algorithm.modules.argumentation.labelers.naive_stability_labeler import NaiveStabilityLabeler
+from stability_label_algorithm.modules.argumentation.labelers.stability_label import StabilityLabel
+from stability_label_algorithm.modules.dataset_generator.argumentation_theory_property_computer.\
+    argumentation_theory_property_computer import enumerate_future_argumentation_theories
 
 from tests.utils import path_to_resources
 
@@ -238,6 +247,42 @@ class TestStability(unittest.TestCase):
         arg_engine_four_bool_output = arg_engine_four_bool.update(['o'])
         self.assertFalse(arg_engine_four_bool_output.labels.literal_labeling[arg_system.language['t']].is_stable)
 
+    def test_naive_stability_labeler(self):
+        for file_name in ['counter02_support_cycle', 'counter03_attack_cycle', 'counter11_support_cycle_attacker',
+                          'counter12_support_cycle_attacker_q']:
+            asr = ArgumentationSystemXLSXReader(path_to_resources(file_name))
+            arg_system = ArgumentationSystem(asr.language, asr.rules, asr.topic_literals)
+            for observations in [[], ['o']]:
+                argumentation_theory = ArgumentationTheory(
+                    arg_system, [queryable for queryable in arg_system.queryables if str(queryable) in observations])
+                labels = NaiveStabilityLabeler().label(argumentation_theory)
+
+                # Combine the justification labels of all future ArgumentationTheories.
+                expected = {literal: StabilityLabel(False, False, False, False)
+                            for literal in arg_system.language.values()}
+                for future_argumentation_theory in enumerate_future_argumentation_theories(argumentation_theory):
+                    future_labels = JustificationLabeler().label(future_argumentation_theory)
+                    for literal in arg_system.language.values():
+                        expected[literal] += future_labels.literal_labeling[literal]
+                for literal in arg_system.language.values():
+                    self.assertEqual(labels.literal_labeling[literal], expected[literal])
+
+                parallel_labels = NaiveStabilityLabeler(workers=2).label(argumentation_theory)
+                self.assertEqual(parallel_labels.literal_labeling, labels.literal_labeling)
+                self.assertEqual(parallel_labels.rule_labeling, labels.rule_labeling)
+
+    def test_naive_stability_labeler_with_spawned_workers(self):
+        spawn_context = multiprocessing.get_context('spawn')
+        asr = ArgumentationSystemXLSXReader(path_to_resources('counter12_support_cycle_attacker_q'))
+        arg_system = ArgumentationSystem(asr.language, asr.rules, asr.topic_literals)
+        argumentation_theory = ArgumentationTheory(arg_system, [])
+        with mock.patch.object(naive_stability_labeler, 'Pool',
+                               lambda *args, **kwargs: spawn_context.Pool(*args, **kwargs)):
+            parallel_labels = NaiveStabilityLabeler(workers=2).label(argumentation_theory)
+        labels = NaiveStabilityLabeler().label(argumentation_theory)
+        self.assertEqual(parallel_labels.literal_labeling, labels.literal_labeling)
+        self.assertEqual(parallel_labels.rule_labeling, labels.rule_labeling)
+
 
 if __name__ == '__main__':
     unittest.main()
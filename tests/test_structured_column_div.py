@@ -0,0 +1,102 @@
+import importlib.util
+import unittest
+
+from stability_label_algorithm.modules.argumentation.argumentation_theory.argumentation_system import \
+    ArgumentationSystem
+from stability_label_algorithm.modules.argumentation.argumentation_theory.argumentation_theory import \
+    ArgumentationTheory
+from stability_label_algorithm.modules.argumentation.importers.argumentation_system_xlsx_reader import \
+    ArgumentationSystemXLSXReader
+from tests.utils import path_to_resources
+
+HAS_VISUALISATION_PACKAGES = importlib.util.find_spec('plotly') is not None and \
+    importlib.util.find_spec('igraph') is not None
+if HAS_VISUALISATION_PACKAGES:
+    from stability_label_algorithm.modules.visualisation_interface.argumentation_graphs.\
+        multi_node_argumentation_system_graph import create_multi_node_graph
+    from stability_label_algorithm.modules.visualisation_interface.argumentation_graphs.\
+        read_single_node_argumentation_system_graph import create_single_node_graph
+    from stability_label_algorithm.modules.visualisation_interface.html_divs.structured_column_div import \
+        figure_cache, forget_rule_set, get_structured_column_div, graph_layout_cache
+
+
+@unittest.skipUnless(HAS_VISUALISATION_PACKAGES, 'plotly and igraph are needed for the visualisation')
+class TestStructuredColumnDiv(unittest.TestCase):
+    # The figure shows, for each of the four label booleans, a True and a False trace for both Rules and Literals,
+    # and three traces with the names of the Literals (observed, relevant, other).
+    NR_OF_MARKER_TRACES = 2 * 4 + 3 + 2 * 4
+
+    def setUp(self):
+        figure_cache.clear()
+        graph_layout_cache.clear()
+
+    def assert_figure_matches_graph(self, rule_set_label, argumentation_theory, topic_literal, graph, labeler_str):
+        figure = get_structured_column_div(argumentation_theory, topic_literal, labeler_str, rule_set_label)
+        traces = figure['data']
+
+        visible_edges = [edge for edge in graph.es if edge['visible']]
+        edge_colors = {edge['color'] for edge in visible_edges}
+        self.assertEqual(len(traces), len(edge_colors) + self.NR_OF_MARKER_TRACES)
+        edge_traces, rule_traces = traces[:len(edge_colors)], traces[len(edge_colors):len(edge_colors) + 8]
+        name_traces, literal_traces = traces[len(edge_colors) + 8:len(edge_colors) + 11], traces[-8:]
+
+        # Each visible edge is a line segment (two points and a separator), each support edge has an arrow.
+        self.assertEqual(sum(len(trace.x) for trace in edge_traces), 3 * len(visible_edges))
+        self.assertEqual(len(figure['layout'].annotations),
+                         len([edge for edge in visible_edges if edge['color'] != 'red']))
+
+        # Each vertex occurs in exactly one of the True and False traces of each boolean.
+        nr_of_rule_vertices = len(graph.vs.select(type='rule_instance'))
+        nr_of_literal_vertices = len(graph.vs.select(type='literal_instance'))
+        for index in range(0, 8, 2):
+            self.assertEqual(len(rule_traces[index].x) + len(rule_traces[index + 1].x), nr_of_rule_vertices)
+            self.assertEqual(len(literal_traces[index].x) + len(literal_traces[index + 1].x), nr_of_literal_vertices)
+        self.assertEqual(sum(len(trace.x) for trace in name_traces), nr_of_literal_vertices)
+
+        # The observed Literals are shown as observed.
+        observed_names = {str(literal) for literal in argumentation_theory.knowledge_base}
+        self.assertEqual(set(name_traces[0].text),
+                         {str(vertex['literal']) for vertex in graph.vs.select(type='literal_instance')
+                          if str(vertex['literal']) in observed_names})
+
+    def test_single_node_figure(self):
+        rule_set_label = 'counter11_support_cycle_attacker'
+        asr = ArgumentationSystemXLSXReader(path_to_resources(rule_set_label))
+        arg_system = ArgumentationSystem(asr.language, asr.rules, asr.topic_literals)
+        topic_literal = arg_system.topic_literals[0]
+        self.assertIsNotNone(topic_literal.position)
+        graph = create_single_node_graph(arg_system)
+        for knowledge_base in [[], arg_system.queryables[:1]]:
+            for labeler_str in ['four_bool', 'fqas', 'justification']:
+                self.assert_figure_matches_graph(rule_set_label, ArgumentationTheory(arg_system, knowledge_base),
+                                                 topic_literal, graph, labeler_str)
+
+    def test_multi_node_figure(self):
+        rule_set_label = '03_2019_FQAS_Paper_Example'
+        asr = ArgumentationSystemXLSXReader(path_to_resources(rule_set_label))
+        arg_system = ArgumentationSystem(asr.language, asr.rules, asr.topic_literals)
+        topic_literal = arg_system.language['fraud']
+        self.assertIsNone(topic_literal.position)
+        graph = create_multi_node_graph(arg_system, topic_literal)
+        for knowledge_base in [[], arg_system.get_queryables(['wrong_product', 'counter_party_delivered'])]:
+            for labeler_str in ['four_bool', 'fqas', 'justification']:
+                self.assert_figure_matches_graph(rule_set_label, ArgumentationTheory(arg_system, knowledge_base),
+                                                 topic_literal, graph, labeler_str)
+
+    def test_forget_rule_set(self):
+        for rule_set_label in ['03_2019_FQAS_Paper_Example', '02_2020_COMMA_Paper_Example']:
+            asr = ArgumentationSystemXLSXReader(path_to_resources(rule_set_label))
+            arg_system = ArgumentationSystem(asr.language, asr.rules, asr.topic_literals)
+            get_structured_column_div(ArgumentationTheory(arg_system, []), arg_system.language['fraud'], 'four_bool',
+                                      rule_set_label)
+        self.assertEqual((len(figure_cache), len(graph_layout_cache)), (2, 2))
+
+        # Only the cached figures and graph layouts of the forgotten rule set are removed.
+        forget_rule_set('03_2019_FQAS_Paper_Example')
+        self.assertEqual((len(figure_cache), len(graph_layout_cache)), (1, 1))
+        self.assertEqual(figure_cache.total_size, figure_cache.size_of(figure_cache.get(
+            ('02_2020_COMMA_Paper_Example', 0, 'four_bool', 'fraud'))))
+
+
+if __name__ == '__main__':
+    unittest.main()
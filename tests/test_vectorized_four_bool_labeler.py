@@ -0,0 +1,57 @@
+import random
+import unittest
+
+from stability_label_algorithm.modules.argumentation.argumentation_theory.argumentation_system import \
+    ArgumentationSystem
+from stability_label_algorithm.modules.argumentation.argumentation_theory.argumentation_theory import \
+    ArgumentationTheory
+from stability_label_algorithm.modules.argumentation.importers.argumentation_system_xlsx_reader import \
+    ArgumentationSystemXLSXReader
+from stability_label_algorithm.modules.argumentation.labelers.four_bool_labeler import FourBoolLabeler
+from stability_label_algorithm.modules.argumentation.labelers.vectorized_four_bool_labeler import \
+    VectorizedFourBoolLabeler
+from tests.utils import assert_same_labels, path_to_resources, path_to_resources_folder, \
+    random_argumentation_system, random_consistent_knowledge_base
+
+
+class TestVectorizedFourBoolLabeler(unittest.TestCase):
+    @staticmethod
+    def assert_same_labels_as_four_bool_labeler(argumentation_system, rng):
+        for _ in range(5):
+            argumentation_theory = ArgumentationTheory(argumentation_system,
+                                                       random_consistent_knowledge_base(argumentation_system, rng))
+            assert_same_labels(FourBoolLabeler().label(argumentation_theory),
+                               VectorizedFourBoolLabeler().label(argumentation_theory), argumentation_system)
+
+    def test_same_labels_on_rule_sets(self):
+        rng = random.Random(0)
+        for file_path in sorted(path_to_resources_folder().glob('*.xlsx')):
+            asr = ArgumentationSystemXLSXReader(file_path)
+            argumentation_system = ArgumentationSystem(asr.language, asr.rules, asr.topic_literals)
+            self.assert_same_labels_as_four_bool_labeler(argumentation_system, rng)
+
+    def test_same_labels_on_random_argumentation_systems(self):
+        rng = random.Random(0)
+        for _ in range(10):
+            self.assert_same_labels_as_four_bool_labeler(random_argumentation_system(), rng)
+
+    def test_label_batch(self):
+        rng = random.Random(0)
+        asr = ArgumentationSystemXLSXReader(path_to_resources('02_2020_COMMA_Paper_Example'))
+        argumentation_system = ArgumentationSystem(asr.language, asr.rules, asr.topic_literals)
+        knowledge_bases = [[]] + [random_consistent_knowledge_base(argumentation_system, rng) for _ in range(20)]
+
+        codes = FourBoolLabeler().label_batch(argumentation_system, knowledge_bases)
+        self.assertEqual(codes.shape, (len(knowledge_bases), len(argumentation_system.language)))
+        self.assertTrue((VectorizedFourBoolLabeler(batch_size=8).label_batch(argumentation_system, knowledge_bases) ==
+                         codes).all())
+
+        compiled = argumentation_system.compiled
+        for knowledge_base, knowledge_base_codes in zip(knowledge_bases, codes):
+            labels = FourBoolLabeler().label(ArgumentationTheory(argumentation_system, knowledge_base))
+            for literal_id, literal in enumerate(compiled.literals):
+                self.assertEqual(labels.literal_labeling[literal].code, knowledge_base_codes[literal_id])
+
+
+if __name__ == '__main__':
+    unittest.main()
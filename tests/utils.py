@@ -1,5 +1,10 @@
 import pathlib
 
+from stability_label_algorithm.modules.dataset_generator.argumentation_system_generator.random.\
+    random_argumentation_system_generator import RandomArgumentationSystemGenerator
+from stability_label_algorithm.modules.dataset_generator.argumentation_system_generator.random.\
+    random_argumentation_system_generator_parameters import RandomArgumentationSystemGeneratorParameters
+
 
 def path_to_resources_folder():
     return pathlib.Path(__file__).parent.parent / 'stability_label_algorithm' / 'resources' / 'rule_sets'
@@ -9,3 +14,35 @@ def path_to_resources(file_name):
     if len(file_name) < 5 or file_name[-5:] != '.xlsx':
         file_name = file_name + '.xlsx'
     return path_to_resources_folder() / file_name
+
+
+def assert_same_labels(expected, actual, argumentation_system):
+    """
+    Assert that two Labels objects give the same label to each Literal and Rule of an ArgumentationSystem.
+    """
+    for literal in argumentation_system.language.values():
+        if expected.literal_labeling[literal] != actual.literal_labeling[literal]:
+            raise AssertionError(f'Literal {literal} is labelled {actual.literal_labeling[literal]} instead of '
+                                 f'{expected.literal_labeling[literal]}')
+    for rule in argumentation_system.rules:
+        if expected.rule_labeling[rule] != actual.rule_labeling[rule]:
+            raise AssertionError(f'Rule {rule} is labelled {actual.rule_labeling[rule]} instead of '
+                                 f'{expected.rule_labeling[rule]}')
+
+
+def random_argumentation_system(language_size=30, rule_size=40):
+    # Half of the Rules have one antecedent, the others two or three.
+    rule_antecedent_distribution = {1: rule_size // 2, 2: rule_size * 3 // 8, 3: rule_size - rule_size * 7 // 8}
+    argumentation_system_generation_parameters = \
+        RandomArgumentationSystemGeneratorParameters(language_size=language_size, rule_size=rule_size,
+                                                     rule_antecedent_distribution=rule_antecedent_distribution,
+                                                     queryable_size=language_size * 2 // 5)
+    return RandomArgumentationSystemGenerator(argumentation_system_generation_parameters).generate()
+
+
+def random_consistent_knowledge_base(argumentation_system, rng):
+    knowledge_base = []
+    for queryable in argumentation_system.queryables:
+        if rng.random() < 0.4 and all([not queryable.is_contrary_of(other) for other in knowledge_base]):
+            knowledge_base.append(queryable)
+    return knowledge_base